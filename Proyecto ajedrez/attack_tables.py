@@ -0,0 +1,128 @@
+"""
+Tablas de ataque precalculadas al importar el módulo.
+
+Las casillas se indexan como ``row * 8 + col`` (fila 0 = octava fila, igual
+que ``ChessGame.board``). Para cada casilla se guardan los destinos de
+caballo, rey y capturas de peón, y los rayos de las piezas deslizantes ya
+recortados a los bordes del tablero, de modo que los generadores de
+movimientos de ``ListPiece`` no tengan que rehacer listas de direcciones ni
+comprobar límites en cada llamada.
+
+Además de las tablas de coordenadas se exponen las mismas tablas como
+máscaras de 64 bits (bit ``row * 8 + col``) para el backend de bitboards, y
+los ataques de torre y alfil de cada casilla para cada combinación de piezas
+que pueda bloquearlos, de modo que calcularlos cueste una sola consulta.
+"""
+
+from typing import Dict, List, Tuple
+
+KNIGHT_OFFSETS = [
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+]
+KING_OFFSETS = [
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1),           (0, 1),
+    (1, -1),  (1, 0),  (1, 1)
+]
+ROOK_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+PAWN_CAPTURE_OFFSETS = {
+    'white': [(-1, -1), (-1, 1)],
+    'black': [(1, -1), (1, 1)],
+}
+
+
+def _step_targets(offsets) -> List[Tuple[Tuple[int, int], ...]]:
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        table.append(tuple(
+            (row + dr, col + dc) for dr, dc in offsets
+            if 0 <= row + dr < 8 and 0 <= col + dc < 8
+        ))
+    return table
+
+
+def _ray(row: int, col: int, dr: int, dc: int) -> Tuple[Tuple[int, int], ...]:
+    ray = []
+    r, c = row + dr, col + dc
+    while 0 <= r < 8 and 0 <= c < 8:
+        ray.append((r, c))
+        r, c = r + dr, c + dc
+    return tuple(ray)
+
+
+def _ray_table(directions) -> List[Tuple[Tuple[Tuple[int, int], ...], ...]]:
+    table = []
+    for square in range(64):
+        row, col = divmod(square, 8)
+        table.append(tuple(_ray(row, col, dr, dc) for dr, dc in directions))
+    return table
+
+
+def _to_mask(squares) -> int:
+    mask = 0
+    for row, col in squares:
+        mask |= 1 << (row * 8 + col)
+    return mask
+
+
+def _slider_tables(ray_table) -> Tuple[List[int], List[Dict[int, int]]]:
+    """Máscara de bloqueadores relevantes por casilla (el rayo sin su última casilla, que
+    no tapa nada detrás) y ataques para cada subconjunto de esa máscara"""
+    masks = []
+    attacks = []
+    for rays in ray_table:
+        mask = 0
+        for ray in rays:
+            mask |= _to_mask(ray[:-1])
+        table = {}
+        blockers = 0
+        while True:
+            attacked = 0
+            for ray in rays:
+                for row, col in ray:
+                    bit = 1 << (row * 8 + col)
+                    attacked |= bit
+                    if blockers & bit:
+                        break
+            table[blockers] = attacked
+            # Siguiente subconjunto de la máscara (carry-rippler)
+            blockers = (blockers - mask) & mask
+            if not blockers:
+                break
+        masks.append(mask)
+        attacks.append(table)
+    return masks, attacks
+
+
+# Destinos por casilla, en el mismo orden que las listas de direcciones de Piece
+KNIGHT_TARGETS = _step_targets(KNIGHT_OFFSETS)
+KING_TARGETS = _step_targets(KING_OFFSETS)
+PAWN_CAPTURE_TARGETS = {color: _step_targets(offsets) for color, offsets in PAWN_CAPTURE_OFFSETS.items()}
+
+# Rayos por casilla: una tupla de casillas por dirección, de la más cercana a la más lejana
+ROOK_RAYS = _ray_table(ROOK_DIRECTIONS)
+BISHOP_RAYS = _ray_table(BISHOP_DIRECTIONS)
+QUEEN_RAYS = [ROOK_RAYS[square] + BISHOP_RAYS[square] for square in range(64)]
+
+# Las mismas tablas como bitboards
+KNIGHT_ATTACKS = [_to_mask(targets) for targets in KNIGHT_TARGETS]
+KING_ATTACKS = [_to_mask(targets) for targets in KING_TARGETS]
+PAWN_ATTACKS = {color: [_to_mask(targets) for targets in table] for color, table in PAWN_CAPTURE_TARGETS.items()}
+
+# Rayos de cada casilla con el tablero vacío, para descartar deslizantes sin calcular bloqueos
+ROOK_LINES = [_to_mask(sum(ROOK_RAYS[square], ())) for square in range(64)]
+BISHOP_LINES = [_to_mask(sum(BISHOP_RAYS[square], ())) for square in range(64)]
+
+# BETWEEN[a][b]: casillas estrictamente entre dos casillas de la misma fila, columna o diagonal (0 si no lo están)
+BETWEEN = [[0] * 64 for _ in range(64)]
+for _square in range(64):
+    for _line in ROOK_RAYS[_square] + BISHOP_RAYS[_square]:
+        for _distance, (_row, _col) in enumerate(_line):
+            BETWEEN[_square][_row * 8 + _col] = _to_mask(_line[:_distance])
+
+# Ataques de torre y alfil: ROOK_ATTACKS[casilla][ocupación & ROOK_MASKS[casilla]]
+ROOK_MASKS, ROOK_ATTACKS = _slider_tables(ROOK_RAYS)
+BISHOP_MASKS, BISHOP_ATTACKS = _slider_tables(BISHOP_RAYS)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Evaluación vectorizada de lotes de posiciones con NumPy.
+
+Para análisis fuera de línea: N posiciones se empaquetan en un array
+(N, 64) de int8 (casilla ``row * 8 + col``; 1..6 peón..rey de las blancas,
+-1..-6 de las negras, 0 vacía) y se evalúan todas a la vez con unas pocas
+operaciones sobre arrays: material y tablas de casillas (las mismas de
+``evaluation.py``) más una aproximación de la movilidad, las casillas a las
+que llegan caballos, alfiles, torres y damas sin mirar clavadas ni jaques.
+
+``evaluate_position`` calcula lo mismo para un ChessGame, posición a
+posición, y sirve de referencia para la prueba y el benchmark.
+
+Uso:
+    python batch_eval.py --positions 20000      # benchmark contra el cálculo por posición
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from attack_tables import (
+    KNIGHT_OFFSETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS, KNIGHT_TARGETS, ROOK_RAYS, BISHOP_RAYS
+)
+from evaluation import SQUARE_SCORES, compute_score
+
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PIECE_CODES = {piece_type: code for code, piece_type in enumerate(PIECE_TYPES, 1)}
+FEN_CODES = {letter: code for code, letter in enumerate('pnbrqk', 1)}
+
+_FEN_EXPANSION = str.maketrans({'/': None, **{str(empty): '.' * empty for empty in range(1, 9)}})
+_FEN_BYTES = np.zeros(256, dtype=np.int8)
+for _letter, _code in FEN_CODES.items():
+    _FEN_BYTES[ord(_letter.upper())] = _code
+    _FEN_BYTES[ord(_letter)] = -_code
+
+# Centipeones por casilla alcanzable
+MOBILITY_WEIGHTS = {'knight': 4, 'bishop': 4, 'rook': 2, 'queen': 1}
+
+# Fila code + 6 de cada tabla: -6..-1 negras, 0 vacía, 1..6 blancas
+_SCORE_TABLE = np.zeros((13, 64), dtype=np.int64)
+for _piece_type, _code in PIECE_CODES.items():
+    _SCORE_TABLE[6 + _code] = SQUARE_SCORES['white'][_piece_type]
+    _SCORE_TABLE[6 - _code] = SQUARE_SCORES['black'][_piece_type]
+_SCORE_INDEX = np.arange(64)
+
+
+def _step(dr: int, dc: int):
+    """Desplazamiento de bits de una dirección y máscara de destinos que no dan la vuelta al tablero"""
+    mask = 0
+    for row in range(8):
+        for col in range(8):
+            if 0 <= col - dc < 8:
+                mask |= 1 << (row * 8 + col)
+    return dr * 8 + dc, np.uint64(mask)
+
+
+_ROOK_STEPS = [_step(dr, dc) for dr, dc in ROOK_DIRECTIONS]
+_BISHOP_STEPS = [_step(dr, dc) for dr, dc in BISHOP_DIRECTIONS]
+_SLIDER_STEPS = {'bishop': _BISHOP_STEPS, 'rook': _ROOK_STEPS, 'queen': _ROOK_STEPS + _BISHOP_STEPS}
+_KNIGHT_STEPS = [_step(dr, dc) for dr, dc in KNIGHT_OFFSETS]
+
+
+def _shift(bitboards, step):
+    delta, mask = step
+    if delta > 0:
+        return (bitboards << np.uint64(delta)) & mask
+    return (bitboards >> np.uint64(-delta)) & mask
+
+
+if hasattr(np, 'bitwise_count'):
+    _popcount = np.bitwise_count
+else:
+    _BYTE_COUNTS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+    def _popcount(bitboards):
+        return _BYTE_COUNTS[bitboards.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def pack_games(games):
+    """Empaquetar ChessGame en (tableros (N, 64) int8, turno (N,) int8 con 1 blancas y -1 negras)"""
+    boards = np.zeros((len(games), 64), dtype=np.int8)
+    sides = np.ones(len(games), dtype=np.int8)
+    for index, game in enumerate(games):
+        board = boards[index]
+        pieces = game.pieces
+        for color, sign in (('white', 1), ('black', -1)):
+            for piece in pieces[color]:
+                board[piece.row * 8 + piece.col] = sign * PIECE_CODES[piece.piece_type]
+        if game.current_player == 'black':
+            sides[index] = -1
+    return boards, sides
+
+
+def pack_fens(fens):
+    """Empaquetar posiciones en FEN sin construir ChessGame (mucho más rápido para lotes grandes)"""
+    placements = []
+    sides = np.ones(len(fens), dtype=np.int8)
+    for index, fen in enumerate(fens):
+        fields = fen.split()
+        placements.append(fields[0])
+        if len(fields) > 1 and fields[1] == 'b':
+            sides[index] = -1
+    # Cada FEN se expande a 64 caracteres (un punto por casilla vacía) y se traduce byte a byte
+    squares = ''.join(placements).translate(_FEN_EXPANSION).encode('ascii')
+    boards = _FEN_BYTES[np.frombuffer(squares, dtype=np.uint8)].reshape(len(fens), 64)
+    return boards, sides
+
+
+def to_bitboards(boards):
+    """Un bitboard uint64 por posición para cada código de pieza: array (13, N), fila code + 6"""
+    boards = np.asarray(boards, dtype=np.int8)
+    bitboards = np.zeros((13, len(boards)), dtype=np.uint64)
+    for code in range(-6, 7):
+        if code:
+            bits = np.packbits(boards == code, axis=1, bitorder='little')
+            bitboards[code + 6] = bits.view('<u8')[:, 0]
+    return bitboards
+
+
+def _mobility(bitboards):
+    """Movilidad ponderada (centipeones, positiva para las blancas) a partir de los bitboards.
+
+    Cada dirección avanza a la vez un paso todas las piezas de un tipo: los rayos de dos
+    piezas nunca se solapan (la de detrás choca con la de delante), así que basta con
+    contar los bits de cada frente."""
+    white = np.bitwise_or.reduce(bitboards[7:], axis=0)
+    black = np.bitwise_or.reduce(bitboards[:6], axis=0)
+    empty = ~(white | black)
+    score = np.zeros(bitboards.shape[1], dtype=np.int64)
+    for sign, own, enemy in ((1, white, black), (-1, black, white)):
+        targets = empty | enemy
+        for piece_type, weight in MOBILITY_WEIGHTS.items():
+            pieces = bitboards[6 + sign * PIECE_CODES[piece_type]]
+            if not pieces.any():
+                continue
+            moves = np.zeros_like(score)
+            if piece_type == 'knight':
+                for step in _KNIGHT_STEPS:
+                    moves += _popcount(_shift(pieces, step) & ~own)
+            else:
+                for step in _SLIDER_STEPS[piece_type]:
+                    frontier = pieces
+                    for _ in range(7):
+                        frontier = _shift(frontier, step)
+                        moves += _popcount(frontier & targets)
+                        frontier &= empty
+                        if not frontier.any():
+                            break
+            score += sign * weight * moves
+    return score
+
+
+def evaluate_batch(boards, sides=None, mobility: bool = True):
+    """Evaluar un lote (N, 64): material, casillas y movilidad en centipeones.
+
+    Sin ``sides`` la puntuación es a favor de las blancas; con él, del jugador al que le toca."""
+    boards = np.asarray(boards, dtype=np.int8)
+    scores = _SCORE_TABLE[boards + 6, _SCORE_INDEX].sum(axis=1)
+    if mobility:
+        scores += _mobility(to_bitboards(boards))
+    if sides is not None:
+        scores *= sides
+    return scores
+
+
+def evaluate_position(game, mobility: bool = True) -> int:
+    """La misma evaluación que evaluate_batch para un solo ChessGame, a favor de las blancas"""
+    score = compute_score(game)
+    if not mobility:
+        return score
+    board = game.board
+    pieces = game.pieces
+    for color, sign in (('white', 1), ('black', -1)):
+        for piece in pieces[color]:
+            weight = MOBILITY_WEIGHTS.get(piece.piece_type)
+            if not weight:
+                continue
+            square = piece.row * 8 + piece.col
+            if piece.piece_type == 'knight':
+                rays = [(target,) for target in KNIGHT_TARGETS[square]]
+            elif piece.piece_type == 'rook':
+                rays = ROOK_RAYS[square]
+            elif piece.piece_type == 'bishop':
+                rays = BISHOP_RAYS[square]
+            else:
+                rays = ROOK_RAYS[square] + BISHOP_RAYS[square]
+            moves = 0
+            for ray in rays:
+                for row, col in ray:
+                    target = board[row][col]
+                    if target is None:
+                        moves += 1
+                        continue
+                    if target.color != color:
+                        moves += 1
+                    break
+            score += sign * weight * moves
+    return score
+
+
+def random_positions(count: int, seed: int = 0):
+    """Posiciones variadas sacadas de partidas aleatorias desde la posición inicial"""
+    from chess_professional import ChessGame
+
+    rng = random.Random(seed)
+    fens = []
+    game = ChessGame()
+    while len(fens) < count:
+        moves = game.generate_legal_moves()
+        if not moves or len(game.undo_stack) >= 80:
+            game = ChessGame()
+            continue
+        game.make_move(*rng.choice(moves))
+        fens.append(game.get_fen())
+    return fens
+
+
+def benchmark(count: int):
+    """Posiciones por segundo del cálculo por posición frente al vectorizado"""
+    from chess_professional import ChessGame
+
+    fens = random_positions(count)
+    games = []
+    for fen in fens:
+        game = ChessGame()
+        game.load_fen(fen)
+        games.append(game)
+
+    start = time.perf_counter()
+    reference = [evaluate_position(game) for game in games]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    boards, _ = pack_fens(fens)
+    pack_time = time.perf_counter() - start
+    start = time.perf_counter()
+    scores = evaluate_batch(boards)
+    batch_time = time.perf_counter() - start
+
+    if scores.tolist() != reference:
+        print("⚠️  Las evaluaciones vectorizadas no coinciden con las de referencia")
+    print(f"Posiciones:            {count:,}")
+    print(f"Por posición (Python): {scalar_time:8.3f}s  {count / scalar_time:12,.0f} posiciones/s")
+    print(f"Empaquetado de FEN:    {pack_time:8.3f}s  {count / pack_time:12,.0f} posiciones/s")
+    print(f"Evaluación NumPy:      {batch_time:8.3f}s  {count / batch_time:12,.0f} posiciones/s  "
+          f"({scalar_time / batch_time:.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluación vectorizada de lotes de posiciones")
+    parser.add_argument('--positions', type=int, default=20000, help="Número de posiciones del benchmark")
+    args = parser.parse_args()
+    benchmark(args.positions)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
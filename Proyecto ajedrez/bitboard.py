@@ -0,0 +1,734 @@
+"""
+Backend de posición basado en bitboards de 64 bits.
+
+Cada tipo de pieza y color se guarda en un entero de Python cuyo bit
+``row * 8 + col`` indica si hay una pieza en esa casilla (fila 0 = octava
+fila, igual que ``board[row][col]``), junto con la ocupación de cada color.
+Jaques, clavadas, ataques y movimientos legales se calculan con operaciones
+de bits sobre las tablas de ``attack_tables`` en lugar de recorrer el
+tablero casilla por casilla, y una lista de 64 casillas con el código de la
+pieza que ocupa cada una dice en una lectura qué se captura.
+
+``make_move`` trabaja sobre copias de esas dos listas y apila las anteriores,
+así que ``unmake_move`` solo tiene que recuperarlas. ``BitboardBoardView``
+deja que las clases ``ChessGUI`` sigan leyendo ``board[row][col]``.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from attack_tables import (
+    KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_LINES, BISHOP_LINES, BETWEEN,
+    ROOK_MASKS, ROOK_ATTACKS, BISHOP_MASKS, BISHOP_ATTACKS
+)
+import zobrist
+import evaluation
+
+COLORS = ('white', 'black')
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Código de pieza = 6 * color + tipo (blancas 0-5, negras 6-11); bitboards[OCCUPANCY + color]
+# es la ocupación de cada color
+OCCUPANCY = 12
+COLOR_INDEX = {'white': 0, 'black': 1}
+PIECE_CODES = {(color, piece_type): 6 * index + piece_index
+               for index, color in enumerate(COLORS) for piece_index, piece_type in enumerate(PIECE_TYPES)}
+CODE_COLORS = [color for color in COLORS for _ in PIECE_TYPES]
+CODE_TYPES = [piece_type for _ in COLORS for piece_type in PIECE_TYPES]
+# Valor de cada pieza en peones, igual que Piece.value
+PIECE_VALUES = {'pawn': 1, 'knight': 3, 'bishop': 3, 'rook': 5, 'queen': 9, 'king': 100}
+CODE_VALUES = [PIECE_VALUES[piece_type] for piece_type in CODE_TYPES]
+
+# Piezas a las que puede promocionar un peón, de mayor a menor valor
+PROMOTION_TYPES = ('queen', 'rook', 'bishop', 'knight')
+
+# Letras de pieza en notación FEN (minúsculas; mayúsculas para blancas)
+FEN_PIECE_TYPES = {
+    'p': 'pawn', 'n': 'knight', 'b': 'bishop',
+    'r': 'rook', 'q': 'queen', 'k': 'king'
+}
+FEN_PIECE_LETTERS = {piece_type: letter for letter, piece_type in FEN_PIECE_TYPES.items()}
+
+FULL = (1 << 64) - 1
+_ROWS = [0xFF << (8 * row) for row in range(8)]
+_NOT_FILE_A = FULL ^ sum(1 << (8 * row) for row in range(8))
+_NOT_FILE_H = FULL ^ sum(1 << (8 * row + 7) for row in range(8))
+
+# Claves Zobrist y puntuaciones de casilla por código de pieza
+_PIECE_KEYS = [zobrist.PIECE_KEYS[color][piece_type] for color, piece_type in zip(CODE_COLORS, CODE_TYPES)]
+_SQUARE_SCORES = [evaluation.SQUARE_SCORES[color][piece_type]
+                  for color, piece_type in zip(CODE_COLORS, CODE_TYPES)]
+
+# Derechos de enroque como bits K=1, Q=2, k=4, q=8; un movimiento que sale de o llega a
+# una de estas casillas conserva solo los derechos de _CASTLING_KEEP
+_CASTLING_BITS = {'K': 1, 'Q': 2, 'k': 4, 'q': 8}
+_CASTLING_STRINGS = [''.join(letter for letter, bit in _CASTLING_BITS.items() if rights & bit) or '-'
+                     for rights in range(16)]
+_CASTLING_KEYS = [zobrist.CASTLING_KEYS[rights] for rights in _CASTLING_STRINGS]
+_CASTLING_SQUARES = {60: 1 | 2, 63: 1, 56: 2, 4: 4 | 8, 7: 4, 0: 8}
+_CASTLING_KEEP = [15 ^ _CASTLING_SQUARES.get(square, 0) for square in range(64)]
+# Por color: (derecho, destino del rey, casillas que deben estar vacías, casillas que recorre el rey)
+_CASTLES = (
+    ((1, 62, (1 << 61) | (1 << 62), (61, 62)), (2, 58, (1 << 57) | (1 << 58) | (1 << 59), (59, 58))),
+    ((4, 6, (1 << 5) | (1 << 6), (5, 6)), (8, 2, (1 << 1) | (1 << 2) | (1 << 3), (3, 2))),
+)
+
+# Piezas de la posición inicial por casilla, para deducir has_moved
+_INITIAL_CODES = [None] * 64
+for _col, _piece_type in enumerate((ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)):
+    _INITIAL_CODES[_col] = 6 + _piece_type
+    _INITIAL_CODES[8 + _col] = 6 + PAWN
+    _INITIAL_CODES[48 + _col] = PAWN
+    _INITIAL_CODES[56 + _col] = _piece_type
+
+# Tuplas de movimiento ya construidas: _MOVES[origen][destino] y sus cuatro promociones
+_MOVES = [[(origin // 8, origin % 8, target // 8, target % 8, None) for target in range(64)]
+          for origin in range(64)]
+_PROMOTIONS = [[tuple((origin // 8, origin % 8, target // 8, target % 8, promotion)
+                      for promotion in PROMOTION_TYPES) for target in range(64)]
+               for origin in range(64)]
+
+
+def _add_pawn_moves(moves: list, pawns: int, us: int, empty: int, enemy: int, allowed: int):
+    """Añadir a moves los avances y capturas de un conjunto de peones, todos a la vez por
+    desplazamiento; allowed limita los destinos (evasión de jaque, línea de clavada)"""
+    if us == 0:
+        single = (pawns >> 8) & empty
+        double = ((single & _ROWS[5]) >> 8) & empty & allowed
+        shifts = ((single & allowed, 8), (double, 16),
+                  (((pawns & _NOT_FILE_A) >> 9) & enemy & allowed, 9),
+                  (((pawns & _NOT_FILE_H) >> 7) & enemy & allowed, 7))
+        last_row = _ROWS[0]
+    else:
+        single = (pawns << 8) & empty
+        double = ((single & _ROWS[2]) << 8) & empty & allowed
+        shifts = ((single & allowed, -8), (double, -16),
+                  (((pawns & _NOT_FILE_A) << 7) & enemy & allowed, -7),
+                  (((pawns & _NOT_FILE_H) << 9) & enemy & allowed, -9))
+        last_row = _ROWS[7]
+    append = moves.append
+    for targets, offset in shifts:
+        promotions = targets & last_row
+        targets ^= promotions
+        while targets:
+            low = targets & -targets
+            targets ^= low
+            target = low.bit_length() - 1
+            append(_MOVES[target + offset][target])
+        while promotions:
+            low = promotions & -promotions
+            promotions ^= low
+            target = low.bit_length() - 1
+            moves.extend(_PROMOTIONS[target + offset][target])
+
+
+class BitboardPosition:
+    """Reglas del ajedrez sobre bitboards: movimientos legales, make/unmake y claves incrementales"""
+
+    piece_class = None  # Clase Piece con la que board y pieces muestran las piezas
+
+    def __init__(self):
+        self.board = BitboardBoardView(self)
+        self.current_player = 'white'
+        self.undo_stack = []
+        # Casilla de captura al paso disponible para el jugador al que le toca
+        self.en_passant = None
+        self.fullmove_number = 1
+        # (clave Zobrist, {casilla: destinos legales}) de la última posición consultada
+        self.legal_moves_cache = None
+        self._setup_board()
+
+    def _clear(self):
+        self.bitboards = [0] * 14
+        self.squares = [None] * 64  # Código de la pieza de cada casilla
+        self.castling = 0
+
+    def _put(self, code: int, square: int):
+        bit = 1 << square
+        self.bitboards[code] |= bit
+        self.bitboards[OCCUPANCY + code // 6] |= bit
+        self.squares[square] = code
+
+    def _setup_board(self):
+        self._clear()
+        for square, code in enumerate(_INITIAL_CODES):
+            if code is not None:
+                self._put(code, square)
+        self.castling = 15
+        self._index_pieces()
+
+    def _index_pieces(self):
+        """Recalcular el número de piezas, las claves Zobrist y la evaluación desde cero"""
+        # Mismos resultados que zobrist.compute_key, compute_pawn_key y evaluation.compute_score,
+        # leídos de los códigos sin crear objetos de pieza; después los actualiza make_move
+        key = pawn_key = score = count = 0
+        for square, code in enumerate(self.squares):
+            if code is not None:
+                key ^= _PIECE_KEYS[code][square]
+                if code % 6 == PAWN:
+                    pawn_key ^= _PIECE_KEYS[code][square]
+                score += _SQUARE_SCORES[code][square]
+                count += 1
+        if self.current_player == 'black':
+            key ^= zobrist.SIDE_KEY
+        key ^= _CASTLING_KEYS[self.castling]
+        if self.en_passant:
+            key ^= zobrist.EN_PASSANT_KEYS[self.en_passant[1]]
+        self.zobrist_key = key
+        self.pawn_key = pawn_key
+        self.evaluation = score
+        self.piece_count = count
+
+    @property
+    def occupied(self) -> int:
+        return self.bitboards[OCCUPANCY] | self.bitboards[OCCUPANCY + 1]
+
+    def _piece_object(self, code: int, square: int):
+        row, col = divmod(square, 8)
+        piece = self.piece_class(CODE_COLORS[code], CODE_TYPES[code], row, col)
+        piece.has_moved = self._has_moved(code, square)
+        return piece
+
+    def _has_moved(self, code: int, square: int) -> bool:
+        """Deducido de la posición: reyes y torres sin su derecho de enroque, peones fuera de
+        su fila inicial y el resto de piezas fuera de su casilla inicial"""
+        if CODE_TYPES[code] in ('king', 'rook') and square in _CASTLING_SQUARES:
+            return not self.castling & _CASTLING_SQUARES[square] & (3 if code < 6 else 12)
+        if code % 6 == PAWN:
+            return square // 8 != (6 if code < 6 else 1)
+        return _INITIAL_CODES[square] != code
+
+    @property
+    def pieces(self) -> Dict[str, list]:
+        """Piezas vivas por color como objetos piece_class, creados en cada consulta"""
+        pieces = {'white': [], 'black': []}
+        squares = self.squares
+        occupied = self.occupied
+        while occupied:
+            low = occupied & -occupied
+            occupied ^= low
+            square = low.bit_length() - 1
+            code = squares[square]
+            pieces[CODE_COLORS[code]].append(self._piece_object(code, square))
+        return pieces
+
+    @property
+    def king_positions(self) -> Dict[str, Tuple[int, int]]:
+        return {color: self.find_king(color) for color in COLORS if self.bitboards[PIECE_CODES[color, 'king']]}
+
+    def get_piece_at(self, row: int, col: int):
+        if 0 <= row < 8 and 0 <= col < 8:
+            return self.board[row][col]
+        return None
+
+    def find_king(self, color: str) -> Optional[Tuple[int, int]]:
+        king = self.bitboards[PIECE_CODES[color, 'king']]
+        return divmod(king.bit_length() - 1, 8) if king else None
+
+    def attackers(self, square: int, by_color: str, occupied: Optional[int] = None) -> int:
+        """Bitboard de las piezas de by_color que atacan la casilla con la ocupación indicada"""
+        if occupied is None:
+            occupied = self.occupied
+        bitboards = self.bitboards
+        them = 6 * COLOR_INDEX[by_color]
+        # Un peón atacante está donde capturaría un peón del color defensor
+        defender = 'black' if by_color == 'white' else 'white'
+        return ((KNIGHT_ATTACKS[square] & bitboards[them + KNIGHT]) |
+                (PAWN_ATTACKS[defender][square] & bitboards[them + PAWN]) |
+                (KING_ATTACKS[square] & bitboards[them + KING]) |
+                (ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]] &
+                 (bitboards[them + ROOK] | bitboards[them + QUEEN])) |
+                (BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]] &
+                 (bitboards[them + BISHOP] | bitboards[them + QUEEN])))
+
+    def _is_attacked(self, square: int, them: int, occupied: int) -> bool:
+        """Casilla atacada por el color de código base them (0 o 6) con la ocupación indicada"""
+        bitboards = self.bitboards
+        return bool(KNIGHT_ATTACKS[square] & bitboards[them + KNIGHT] or
+                    PAWN_ATTACKS['white' if them else 'black'][square] & bitboards[them + PAWN] or
+                    KING_ATTACKS[square] & bitboards[them + KING] or
+                    ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]] &
+                    (bitboards[them + ROOK] | bitboards[them + QUEEN]) or
+                    BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]] &
+                    (bitboards[them + BISHOP] | bitboards[them + QUEEN]))
+
+    def is_square_attacked(self, square: Tuple[int, int], by_color: str) -> bool:
+        return self._is_attacked(square[0] * 8 + square[1], 6 * COLOR_INDEX[by_color], self.occupied)
+
+    def is_in_check(self, color: str) -> bool:
+        us = COLOR_INDEX[color]
+        bitboards = self.bitboards
+        king = bitboards[6 * us + KING]
+        if not king:
+            return False
+        return self._is_attacked(king.bit_length() - 1, 6 - 6 * us,
+                                 bitboards[OCCUPANCY] | bitboards[OCCUPANCY + 1])
+
+    def would_be_in_check(self, from_row: int, from_col: int, to_row: int, to_col: int, color: str) -> bool:
+        """Verificar si un movimiento dejaría al rey en jaque"""
+        self.make_move(from_row, from_col, to_row, to_col)
+        in_check = self.is_in_check(color)
+        self.unmake_move()
+        return in_check
+
+    def _pins_and_checks(self, us: int):
+        """(casilla del rey, piezas que dan jaque, piezas clavadas, {bit de la clavada: línea})
+
+        Los deslizantes rivales alineados con el rey dan jaque si no hay nada entre
+        ellos y el rey, y clavan la pieza propia si es la única que hay en medio; la
+        línea de clavada incluye al atacante."""
+        bitboards = self.bitboards
+        them = 6 - 6 * us
+        king_square = bitboards[6 * us + KING].bit_length() - 1
+        own = bitboards[OCCUPANCY + us]
+        occupied = own | bitboards[OCCUPANCY + 1 - us]
+        checkers = ((KNIGHT_ATTACKS[king_square] & bitboards[them + KNIGHT]) |
+                    (PAWN_ATTACKS[COLORS[us]][king_square] & bitboards[them + PAWN]))
+        snipers = ((ROOK_LINES[king_square] & (bitboards[them + ROOK] | bitboards[them + QUEEN])) |
+                   (BISHOP_LINES[king_square] & (bitboards[them + BISHOP] | bitboards[them + QUEEN])))
+        pinned = 0
+        pin_lines = None
+        between = BETWEEN[king_square]
+        while snipers:
+            low = snipers & -snipers
+            snipers ^= low
+            line = between[low.bit_length() - 1]
+            blockers = line & occupied
+            if not blockers:
+                checkers |= low
+            elif not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+                if pin_lines is None:
+                    pin_lines = {}
+                pin_lines[blockers] = line | low
+        return king_square, checkers, pinned, pin_lines
+
+    def _en_passant_is_legal(self, us: int, king_square: int, origin_bit: int) -> bool:
+        """La captura al paso retira un peón que no está en el destino, así que puede destapar
+        un jaque por la fila que las clavadas no ven: se comprueba el rey con la ocupación final"""
+        bitboards = self.bitboards
+        them = 6 - 6 * us
+        target = self.en_passant[0] * 8 + self.en_passant[1]
+        captured_bit = 1 << (target + 8 if us == 0 else target - 8)
+        occupied = ((bitboards[OCCUPANCY] | bitboards[OCCUPANCY + 1]) ^ origin_bit ^ captured_bit) | (1 << target)
+        return not (KNIGHT_ATTACKS[king_square] & bitboards[them + KNIGHT] or
+                    PAWN_ATTACKS[COLORS[us]][king_square] & (bitboards[them + PAWN] ^ captured_bit) or
+                    ROOK_ATTACKS[king_square][occupied & ROOK_MASKS[king_square]] &
+                    (bitboards[them + ROOK] | bitboards[them + QUEEN]) or
+                    BISHOP_ATTACKS[king_square][occupied & BISHOP_MASKS[king_square]] &
+                    (bitboards[them + BISHOP] | bitboards[them + QUEEN]))
+
+    def generate_legal_moves(self, color: Optional[str] = None) -> List[Tuple[int, int, int, int, Optional[str]]]:
+        """Todos los movimientos legales como (fila, col, fila destino, col destino, promoción)"""
+        us = COLOR_INDEX[color or self.current_player]
+        king_square, checkers, pinned, pin_lines = self._pins_and_checks(us)
+        bitboards = self.bitboards
+        base = 6 * us
+        them = 6 - base
+        own = bitboards[OCCUPANCY + us]
+        enemy = bitboards[OCCUPANCY + 1 - us]
+        occupied = own | enemy
+        moves = []
+        append = moves.append
+
+        # El rey no puede pisar casillas atacadas; se quita del tablero para que los
+        # rayos que lo atraviesan sigan contando
+        king_moves = _MOVES[king_square]
+        targets = KING_ATTACKS[king_square] & ~own
+        without_king = occupied ^ (1 << king_square)
+        is_attacked = self._is_attacked
+        while targets:
+            low = targets & -targets
+            targets ^= low
+            target = low.bit_length() - 1
+            if not is_attacked(target, them, without_king):
+                append(king_moves[target])
+
+        if checkers:
+            # Con jaque doble solo puede moverse el rey; con uno hay que capturar o tapar
+            if checkers & (checkers - 1):
+                return moves
+            allowed = checkers | BETWEEN[king_square][checkers.bit_length() - 1]
+        else:
+            allowed = FULL ^ own
+            rights = self.castling
+            if rights:
+                for right, target, empty, path in _CASTLES[us]:
+                    if (rights & right and not occupied & empty and
+                            not is_attacked(path[0], them, occupied) and not is_attacked(path[1], them, occupied)):
+                        append(king_moves[target])
+
+        # Un caballo clavado nunca puede moverse
+        pieces = bitboards[base + KNIGHT] & ~pinned
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            origin = low.bit_length() - 1
+            origin_moves = _MOVES[origin]
+            targets = KNIGHT_ATTACKS[origin] & allowed
+            while targets:
+                low = targets & -targets
+                targets ^= low
+                append(origin_moves[low.bit_length() - 1])
+
+        pieces = bitboards[base + BISHOP] | bitboards[base + QUEEN]
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            origin = low.bit_length() - 1
+            origin_moves = _MOVES[origin]
+            targets = BISHOP_ATTACKS[origin][occupied & BISHOP_MASKS[origin]] & allowed
+            if low & pinned:
+                targets &= pin_lines[low]
+            while targets:
+                low = targets & -targets
+                targets ^= low
+                append(origin_moves[low.bit_length() - 1])
+
+        pieces = bitboards[base + ROOK] | bitboards[base + QUEEN]
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            origin = low.bit_length() - 1
+            origin_moves = _MOVES[origin]
+            targets = ROOK_ATTACKS[origin][occupied & ROOK_MASKS[origin]] & allowed
+            if low & pinned:
+                targets &= pin_lines[low]
+            while targets:
+                low = targets & -targets
+                targets ^= low
+                append(origin_moves[low.bit_length() - 1])
+
+        pawns = bitboards[base + PAWN]
+        empty = FULL ^ occupied
+        _add_pawn_moves(moves, pawns & ~pinned, us, empty, enemy, allowed)
+        pinned_pawns = pawns & pinned
+        while pinned_pawns:
+            low = pinned_pawns & -pinned_pawns
+            pinned_pawns ^= low
+            _add_pawn_moves(moves, low, us, empty, enemy, allowed & pin_lines[low])
+
+        if self.en_passant:
+            target = self.en_passant[0] * 8 + self.en_passant[1]
+            # Peones propios en las casillas desde las que un peón rival en el destino capturaría
+            capturers = PAWN_ATTACKS[COLORS[1 - us]][target] & pawns
+            while capturers:
+                low = capturers & -capturers
+                capturers ^= low
+                if self._en_passant_is_legal(us, king_square, low):
+                    append(_MOVES[low.bit_length() - 1][target])
+
+        return moves
+
+    def iter_legal_moves(self, color: Optional[str] = None) -> Iterator[Tuple[int, int, int, int, Optional[str]]]:
+        """Movimientos legales de uno en uno (sin alterar la posición mientras se recorren)"""
+        return iter(self.generate_legal_moves(color))
+
+    def _has_legal_move(self, us: int) -> bool:
+        """Como generate_legal_moves, pero basta con que una pieza tenga algún destino"""
+        king_square, checkers, pinned, pin_lines = self._pins_and_checks(us)
+        bitboards = self.bitboards
+        base = 6 * us
+        them = 6 - base
+        own = bitboards[OCCUPANCY + us]
+        enemy = bitboards[OCCUPANCY + 1 - us]
+        occupied = own | enemy
+
+        targets = KING_ATTACKS[king_square] & ~own
+        without_king = occupied ^ (1 << king_square)
+        while targets:
+            low = targets & -targets
+            targets ^= low
+            if not self._is_attacked(low.bit_length() - 1, them, without_king):
+                return True
+        if checkers & (checkers - 1):
+            return False
+        # Un enroque legal implica un paso legal del rey, ya descartado arriba
+        allowed = checkers | BETWEEN[king_square][checkers.bit_length() - 1] if checkers else FULL ^ own
+
+        pieces = bitboards[base + KNIGHT] & ~pinned
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            if KNIGHT_ATTACKS[low.bit_length() - 1] & allowed:
+                return True
+        for sliders, masks, attacks in ((bitboards[base + BISHOP] | bitboards[base + QUEEN], BISHOP_MASKS, BISHOP_ATTACKS),
+                                        (bitboards[base + ROOK] | bitboards[base + QUEEN], ROOK_MASKS, ROOK_ATTACKS)):
+            while sliders:
+                low = sliders & -sliders
+                sliders ^= low
+                origin = low.bit_length() - 1
+                targets = attacks[origin][occupied & masks[origin]] & allowed
+                if low & pinned:
+                    targets &= pin_lines[low]
+                if targets:
+                    return True
+
+        pawns = bitboards[base + PAWN]
+        moves = []
+        empty = FULL ^ occupied
+        _add_pawn_moves(moves, pawns & ~pinned, us, empty, enemy, allowed)
+        pinned_pawns = pawns & pinned
+        while pinned_pawns and not moves:
+            low = pinned_pawns & -pinned_pawns
+            pinned_pawns ^= low
+            _add_pawn_moves(moves, low, us, empty, enemy, allowed & pin_lines[low])
+        if moves:
+            return True
+
+        if self.en_passant:
+            capturers = PAWN_ATTACKS[COLORS[1 - us]][self.en_passant[0] * 8 + self.en_passant[1]] & pawns
+            while capturers:
+                low = capturers & -capturers
+                capturers ^= low
+                if self._en_passant_is_legal(us, king_square, low):
+                    return True
+        return False
+
+    def get_legal_move_map(self) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+        """Destinos legales por casilla del jugador actual, calculados una sola vez por posición"""
+        cache = self.legal_moves_cache
+        if cache is not None and cache[0] == self.zobrist_key:
+            return cache[1]
+
+        move_map = {}
+        for from_row, from_col, to_row, to_col, promotion in self.generate_legal_moves():
+            if promotion is None or promotion == 'queen':  # Un destino por promoción
+                move_map.setdefault((from_row, from_col), []).append((to_row, to_col))
+        self.legal_moves_cache = (self.zobrist_key, move_map)
+        return move_map
+
+    def get_valid_moves(self, piece) -> List[Tuple[int, int]]:
+        """Destinos legales de una pieza (un objeto de board o de pieces)"""
+        if piece.color == self.current_player:
+            return list(self.get_legal_move_map().get((piece.row, piece.col), []))
+        return [move[2:4] for move in self.generate_legal_moves(piece.color)
+                if move[:2] == (piece.row, piece.col) and move[4] in (None, 'queen')]
+
+    def has_valid_moves(self, color: str) -> bool:
+        cache = self.legal_moves_cache
+        if color == self.current_player and cache is not None and cache[0] == self.zobrist_key:
+            return bool(cache[1])
+        # Basta con encontrar la primera pieza con un destino legal
+        return self._has_legal_move(COLOR_INDEX[color])
+
+    def make_move(self, from_row: int, from_col: int, to_row: int, to_col: int, promotion: Optional[str] = None):
+        """Realizar un movimiento sin validarlo y apilar lo necesario para deshacerlo"""
+        from_square = from_row * 8 + from_col
+        to_square = to_row * 8 + to_col
+        old_bitboards = self.bitboards
+        old_squares = self.squares
+        code = old_squares[from_square]
+        captured = old_squares[to_square]
+        player = self.current_player
+        en_passant = self.en_passant
+        castling = self.castling
+        key = self.zobrist_key
+        score = self.evaluation
+        pawn_key = self.pawn_key
+        piece_count = self.piece_count
+
+        # Las listas se copian: las originales quedan en el registro de deshacer
+        bitboards = old_bitboards[:]
+        squares = old_squares[:]
+        own = OCCUPANCY + code // 6
+        other = own ^ 1  # Ocupación del rival
+        from_bit = 1 << from_square
+        to_bit = 1 << to_square
+        bitboards[code] ^= from_bit | to_bit
+        bitboards[own] ^= from_bit | to_bit
+        squares[from_square] = None
+        piece_keys = _PIECE_KEYS[code]
+        square_scores = _SQUARE_SCORES[code]
+        key ^= zobrist.SIDE_KEY ^ piece_keys[from_square] ^ piece_keys[to_square]
+        score += square_scores[to_square] - square_scores[from_square]
+        if en_passant:
+            key ^= zobrist.EN_PASSANT_KEYS[en_passant[1]]
+
+        if captured is not None:
+            bitboards[captured] ^= to_bit
+            bitboards[other] ^= to_bit
+            key ^= _PIECE_KEYS[captured][to_square]
+            score -= _SQUARE_SCORES[captured][to_square]
+            if captured % 6 == PAWN:
+                pawn_key ^= _PIECE_KEYS[captured][to_square]
+            piece_count -= 1
+
+        new_en_passant = None
+        piece_type = code % 6
+        if piece_type == PAWN:
+            pawn_key ^= piece_keys[from_square]
+            if from_col != to_col and captured is None:
+                # Captura al paso: el peón capturado está junto al origen, no en el destino
+                captured_square = from_row * 8 + to_col
+                captured = squares[captured_square]
+                squares[captured_square] = None
+                captured_bit = 1 << captured_square
+                bitboards[captured] ^= captured_bit
+                bitboards[other] ^= captured_bit
+                key ^= _PIECE_KEYS[captured][captured_square]
+                score -= _SQUARE_SCORES[captured][captured_square]
+                pawn_key ^= _PIECE_KEYS[captured][captured_square]
+                piece_count -= 1
+            elif to_row == 0 or to_row == 7:
+                # Promoción de peón (a reina salvo que se indique otra pieza)
+                promoted = code - PAWN + PIECE_TYPES.index(promotion or 'queen')
+                bitboards[code] ^= to_bit
+                bitboards[promoted] ^= to_bit
+                key ^= piece_keys[to_square] ^ _PIECE_KEYS[promoted][to_square]
+                score += _SQUARE_SCORES[promoted][to_square] - square_scores[to_square]
+                code = promoted
+            elif to_row - from_row in (2, -2):
+                new_en_passant = ((from_row + to_row) // 2, from_col)
+                key ^= zobrist.EN_PASSANT_KEYS[from_col]
+            if code % 6 == PAWN:
+                pawn_key ^= piece_keys[to_square]
+        elif piece_type == KING and to_col - from_col in (2, -2):
+            # Enroque: la torre salta al otro lado del rey
+            rook = code - KING + ROOK
+            rook_from, rook_to = (from_square + 3, from_square + 1) if to_col > from_col else (from_square - 4,
+                                                                                               from_square - 1)
+            rook_bits = (1 << rook_from) | (1 << rook_to)
+            bitboards[rook] ^= rook_bits
+            bitboards[own] ^= rook_bits
+            squares[rook_from] = None
+            squares[rook_to] = rook
+            key ^= _PIECE_KEYS[rook][rook_from] ^ _PIECE_KEYS[rook][rook_to]
+            score += _SQUARE_SCORES[rook][rook_to] - _SQUARE_SCORES[rook][rook_from]
+        squares[to_square] = code
+
+        if castling:
+            new_castling = castling & _CASTLING_KEEP[from_square] & _CASTLING_KEEP[to_square]
+            if new_castling != castling:
+                key ^= _CASTLING_KEYS[castling] ^ _CASTLING_KEYS[new_castling]
+                self.castling = new_castling
+
+        # Registro de deshacer: casillas, pieza capturada, derechos de enroque, tipo original,
+        # turno, casilla de captura al paso, claves y evaluación previas, listas anteriores
+        self.undo_stack.append((from_row, from_col, to_row, to_col, captured, castling, PIECE_TYPES[piece_type],
+                                player, en_passant, self.zobrist_key, self.evaluation, self.pawn_key,
+                                old_bitboards, old_squares, self.piece_count))
+        self.bitboards = bitboards
+        self.squares = squares
+        self.en_passant = new_en_passant
+        self.zobrist_key = key
+        self.evaluation = score
+        self.pawn_key = pawn_key
+        self.piece_count = piece_count
+        if player == 'black':
+            self.fullmove_number += 1
+            self.current_player = 'white'
+        else:
+            self.current_player = 'black'
+
+    def unmake_move(self):
+        """Deshacer el último movimiento hecho con make_move"""
+        (_, _, _, _, _, self.castling, _, player, self.en_passant, self.zobrist_key, self.evaluation,
+         self.pawn_key, self.bitboards, self.squares, self.piece_count) = self.undo_stack.pop()
+        if player == 'black':
+            self.fullmove_number -= 1
+        self.current_player = player
+
+    def get_castling_rights(self) -> str:
+        """Derechos de enroque en formato FEN"""
+        return _CASTLING_STRINGS[self.castling]
+
+    def load_fen(self, fen: str):
+        """Cargar una posición en notación FEN (el contador de 50 movimientos no se usa)"""
+        fields = fen.split()
+        self._clear()
+        for row, rank in enumerate(fields[0].split('/')):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                color = 'white' if char.isupper() else 'black'
+                self._put(PIECE_CODES[color, FEN_PIECE_TYPES[char.lower()]], row * 8 + col)
+                col += 1
+
+        # Un derecho de enroque solo cuenta si el rey y la torre siguen en sus casillas
+        rights = fields[2] if len(fields) > 2 else '-'
+        for letter, king_square, rook_square in (('K', 60, 63), ('Q', 60, 56), ('k', 4, 7), ('q', 4, 0)):
+            base = 0 if letter.isupper() else 6
+            if (letter in rights and self.squares[king_square] == base + KING and
+                    self.squares[rook_square] == base + ROOK):
+                self.castling |= _CASTLING_BITS[letter]
+
+        en_passant = fields[3] if len(fields) > 3 else '-'
+        self.en_passant = None if en_passant == '-' else (8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+        self.current_player = 'white' if fields[1] == 'w' else 'black'
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+        self.undo_stack = []
+        self.legal_moves_cache = None
+        self._index_pieces()
+
+    def get_fen(self) -> str:
+        """Obtener la posición actual en notación FEN"""
+        ranks = []
+        for row in range(8):
+            rank = ''
+            empty = 0
+            for code in self.squares[row * 8:row * 8 + 8]:
+                if code is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                letter = FEN_PIECE_LETTERS[CODE_TYPES[code]]
+                rank += letter.upper() if code < 6 else letter
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+
+        en_passant = '-'
+        if self.en_passant:
+            en_passant = f"{chr(ord('a') + self.en_passant[1])}{8 - self.en_passant[0]}"
+        side = 'w' if self.current_player == 'white' else 'b'
+        return f"{'/'.join(ranks)} {side} {self.get_castling_rights()} {en_passant} 0 {self.fullmove_number}"
+
+
+class _BitboardRowView:
+    __slots__ = ('position', 'row')
+
+    def __init__(self, position: BitboardPosition, row: int):
+        self.position = position
+        self.row = row
+
+    def __getitem__(self, col: int):
+        if not 0 <= col < 8:
+            raise IndexError(col)
+        square = self.row * 8 + col
+        code = self.position.squares[square]
+        return None if code is None else self.position._piece_object(code, square)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        for col in range(8):
+            yield self[col]
+
+
+class BitboardBoardView:
+    """``board[row][col]`` de solo lectura sobre una BitboardPosition
+
+    Cada consulta devuelve un objeto nuevo de ``piece_class`` de la posición (o
+    None si la casilla está vacía), así que refleja siempre la posición actual.
+    """
+
+    def __init__(self, position: BitboardPosition):
+        self.position = position
+
+    def __getitem__(self, row: int) -> _BitboardRowView:
+        if not 0 <= row < 8:
+            raise IndexError(row)
+        return _BitboardRowView(self.position, row)
+
+    def __len__(self) -> int:
+        return 8
+
+    def __iter__(self):
+        for row in range(8):
+            yield _BitboardRowView(self.position, row)
@@ -0,0 +1,79 @@
+"""
+Capa estática del tablero pre-renderizada.
+
+Las casillas, sus bordes y las coordenadas no cambian entre fotogramas, así
+que se dibujan una vez en una superficie fuera de pantalla y cada fotograma
+la copia con un solo ``blit``. La superficie se vuelve a generar solo cuando
+cambian los colores, el tamaño de casilla o si se muestran las coordenadas;
+los resaltados de selección y movimientos se siguen dibujando encima.
+"""
+
+from typing import Optional, Tuple
+
+import pygame
+
+BOARD_SIZE = 8
+
+Color = Tuple[int, ...]
+
+
+class BoardLayer:
+    def __init__(self, square_size: int, light: Color, dark: Color, border_color: Optional[Color] = None,
+                 coord_font_size: int = 20, coord_color: Color = (0, 0, 0),
+                 rank_offset: Tuple[int, int] = (5, 5), file_offset: Tuple[int, int] = (15, 20)):
+        self.square_size = square_size
+        self.light = light
+        self.dark = dark
+        self.border_color = border_color  # Borde de 1 píxel por casilla (None = sin borde)
+        self.coord_font_size = coord_font_size
+        self.coord_color = coord_color
+        # Números desde la esquina superior izquierda de su fila; letras desde la esquina
+        # inferior derecha de su columna
+        self.rank_offset = rank_offset
+        self.file_offset = file_offset
+        self.builds = 0
+        self._key = None
+        self._surface = None
+
+    def _build(self, show_coordinates: bool) -> pygame.Surface:
+        size = self.square_size
+        surface = pygame.Surface((BOARD_SIZE * size, BOARD_SIZE * size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                rect = pygame.Rect(col * size, row * size, size, size)
+                surface.fill(self.light if (row + col) % 2 == 0 else self.dark, rect)
+                if self.border_color is not None:
+                    pygame.draw.rect(surface, self.border_color, rect, 1)
+
+        if show_coordinates:
+            font = pygame.font.Font(None, self.coord_font_size)
+            for i in range(BOARD_SIZE):
+                # Números (filas)
+                text = font.render(str(8 - i), True, self.coord_color)
+                surface.blit(text, (self.rank_offset[0], i * size + self.rank_offset[1]))
+
+                # Letras (columnas)
+                text = font.render(chr(ord('a') + i), True, self.coord_color)
+                surface.blit(text, ((i + 1) * size - self.file_offset[0],
+                                    BOARD_SIZE * size - self.file_offset[1]))
+        self.builds += 1
+        return surface
+
+    def surface(self, show_coordinates: bool = True) -> pygame.Surface:
+        """Superficie del tablero, regenerada solo si cambió la configuración"""
+        key = (self.square_size, self.light, self.dark, self.border_color, self.coord_font_size,
+               self.coord_color, self.rank_offset, self.file_offset, show_coordinates)
+        if key != self._key:
+            self._surface = self._build(show_coordinates)
+            self._key = key
+        return self._surface
+
+    def draw(self, target: pygame.Surface, show_coordinates: bool = True, position: Tuple[int, int] = (0, 0)):
+        """Copiar el tablero completo a ``target`` con un único blit"""
+        target.blit(self.surface(show_coordinates), position)
+
+    def invalidate(self):
+        """Forzar que el próximo fotograma regenere la superficie"""
+        self._key = None
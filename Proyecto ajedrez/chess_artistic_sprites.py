@@ -3,6 +3,9 @@ import sys
 import math
 from typing import List, Tuple, Optional
 
+from board_layer import BoardLayer
+from gradients import GradientBackground
+
 # Inicializar pygame
 pygame.init()
 
@@ -492,6 +495,11 @@ class ChessGame:
             self.selected_pos = None
             self.possible_moves = []
 
+def background_color(y: int, height: int) -> Tuple[int, int, int]:
+    """Color de la fila y del fondo con gradiente sutil"""
+    intensity = int(240 + 15 * math.sin(y * 0.01))
+    return (intensity, intensity, intensity + 5)
+
 class ChessGUI:
     def __init__(self):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -499,27 +507,20 @@ class ChessGUI:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 32)
         self.big_font = pygame.font.Font(None, 48)
+        self.board_layer = BoardLayer(SQUARE_SIZE, LIGHT_BROWN, DARK_BROWN, border_color=BLACK,
+                                      coord_font_size=24, rank_offset=(5, 10), file_offset=(20, 25))
+        self.background = GradientBackground(background_color)
         self.game = ChessGame()
     
     def draw_board(self):
         """Dibujar tablero con efectos visuales mejorados"""
+        # Casillas, bordes y coordenadas pre-renderizados
+        self.board_layer.draw(self.screen)
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
                 x = col * SQUARE_SIZE
                 y = row * SQUARE_SIZE
-                
-                # Color de la casilla
-                if (row + col) % 2 == 0:
-                    color = LIGHT_BROWN
-                else:
-                    color = DARK_BROWN
-                
-                # Dibujar casilla
                 rect = pygame.Rect(x, y, SQUARE_SIZE, SQUARE_SIZE)
-                pygame.draw.rect(self.screen, color, rect)
-                
-                # Agregar borde sutil
-                pygame.draw.rect(self.screen, (0, 0, 0, 20), rect, 1)
                 
                 # Highlight casilla seleccionada
                 if self.game.selected_pos == (row, col):
@@ -550,17 +551,6 @@ class ChessGUI:
                         pygame.draw.circle(self.screen, HIGHLIGHT_COLOR, 
                                          (x + SQUARE_SIZE//2, y + SQUARE_SIZE//2), 
                                          SQUARE_SIZE//5, 3)
-        
-        # Coordenadas del tablero
-        coord_font = pygame.font.Font(None, 24)
-        for i in range(8):
-            # Números (filas)
-            text = coord_font.render(str(8-i), True, BLACK)
-            self.screen.blit(text, (5, i * SQUARE_SIZE + 10))
-            
-            # Letras (columnas)
-            text = coord_font.render(chr(ord('a') + i), True, BLACK)
-            self.screen.blit(text, (i * SQUARE_SIZE + SQUARE_SIZE - 20, BOARD_SIZE * SQUARE_SIZE - 25))
     
     def draw_pieces(self):
         """Dibujar piezas usando sprites generados"""
@@ -632,11 +622,8 @@ class ChessGUI:
                     if event.key == pygame.K_r and self.game.game_over:
                         self.game = ChessGame()
             
-            # Fondo con gradiente sutil
-            for y in range(WINDOW_HEIGHT):
-                intensity = int(240 + 15 * math.sin(y * 0.01))
-                color = (intensity, intensity, intensity + 5)
-                pygame.draw.line(self.screen, color, (0, y), (WINDOW_WIDTH, y))
+            # Fondo con gradiente sutil, generado una sola vez
+            self.background.draw(self.screen)
             
             self.draw_board()
             self.draw_pieces()
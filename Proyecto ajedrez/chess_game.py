@@ -2,6 +2,9 @@ import pygame
 import sys
 from typing import List, Tuple, Optional
 
+from board_layer import BoardLayer
+from glyph_cache import GlyphCache
+
 # Inicializar pygame
 pygame.init()
 
@@ -19,6 +22,7 @@ SELECTED_COLOR = (0, 255, 0, 128)
 PIECE_SHADOW_COLOR = (50, 50, 50)
 PIECE_WHITE_COLOR = (245, 245, 245)
 PIECE_BLACK_COLOR = (50, 50, 50)
+PIECE_FONT_SIZE = 85
 
 class Piece:
     def __init__(self, color: str, piece_type: str, row: int, col: int):
@@ -27,7 +31,8 @@ class Piece:
         self.row = row
         self.col = col
         self.has_moved = False
-      def get_symbol(self) -> str:
+
+    def get_symbol(self) -> str:
         # Usando símbolos Unicode más grandes y mejor definidos
         symbols = {
             'white': {
@@ -254,7 +259,10 @@ class ChessGUI:
         pygame.display.set_caption("♔ Ajedrez Premium - Python ♔")
         self.clock = pygame.time.Clock()
         # Fuentes más grandes y mejor renderizado
-        self.font = pygame.font.Font(None, 85)  # Aumentado considerablemente
+        # Las piezas se renderizan una vez y se guardan en la caché de glyphs
+        self.glyphs = GlyphCache()
+        self.font = self.glyphs.font(PIECE_FONT_SIZE)  # Aumentado considerablemente
+        self.board_layer = BoardLayer(SQUARE_SIZE, LIGHT_BROWN, DARK_BROWN)
         self.info_font = pygame.font.Font(None, 36)
         self.game = ChessGame()
         
@@ -262,12 +270,9 @@ class ChessGUI:
         pygame.font.init()
     
     def draw_board(self):
+        self.board_layer.draw(self.screen, show_coordinates=False)
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
-                color = LIGHT_BROWN if (row + col) % 2 == 0 else DARK_BROWN
-                rect = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-                pygame.draw.rect(self.screen, color, rect)
-                
                 # Highlight casilla seleccionada
                 if self.game.selected_pos == (row, col):
                     highlight_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
@@ -281,7 +286,8 @@ class ChessGUI:
                     highlight_surface.set_alpha(100)
                     highlight_surface.fill(HIGHLIGHT_COLOR[:3])
                     self.screen.blit(highlight_surface, (col * SQUARE_SIZE, row * SQUARE_SIZE))
-      def draw_pieces(self):
+
+    def draw_pieces(self):
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
                 piece = self.game.board[row][col]
@@ -294,20 +300,17 @@ class ChessGUI:
                     center_y = row * SQUARE_SIZE + SQUARE_SIZE // 2
                     
                     # Dibujar sombra de la pieza para efecto 3D
-                    shadow_text = self.font.render(symbol, True, PIECE_SHADOW_COLOR)
-                    shadow_rect = shadow_text.get_rect(center=(center_x + 2, center_y + 2))
-                    self.screen.blit(shadow_text, shadow_rect)
+                    self.glyphs.blit_centered(self.screen, symbol, PIECE_SHADOW_COLOR, PIECE_FONT_SIZE,
+                                              (center_x + 2, center_y + 2))
                     
                     # Dibujar la pieza principal con antialiasing
-                    piece_text = self.font.render(symbol, True, piece_color)
-                    piece_rect = piece_text.get_rect(center=(center_x, center_y))
-                    self.screen.blit(piece_text, piece_rect)
+                    self.glyphs.blit_centered(self.screen, symbol, piece_color, PIECE_FONT_SIZE,
+                                              (center_x, center_y))
                     
                     # Agregar brillo para piezas blancas
                     if piece.color == 'white':
-                        highlight_text = self.font.render(symbol, True, (255, 255, 255))
-                        highlight_rect = highlight_text.get_rect(center=(center_x - 1, center_y - 1))
-                        self.screen.blit(highlight_text, highlight_rect)
+                        self.glyphs.blit_centered(self.screen, symbol, WHITE, PIECE_FONT_SIZE,
+                                                  (center_x - 1, center_y - 1))
     
     def draw_info(self):
         info_y = BOARD_SIZE * SQUARE_SIZE + 10
@@ -1,10 +1,20 @@
 import pygame
 import sys
 import json
+import os
+import time
 from datetime import datetime
-from typing import List, Tuple, Optional, Dict
+from typing import Optional, Dict
 from enum import Enum
 
+from bitboard import BitboardPosition, OCCUPANCY, CODE_COLORS, CODE_TYPES, CODE_VALUES
+from board_layer import BoardLayer
+from glyph_cache import GlyphCache
+import tablebase
+from engine import TimeManager
+from engine_worker import EngineWorker, ENGINE_MOVE_EVENT, SEARCH, HINT
+from polyglot import OpeningBook
+
 # Inicializar pygame
 pygame.init()
 
@@ -20,11 +30,18 @@ DARK_BROWN = (181, 136, 99)
 HIGHLIGHT_COLOR = (255, 255, 0, 128)
 SELECTED_COLOR = (0, 255, 0, 128)
 CAPTURE_COLOR = (255, 0, 0, 128)
+HINT_COLOR = (0, 128, 255, 128)
 BLUE = (0, 0, 255)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
+PIECE_FONT_SIZE = 60
 GRAY = (128, 128, 128)
 LIGHT_GRAY = (200, 200, 200)
+ENGINE_TIME_LIMIT = 0.5  # Segundos de búsqueda por jugada del motor sin control de tiempo
+# Libro de aperturas Polyglot opcional para el motor y las pistas (tecla H)
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'book.bin')
+# Controles de tiempo que recorre la tecla T: (segundos de base, incremento por jugada)
+TIME_CONTROLS = [None, (60, 0), (180, 2), (300, 3), (600, 5)]
 
 class GameState(Enum):
     PLAYING = "playing"
@@ -32,6 +49,8 @@ class GameState(Enum):
     CHECKMATE = "checkmate"
     STALEMATE = "stalemate"
     PAUSED = "paused"
+    TIMEOUT = "timeout"
+    DRAW = "draw"  # Material insuficiente para dar mate
 
 class Piece:
     def __init__(self, color: str, piece_type: str, row: int, col: int):
@@ -70,243 +89,36 @@ class Piece:
         new_piece = Piece(self.color, self.piece_type, self.row, self.col)
         new_piece.has_moved = self.has_moved
         return new_piece
+
+class ChessGame(BitboardPosition):
+    """Partida: reglas sobre bitboards (BitboardPosition) más historial, reloj y estado"""
     
-    def get_possible_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        
-        if self.piece_type == 'pawn':
-            moves = self._get_pawn_moves(board)
-        elif self.piece_type == 'rook':
-            moves = self._get_rook_moves(board)
-        elif self.piece_type == 'knight':
-            moves = self._get_knight_moves(board)
-        elif self.piece_type == 'bishop':
-            moves = self._get_bishop_moves(board)
-        elif self.piece_type == 'queen':
-            moves = self._get_queen_moves(board)
-        elif self.piece_type == 'king':
-            moves = self._get_king_moves(board)
-        
-        return moves
-    
-    def _get_pawn_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        direction = -1 if self.color == 'white' else 1
-        start_row = 6 if self.color == 'white' else 1
-        
-        # Movimiento hacia adelante
-        new_row = self.row + direction
-        if 0 <= new_row < 8 and board[new_row][self.col] is None:
-            moves.append((new_row, self.col))
-            
-            # Doble movimiento desde posición inicial
-            if self.row == start_row and board[new_row + direction][self.col] is None:
-                moves.append((new_row + direction, self.col))
-        
-        # Capturas diagonales
-        for col_offset in [-1, 1]:
-            new_col = self.col + col_offset
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                target = board[new_row][new_col]
-                if target and target.color != self.color:
-                    moves.append((new_row, new_col))
-        
-        return moves
-    
-    def _get_rook_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        
-        for dr, dc in directions:
-            for i in range(1, 8):
-                new_row = self.row + i * dr
-                new_col = self.col + i * dc
-                
-                if not (0 <= new_row < 8 and 0 <= new_col < 8):
-                    break
-                
-                target = board[new_row][new_col]
-                if target is None:
-                    moves.append((new_row, new_col))
-                elif target.color != self.color:
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-        
-        return moves
-    
-    def _get_knight_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        knight_moves = [
-            (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-            (1, -2), (1, 2), (2, -1), (2, 1)
-        ]
-        
-        for dr, dc in knight_moves:
-            new_row = self.row + dr
-            new_col = self.col + dc
-            
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                target = board[new_row][new_col]
-                if target is None or target.color != self.color:
-                    moves.append((new_row, new_col))
-        
-        return moves
+    piece_class = Piece
     
-    def _get_bishop_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-        
-        for dr, dc in directions:
-            for i in range(1, 8):
-                new_row = self.row + i * dr
-                new_col = self.col + i * dc
-                
-                if not (0 <= new_row < 8 and 0 <= new_col < 8):
-                    break
-                
-                target = board[new_row][new_col]
-                if target is None:
-                    moves.append((new_row, new_col))
-                elif target.color != self.color:
-                    moves.append((new_row, new_col))
-                    break
-                else:
-                    break
-        
-        return moves
-    
-    def _get_queen_moves(self, board) -> List[Tuple[int, int]]:
-        return self._get_rook_moves(board) + self._get_bishop_moves(board)
-    
-    def _get_king_moves(self, board) -> List[Tuple[int, int]]:
-        moves = []
-        directions = [
-            (-1, -1), (-1, 0), (-1, 1),
-            (0, -1),           (0, 1),
-            (1, -1),  (1, 0),  (1, 1)
-        ]
-        
-        for dr, dc in directions:
-            new_row = self.row + dr
-            new_col = self.col + dc
-            
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                target = board[new_row][new_col]
-                if target is None or target.color != self.color:
-                    moves.append((new_row, new_col))
-        
-        return moves
-
-class ChessGame:
     def __init__(self):
-        self.board = [[None for _ in range(8)] for _ in range(8)]
-        self.current_player = 'white'
+        super().__init__()
         self.selected_piece = None
         self.selected_pos = None
         self.possible_moves = []
         self.game_state = GameState.PLAYING
+        self.tablebase_result = None  # (WIN/LOSS/DRAW del jugador al que le toca, medias jugadas al mate)
         self.move_history = []
         self.captured_pieces = {'white': [], 'black': []}
         self.move_count = 0
         self.start_time = datetime.now()
         self.game_time = {'white': 0, 'black': 0}
-        self.last_move_time = datetime.now()
-        self._setup_board()
-    
-    def _setup_board(self):
-        # Peones
-        for col in range(8):
-            self.board[1][col] = Piece('black', 'pawn', 1, col)
-            self.board[6][col] = Piece('white', 'pawn', 6, col)
-        
-        # Piezas especiales
-        piece_order = ['rook', 'knight', 'bishop', 'queen', 'king', 'bishop', 'knight', 'rook']
-        
-        for col, piece_type in enumerate(piece_order):
-            self.board[0][col] = Piece('black', piece_type, 0, col)
-            self.board[7][col] = Piece('white', piece_type, 7, col)
-    
-    def get_piece_at(self, row: int, col: int) -> Optional[Piece]:
-        if 0 <= row < 8 and 0 <= col < 8:
-            return self.board[row][col]
-        return None
-    
-    def find_king(self, color: str) -> Optional[Tuple[int, int]]:
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.piece_type == 'king' and piece.color == color:
-                    return (row, col)
-        return None
-    
-    def is_in_check(self, color: str) -> bool:
-        king_pos = self.find_king(color)
-        if not king_pos:
-            return False
-        
-        opponent_color = 'black' if color == 'white' else 'white'
-        
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == opponent_color:
-                    possible_moves = piece.get_possible_moves(self.board)
-                    if king_pos in possible_moves:
-                        return True
-        return False
-    
-    def would_be_in_check(self, from_row: int, from_col: int, to_row: int, to_col: int, color: str) -> bool:
-        original_piece = self.board[to_row][to_col]
-        moving_piece = self.board[from_row][from_col]
-        
-        self.board[to_row][to_col] = moving_piece
-        self.board[from_row][from_col] = None
-        if moving_piece:
-            moving_piece.row = to_row
-            moving_piece.col = to_col
-        
-        in_check = self.is_in_check(color)
-        
-        self.board[from_row][from_col] = moving_piece
-        self.board[to_row][to_col] = original_piece
-        if moving_piece:
-            moving_piece.row = from_row
-            moving_piece.col = from_col
-        
-        return in_check
-    
-    def get_valid_moves(self, piece: Piece) -> List[Tuple[int, int]]:
-        possible_moves = piece.get_possible_moves(self.board)
-        valid_moves = []
-        
-        for to_row, to_col in possible_moves:
-            if not self.would_be_in_check(piece.row, piece.col, to_row, to_col, piece.color):
-                valid_moves.append((to_row, to_col))
-        
-        return valid_moves
-    
-    def has_valid_moves(self, color: str) -> bool:
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.color == color:
-                    if self.get_valid_moves(piece):
-                        return True
-        return False
+        self.last_move_time = time.monotonic()
+        # Control de tiempo (base, incremento) en segundos y reloj restante; None = sin reloj
+        self.time_control = None
+        self.time_left = {'white': 0.0, 'black': 0.0}
     
     def calculate_material_balance(self) -> Dict[str, int]:
-        """Calcular balance de material"""
-        balance = {'white': 0, 'black': 0}
-        
-        for row in range(8):
-            for col in range(8):
-                piece = self.board[row][col]
-                if piece and piece.piece_type != 'king':
-                    balance[piece.color] += piece.value
-        
-        return balance
+        """Material de cada bando en peones (Piece.value, sin reyes), contado en los bitboards"""
+        material = {'white': 0, 'black': 0}
+        for code, bitboard in enumerate(self.bitboards[:OCCUPANCY]):
+            if bitboard and CODE_TYPES[code] != 'king':
+                material[CODE_COLORS[code]] += CODE_VALUES[code] * bin(bitboard).count('1')
+        return material
     
     def update_game_state(self):
         if self.is_in_check(self.current_player):
@@ -318,30 +130,62 @@ class ChessGame:
             self.game_state = GameState.STALEMATE
         else:
             self.game_state = GameState.PLAYING
+        
+        # Sin material para dar mate la partida termina en tablas
+        if self.game_state in (GameState.PLAYING, GameState.CHECK) and self._insufficient_material():
+            self.game_state = GameState.DRAW
+        
+        # Con tres piezas o menos el resultado exacto sale de las tablas de finales
+        self.tablebase_result = None
+        if (self.game_state in (GameState.PLAYING, GameState.CHECK) and
+                self.piece_count <= 3):
+            self.tablebase_result = tablebase.default_tablebase().probe(self)
+    
+    def _insufficient_material(self) -> bool:
+        """Solo quedan los reyes, o un rey con un alfil o un caballo: nadie puede dar mate"""
+        if self.piece_count > 3:
+            return False
+        extra = [piece for pieces in self.pieces.values() for piece in pieces if piece.piece_type != 'king']
+        return not extra or (len(extra) == 1 and extra[0].piece_type in ('knight', 'bishop'))
+    
+    def set_time_control(self, base: Optional[float], increment: float = 0):
+        """Fijar el control de tiempo (segundos de base e incremento por jugada) o quitarlo con None"""
+        self.time_control = (base, increment) if base else None
+        self.time_left = {'white': float(base or 0), 'black': float(base or 0)}
+        self.last_move_time = time.monotonic()
     
     def update_timer(self):
-        """Actualizar el tiempo de juego"""
-        current_time = datetime.now()
-        time_diff = (current_time - self.last_move_time).total_seconds()
-        
-        opponent = 'black' if self.current_player == 'white' else 'white'
-        self.game_time[opponent] += time_diff
+        """Cargar el tiempo transcurrido al jugador al que le toca (con reloj monotónico)"""
+        current_time = time.monotonic()
+        time_diff = current_time - self.last_move_time
         self.last_move_time = current_time
+        if self.game_state in (GameState.CHECKMATE, GameState.STALEMATE, GameState.TIMEOUT, GameState.DRAW):
+            return
+        
+        self.game_time[self.current_player] += time_diff
+        if self.time_control:
+            self.time_left[self.current_player] -= time_diff
+            if self.time_left[self.current_player] <= 0:
+                self.time_left[self.current_player] = 0.0
+                self.game_state = GameState.TIMEOUT
     
-    def move_piece(self, from_row: int, from_col: int, to_row: int, to_col: int) -> bool:
+    def move_piece(self, from_row: int, from_col: int, to_row: int, to_col: int, promotion: Optional[str] = None) -> bool:
         piece = self.board[from_row][from_col]
         if not piece or piece.color != self.current_player:
             return False
         
-        valid_moves = self.get_valid_moves(piece)
-        if (to_row, to_col) not in valid_moves:
+        if (to_row, to_col) not in self.get_legal_move_map().get((from_row, from_col), ()):
             return False
         
-        # Actualizar tiempo
+        # Actualizar tiempo; sin reloj restante o en tablas ya no se puede mover
         self.update_timer()
+        if self.game_state in (GameState.TIMEOUT, GameState.DRAW):
+            return False
         
         # Capturar pieza si existe
         captured_piece = self.board[to_row][to_col]
+        if piece.piece_type == 'pawn' and captured_piece is None and from_col != to_col:
+            captured_piece = self.board[from_row][to_col]  # Captura al paso
         if captured_piece:
             self.captured_pieces[captured_piece.color].append(captured_piece)
         
@@ -349,6 +193,8 @@ class ChessGame:
         from_pos = f"{chr(ord('a') + from_col)}{8 - from_row}"
         to_pos = f"{chr(ord('a') + to_col)}{8 - to_row}"
         notation = f"{piece.get_symbol()}{from_pos}-{to_pos}"
+        if piece.piece_type == 'king' and abs(to_col - from_col) == 2:
+            notation = "O-O" if to_col == 6 else "O-O-O"
         if captured_piece:
             notation += f"x{captured_piece.get_symbol()}"
         
@@ -362,27 +208,34 @@ class ChessGame:
         }
         self.move_history.append(move)
         
-        # Realizar el movimiento
-        self.board[to_row][to_col] = piece
-        self.board[from_row][from_col] = None
-        piece.row = to_row
-        piece.col = to_col
-        piece.has_moved = True
-        
-        # Promoción de peón
-        if piece.piece_type == 'pawn':
-            if (piece.color == 'white' and to_row == 0) or (piece.color == 'black' and to_row == 7):
-                piece.piece_type = 'queen'
-        
-        # Cambiar turno
-        self.current_player = 'black' if self.current_player == 'white' else 'white'
+        # Realizar el movimiento (incluye enroque, promoción y cambio de turno)
+        self.make_move(from_row, from_col, to_row, to_col, promotion)
         self.move_count += 1
+        if self.time_control:
+            self.time_left[piece.color] += self.time_control[1]
         
         # Actualizar estado del juego
         self.update_game_state()
         
         return True
     
+    def undo_move(self) -> bool:
+        """Deshacer el último movimiento de la partida"""
+        if not self.move_history:
+            return False
+        
+        move = self.move_history.pop()
+        self.unmake_move()
+        if move['captured']:
+            self.captured_pieces['black' if self.current_player == 'white' else 'white'].pop()
+        self.move_count -= 1
+        
+        self.selected_piece = None
+        self.selected_pos = None
+        self.possible_moves = []
+        self.update_game_state()
+        return True
+    
     def select_piece(self, row: int, col: int):
         piece = self.board[row][col]
         
@@ -391,10 +244,10 @@ class ChessGame:
                 self.selected_piece = None
                 self.selected_pos = None
                 self.possible_moves = []
-        elif piece and piece.color == self.current_player and self.game_state not in [GameState.CHECKMATE, GameState.STALEMATE]:
+        elif piece and piece.color == self.current_player and self.game_state not in [GameState.CHECKMATE, GameState.STALEMATE, GameState.TIMEOUT, GameState.DRAW]:
             self.selected_piece = piece
             self.selected_pos = (row, col)
-            self.possible_moves = self.get_valid_moves(piece)
+            self.possible_moves = self.get_legal_move_map().get((row, col), [])
         else:
             self.selected_piece = None
             self.selected_pos = None
@@ -427,6 +280,17 @@ class ChessGame:
         except Exception:
             return False
     
+    def load_fen(self, fen: str):
+        """Cargar una posición en notación FEN y empezar la partida desde ella"""
+        super().load_fen(fen)
+        self.selected_piece = None
+        self.selected_pos = None
+        self.possible_moves = []
+        self.move_history = []
+        self.captured_pieces = {'white': [], 'black': []}
+        self.move_count = 0
+        self.update_game_state()
+    
     def reset_game(self):
         self.__init__()
 
@@ -435,21 +299,30 @@ class ChessGUI:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("♔ Ajedrez Profesional - Python ♔")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 60)
+        self.glyphs = GlyphCache()  # Cada pieza se renderiza una sola vez
+        self.font = self.glyphs.font(PIECE_FONT_SIZE)
+        self.board_layer = BoardLayer(SQUARE_SIZE, LIGHT_BROWN, DARK_BROWN)  # Casillas y coordenadas
         self.info_font = pygame.font.Font(None, 24)
         self.title_font = pygame.font.Font(None, 32)
         self.small_font = pygame.font.Font(None, 20)
         self.game = ChessGame()
         self.show_coordinates = True
         self.show_last_move = True
+        self.time_control_index = 0
+        self.engine_worker = None  # Proceso del motor, creado al activarlo
+        self.engine_color = None  # Color que juega el motor (None = dos jugadores)
+        self.engine_request = None  # Número de la búsqueda pendiente
+        self.ponder = None  # (número de la reflexión, clave Zobrist tras la respuesta prevista)
+        self.last_search = None
+        self.book = OpeningBook(BOOK_PATH) if os.path.exists(BOOK_PATH) else None
+        self.hint = None  # (clave Zobrist de la posición, jugada sugerida)
+        self.hint_request = None  # (número de petición, clave Zobrist) de la pista pendiente
     
     def draw_board(self):
+        # Casillas y coordenadas (si están habilitadas) en un solo blit
+        self.board_layer.draw(self.screen, self.show_coordinates)
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
-                color = LIGHT_BROWN if (row + col) % 2 == 0 else DARK_BROWN
-                rect = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
-                pygame.draw.rect(self.screen, color, rect)
-                
                 # Highlight casilla seleccionada
                 if self.game.selected_pos == (row, col):
                     highlight_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
@@ -470,29 +343,22 @@ class ChessGUI:
                     highlight_surface.fill(color_to_use)
                     self.screen.blit(highlight_surface, (col * SQUARE_SIZE, row * SQUARE_SIZE))
         
-        # Dibujar coordenadas si está habilitado
-        if self.show_coordinates:
-            for i in range(8):
-                # Números (filas)
-                text = self.small_font.render(str(8-i), True, BLACK)
-                self.screen.blit(text, (5, i * SQUARE_SIZE + 5))
-                
-                # Letras (columnas)
-                text = self.small_font.render(chr(ord('a') + i), True, BLACK)
-                self.screen.blit(text, (i * SQUARE_SIZE + SQUARE_SIZE - 15, BOARD_SIZE * SQUARE_SIZE - 20))
+        # Pista: origen y destino de la jugada sugerida, mientras siga siendo la misma posición
+        if self.hint and self.hint[0] == self.game.zobrist_key:
+            from_row, from_col, to_row, to_col = self.hint[1][:4]
+            for row, col in ((from_row, from_col), (to_row, to_col)):
+                rect = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+                pygame.draw.rect(self.screen, HINT_COLOR[:3], rect, 4)
     
     def draw_pieces(self):
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
                 piece = self.game.board[row][col]
                 if piece:
-                    symbol = piece.get_symbol()
-                    text = self.font.render(symbol, True, BLACK)
-                    text_rect = text.get_rect(center=(
+                    self.glyphs.blit_centered(self.screen, piece.get_symbol(), BLACK, PIECE_FONT_SIZE, (
                         col * SQUARE_SIZE + SQUARE_SIZE // 2,
                         row * SQUARE_SIZE + SQUARE_SIZE // 2
                     ))
-                    self.screen.blit(text, text_rect)
     
     def draw_side_panel(self):
         """Dibujar panel lateral con información del juego"""
@@ -522,6 +388,13 @@ class ChessGUI:
         elif self.game.game_state == GameState.STALEMATE:
             status = "🤝 EMPATE (Ahogado)"
             color = BLUE
+        elif self.game.game_state == GameState.TIMEOUT:
+            winner = 'black' if self.game.current_player == 'white' else 'white'
+            status = f"⏰ ¡{winner.upper()} GANA por tiempo!"
+            color = RED
+        elif self.game.game_state == GameState.DRAW:
+            status = "🤝 EMPATE (Material insuficiente)"
+            color = BLUE
         else:
             status = f"▶️ Turno: {self.game.current_player.upper()}"
             color = BLACK
@@ -542,11 +415,50 @@ class ChessGUI:
         self.screen.blit(material_text, (panel_x + 10, y_offset))
         y_offset += 25
         
+        # Evaluación incremental (material y casillas), en peones a favor de las blancas
+        evaluation_text = self.info_font.render(f"Evaluación: {self.game.evaluation / 100:+.2f}", True, BLACK)
+        self.screen.blit(evaluation_text, (panel_x + 10, y_offset))
+        y_offset += 25
+        
+        # Resultado exacto de las tablas de finales
+        if self.game.tablebase_result:
+            outcome, plies = self.game.tablebase_result
+            if outcome == tablebase.DRAW:
+                ending = "Final: tablas"
+            else:
+                winner = self.game.current_player if outcome == tablebase.WIN else (
+                    'black' if self.game.current_player == 'white' else 'white')
+                ending = f"Final: {'Blancas' if winner == 'white' else 'Negras'} dan mate en {(plies + 1) // 2}"
+            ending_text = self.small_font.render(ending, True, BLUE)
+            self.screen.blit(ending_text, (panel_x + 10, y_offset))
+            y_offset += 20
+        
+        # Motor
+        if self.engine_color:
+            engine_info = f"Motor: {'Blancas' if self.engine_color == 'white' else 'Negras'}"
+            if self.engine_request is not None:
+                engine_info += " (pensando...)"
+            elif self.ponder is not None:
+                engine_info += " (reflexionando...)"
+            elif self.last_search:
+                engine_info += f" (prof. {self.last_search.depth}, {self.last_search.score / 100:+.2f})"
+            engine_text = self.small_font.render(engine_info, True, BLUE)
+            self.screen.blit(engine_text, (panel_x + 10, y_offset))
+            y_offset += 20
+        
         # Tiempo de juego
         self.game.update_timer()
-        white_time = int(self.game.game_time['white'])
-        black_time = int(self.game.game_time['black'])
-        time_text = f"Tiempo - B:{white_time//60}:{white_time%60:02d} N:{black_time//60}:{black_time%60:02d}"
+        if self.game.time_control:
+            # Reloj restante (se redondea hacia arriba, como en un reloj de ajedrez)
+            white_time = int(-(-self.game.time_left['white'] // 1))
+            black_time = int(-(-self.game.time_left['black'] // 1))
+            base, increment = self.game.time_control
+            label = f"Reloj {base // 60}+{increment}"
+        else:
+            white_time = int(self.game.game_time['white'])
+            black_time = int(self.game.game_time['black'])
+            label = "Tiempo"
+        time_text = f"{label} - B:{white_time//60}:{white_time%60:02d} N:{black_time//60}:{black_time%60:02d}"
         timer_text = self.info_font.render(time_text, True, BLACK)
         self.screen.blit(timer_text, (panel_x + 10, y_offset))
         y_offset += 35
@@ -587,6 +499,10 @@ class ChessGUI:
         controls = [
             "Click: Seleccionar/Mover",
             "R: Reiniciar juego",
+            "U: Deshacer movimiento",
+            "E: Jugar contra el motor",
+            "T: Control de tiempo",
+            "H: Pista",
             "S: Guardar partida",
             "C: Mostrar coordenadas",
             "ESC: Salir"
@@ -598,11 +514,111 @@ class ChessGUI:
             y_offset += 18
     
     def handle_click(self, pos):
+        if self.engine_color == self.game.current_player:
+            return  # Turno del motor
         if pos[0] < BOARD_SIZE * SQUARE_SIZE:  # Click en el tablero
             col = pos[0] // SQUARE_SIZE
             row = pos[1] // SQUARE_SIZE
             self.game.select_piece(row, col)
     
+    def toggle_engine(self):
+        """Activar el motor con el color contrario al del jugador al que le toca, o desactivarlo"""
+        self.cancel_engine()
+        if self.engine_color:
+            self.engine_color = None
+        else:
+            self.engine_color = 'black' if self.game.current_player == 'white' else 'white'
+            self._ensure_engine_worker()
+        self.last_search = None
+    
+    def _ensure_engine_worker(self):
+        if self.engine_worker is None:
+            self.engine_worker = EngineWorker(book_path=BOOK_PATH if self.book else None)
+    
+    def show_hint(self):
+        """Sugerir una jugada al humano: del libro si la hay, si no una búsqueda corta del motor"""
+        if (self.engine_color == self.game.current_player or
+                self.game.game_state not in (GameState.PLAYING, GameState.CHECK)):
+            return
+        key = self.game.zobrist_key
+        move = self.book.choose_move(self.game) if self.book else None
+        if move:
+            self.hint = (key, move)
+            return
+        self._ensure_engine_worker()
+        self.ponder = None  # La pista cancela la reflexión en curso
+        self.hint_request = (self.engine_worker.hint(self.game, ENGINE_TIME_LIMIT), key)
+    
+    def cancel_engine(self):
+        """Detener al instante la búsqueda o la reflexión en curso"""
+        if self.engine_worker:
+            self.engine_worker.cancel()
+        self.engine_request = None
+        self.ponder = None
+    
+    def undo(self):
+        """Deshacer; contra el motor se deshace también su respuesta"""
+        self.cancel_engine()
+        self.game.undo_move()
+        if self.engine_color and self.game.current_player == self.engine_color:
+            self.game.undo_move()
+    
+    def cycle_time_control(self):
+        """Pasar al siguiente control de tiempo y empezar la partida de nuevo con él"""
+        self.time_control_index = (self.time_control_index + 1) % len(TIME_CONTROLS)
+        self.reset_game()
+    
+    def reset_game(self):
+        """Reiniciar la partida conservando el control de tiempo elegido"""
+        self.cancel_engine()
+        self.game.reset_game()
+        time_control = TIME_CONTROLS[self.time_control_index]
+        if time_control:
+            self.game.set_time_control(*time_control)
+    
+    def _engine_budget(self):
+        """(tiempo fijo, TimeManager) para la próxima jugada del motor"""
+        if self.game.time_control:
+            return None, TimeManager(self.game.time_left[self.engine_color], self.game.time_control[1])
+        return ENGINE_TIME_LIMIT, None
+    
+    def update_engine(self):
+        """Pedir la jugada al motor cuando le toca; la respuesta llega como evento"""
+        if (self.engine_color == self.game.current_player and self.engine_request is None and
+                self.game.game_state in (GameState.PLAYING, GameState.CHECK)):
+            if self.ponder and self.ponder[1] == self.game.zobrist_key:
+                # El humano jugó la respuesta prevista: la reflexión sigue como búsqueda
+                self.engine_request = self.engine_worker.ponder_hit(self.ponder[0])
+            else:
+                time_limit, time_manager = self._engine_budget()
+                self.engine_request = self.engine_worker.think(self.game, time_limit, time_manager=time_manager)
+            self.ponder = None
+    
+    def handle_engine_event(self, event):
+        """Jugar la jugada recibida del motor y reflexionar sobre la respuesta prevista del rival"""
+        if event.kind == HINT:
+            if self.hint_request and event.request_id == self.hint_request[0] and event.result.move:
+                self.hint = (self.hint_request[1], event.result.move)
+            self.hint_request = None
+            return
+        if event.kind != SEARCH or event.request_id != self.engine_request:
+            return  # Reflexión interrumpida o búsqueda cancelada
+        self.engine_request = None
+        self.last_search = event.result
+        if event.result.move and self.game.current_player == self.engine_color:
+            self.game.move_piece(*event.result.move)
+            self.game.selected_piece = None
+            self.game.selected_pos = None
+            self.game.possible_moves = []
+            reply = event.result.ponder
+            if reply and self.game.game_state in (GameState.PLAYING, GameState.CHECK):
+                # Reflexionar sobre la respuesta prevista; su clave reconoce el acierto
+                self.game.make_move(*reply)
+                key = self.game.zobrist_key
+                self.game.unmake_move()
+                time_limit, time_manager = self._engine_budget()
+                self.ponder = (self.engine_worker.ponder(self.game, reply, time_limit, time_manager), key)
+    
     def run(self):
         running = True
         
@@ -610,13 +626,27 @@ class ChessGUI:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == ENGINE_MOVE_EVENT:
+                    self.handle_engine_event(event)
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Click izquierdo
                         self.handle_click(event.pos)
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
                         # Reiniciar juego
-                        self.game.reset_game()
+                        self.reset_game()
+                    elif event.key == pygame.K_u:
+                        # Deshacer último movimiento
+                        self.undo()
+                    elif event.key == pygame.K_e:
+                        # Jugar contra el motor
+                        self.toggle_engine()
+                    elif event.key == pygame.K_t:
+                        # Cambiar control de tiempo (reinicia la partida)
+                        self.cycle_time_control()
+                    elif event.key == pygame.K_h:
+                        # Pista: jugada de libro o del motor
+                        self.show_hint()
                     elif event.key == pygame.K_s:
                         # Guardar partida
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -635,8 +665,16 @@ class ChessGUI:
             self.draw_side_panel()
             
             pygame.display.flip()
+            
+            # El motor piensa en su propio proceso: el bucle sigue dibujando a 60 FPS
+            self.update_engine()
+            
             self.clock.tick(60)
         
+        if self.engine_worker:
+            self.engine_worker.close()
+        if self.book:
+            self.book.close()
         pygame.quit()
         sys.exit()
 
@@ -646,6 +684,10 @@ if __name__ == "__main__":
     print("Controles:")
     print("  Click: Seleccionar y mover piezas")
     print("  R: Reiniciar juego")
+    print("  U: Deshacer movimiento")
+    print("  E: Jugar contra el motor")
+    print("  T: Cambiar control de tiempo (reinicia la partida)")
+    print("  H: Pista (libro de aperturas o motor)")
     print("  S: Guardar partida")
     print("  C: Mostrar/ocultar coordenadas")
     print("  ESC: Salir")
@@ -3,6 +3,9 @@ import sys
 import math
 from typing import List, Tuple, Optional
 
+from board_layer import BoardLayer
+from gradients import GradientBackground
+
 # Inicializar pygame
 pygame.init()
 
@@ -248,6 +251,11 @@ class ChessGame:
             self.selected_pos = None
             self.possible_moves = []
 
+def background_color(y: int, height: int) -> Tuple[int, int, int]:
+    """Color de la fila y del fondo con gradiente"""
+    color_value = int(245 - (y / height) * 20)
+    return (color_value, color_value, color_value + 10)
+
 class ChessGUI:
     def __init__(self):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -256,28 +264,20 @@ class ChessGUI:
         self.font = pygame.font.Font(None, 48)
         self.big_font = pygame.font.Font(None, 90)
         self.info_font = pygame.font.Font(None, 32)
+        self.board_layer = BoardLayer(SQUARE_SIZE, LIGHT_BROWN, DARK_BROWN, border_color=BLACK,
+                                      coord_font_size=24, rank_offset=(5, 10), file_offset=(20, 25))
+        self.background = GradientBackground(background_color)
         self.game = ChessGame()
     
     def draw_board(self):
         """Dibujar tablero con gradientes y efectos"""
+        # Casillas, bordes y coordenadas pre-renderizados
+        self.board_layer.draw(self.screen)
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
                 x = col * SQUARE_SIZE
                 y = row * SQUARE_SIZE
                 
-                # Color base
-                if (row + col) % 2 == 0:
-                    base_color = LIGHT_BROWN
-                else:
-                    base_color = DARK_BROWN
-                
-                # Dibujar casilla base
-                rect = pygame.Rect(x, y, SQUARE_SIZE, SQUARE_SIZE)
-                pygame.draw.rect(self.screen, base_color, rect)
-                
-                # Agregar efecto de borde
-                pygame.draw.rect(self.screen, (0, 0, 0, 30), rect, 1)
-                
                 # Highlight casilla seleccionada
                 if self.game.selected_pos == (row, col):
                     highlight_surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE))
@@ -298,17 +298,6 @@ class ChessGUI:
                         pygame.draw.circle(self.screen, (255, 255, 0), 
                                          (x + SQUARE_SIZE//2, y + SQUARE_SIZE//2), 
                                          SQUARE_SIZE//6)
-        
-        # Dibujar coordenadas
-        coord_font = pygame.font.Font(None, 24)
-        for i in range(8):
-            # Números (filas)
-            text = coord_font.render(str(8-i), True, BLACK)
-            self.screen.blit(text, (5, i * SQUARE_SIZE + 10))
-            
-            # Letras (columnas)
-            text = coord_font.render(chr(ord('a') + i), True, BLACK)
-            self.screen.blit(text, (i * SQUARE_SIZE + SQUARE_SIZE - 20, BOARD_SIZE * SQUARE_SIZE - 25))
     
     def draw_piece_shapes(self, piece: Piece, center_x: int, center_y: int):
         """Dibujar piezas con formas geométricas personalizadas"""
@@ -488,11 +477,8 @@ class ChessGUI:
                     if event.key == pygame.K_r and self.game.game_over:
                         self.game = ChessGame()
             
-            # Fondo con gradiente
-            for y in range(WINDOW_HEIGHT):
-                color_value = int(245 - (y / WINDOW_HEIGHT) * 20)
-                color = (color_value, color_value, color_value + 10)
-                pygame.draw.line(self.screen, color, (0, y), (WINDOW_WIDTH, y))
+            # Fondo con gradiente, generado una sola vez
+            self.background.draw(self.screen)
             
             self.draw_board()
             self.draw_pieces()
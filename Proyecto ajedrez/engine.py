@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Motor de búsqueda para jugar contra el ordenador.
+
+Negamax con poda alfa-beta y profundización iterativa sobre el núcleo de
+reglas de ``chess_professional``, con búsqueda de quiescencia sobre capturas
+y promociones en las hojas. La evaluación suma al material y las casillas
+la estructura de peones, guardada en una tabla hash de peones. Los finales de tres piezas se resuelven con
+las tablas de ``tablebase.py`` en lugar de buscar. La búsqueda recorre el árbol con
+``make_move``/``unmake_move`` sobre la misma partida, sin copiar tableros,
+y se detiene al agotar el tiempo o los nodos asignados devolviendo la mejor
+jugada encontrada.
+
+Uso:
+    python engine.py                                 # posición inicial, 1 segundo
+    python engine.py --fen "<FEN>" --time 5
+    python engine.py --depth 4
+    python engine.py --clock 180 --inc 2             # reparte 3 minutos + 2 s por jugada
+    python engine.py --book libro.bin                # jugadas de libro Polyglot en la apertura
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from bitboard import CODE_COLORS, CODE_TYPES, CODE_VALUES, PIECE_TYPES
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from evaluation import PawnHashTable
+from tablebase import WIN, LOSS
+
+MATE_SCORE = 100000
+INFINITY = 1000000
+MAX_DEPTH = 64
+CHECK_INTERVAL = 1024  # Nodos entre comprobaciones del reloj
+MATE_BOUND = MATE_SCORE - 1000  # A partir de aquí la puntuación es un mate (las tablas lo ven lejos)
+
+# Prioridades de ordenación: jugada de la tabla, capturas (MVV-LVA), killers, historial
+HASH_MOVE_PRIORITY = 1 << 30
+CAPTURE_PRIORITY = 1 << 24
+KILLER_PRIORITY = 1 << 22
+HISTORY_LIMIT = 1 << 20
+
+# Reparto del reloj
+DEFAULT_MOVES_TO_GO = 30      # Jugadas que se supone que quedan cuando el control no lo dice
+SAFETY_MARGIN = 0.1           # Segundos que nunca se gastan (latencia de la interfaz)
+MAXIMUM_FACTOR = 5            # Límite duro respecto al tiempo previsto
+INSTABILITY_EXTENSION = 1.5   # Ampliación del tiempo previsto cuando cambia la mejor jugada
+
+Move = Tuple[int, int, int, int, Optional[str]]
+
+
+class SearchResult(NamedTuple):
+    move: Optional[Move]
+    score: int       # Centipeones desde el punto de vista del jugador al que le toca
+    depth: int       # Última profundidad completada
+    nodes: int
+    elapsed: float
+    ponder: Optional[Move] = None  # Respuesta prevista del rival, para reflexionar sobre ella
+
+
+class SearchAborted(Exception):
+    """Se agotó el presupuesto de tiempo o de nodos"""
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    """Los mates se guardan contados desde el nodo, no desde la raíz"""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def tablebase_score(result, ply: int) -> int:
+    """Puntuación de un resultado de Tablebase.probe visto desde el nodo a distancia ply de la raíz"""
+    outcome, plies = result
+    if outcome == WIN:
+        return MATE_SCORE - ply - plies
+    if outcome == LOSS:
+        return -MATE_SCORE + ply + plies
+    return 0
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class TimeManager:
+    """Reparto del tiempo restante de reloj entre las jugadas que quedan"""
+
+    def __init__(self, remaining: float, increment: float = 0.0, moves_to_go: Optional[int] = None):
+        usable = max(remaining - SAFETY_MARGIN, 0.01)
+        moves_to_go = moves_to_go or DEFAULT_MOVES_TO_GO
+        # Tiempo previsto para esta jugada y límite duro que nunca se supera
+        self.optimum = min(usable / moves_to_go + increment * 0.8, usable)
+        self.maximum = max(self.optimum, min(self.optimum * MAXIMUM_FACTOR, usable * 0.3))
+
+    def should_stop(self, elapsed: float, best_move_changed: bool) -> bool:
+        """Decidir tras una iteración completa si se empieza otra"""
+        if best_move_changed:
+            # Mejor jugada inestable: merece la pena pensar más
+            self.optimum = min(self.optimum * INSTABILITY_EXTENSION, self.maximum)
+        # La siguiente iteración cuesta varias veces la anterior: si ya se ha gastado
+        # buena parte del tiempo previsto no llegaría a terminar
+        return elapsed >= self.optimum * 0.6
+
+
+def root_position(game):
+    """FEN y jugadas desde el último movimiento irreversible, para que los procesos
+    reconstruyan también el historial que necesita la detección de repeticiones"""
+    moves = []
+    stack = game.undo_stack
+    while stack and stack[-1][4] is None and stack[-1][6] != 'pawn':
+        moves.append(stack[-1][:4] + (None,))
+        game.unmake_move()
+    fen = game.get_fen()
+    moves.reverse()
+    for move in moves:
+        game.make_move(*move)
+    return fen, moves
+
+
+class Engine:
+    def __init__(self, hash_mb: float = 16, hash_buffer=None, stop_event=None, book=None, tablebase=None,
+                 pawn_hash_mb: float = 1):
+        self.tt = TranspositionTable(hash_mb, hash_buffer)
+        self.pawn_table = PawnHashTable(pawn_hash_mb)  # Estructura de peones por clave de peones
+        self.stop_event = stop_event  # Evento externo (threading/multiprocessing) que corta la búsqueda
+        self.book = book  # polyglot.OpeningBook: sus jugadas se juegan sin buscar
+        self.book_rng = random.Random()  # Elección entre jugadas de libro según su peso
+        self.tablebase = tablebase  # tablebase.Tablebase: resultado exacto con tres piezas o menos
+        self.tablebase_hits = 0
+        self.nodes = 0
+        self.tt_hits = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        # Dos killers por ply y puntuación de historial por color y (origen, destino)
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self.history = {'white': [0] * 4096, 'black': [0] * 4096}
+        self.deadline = None
+        self.node_limit = None
+        self._time_limit = None
+        self._start = 0.0
+        self._ponder_hit = None
+        self._next_check = CHECK_INTERVAL
+        self._root_best = None
+
+    def evaluate(self, game) -> int:
+        """Material, casillas y estructura de peones en centipeones desde el punto de vista del
+        jugador al que le toca; make_move mantiene la evaluación y la clave de peones, así que
+        solo se recorre el tablero cuando la estructura no está en la tabla"""
+        score = game.evaluation + self.pawn_table.score(game)
+        return score if game.current_player == 'white' else -score
+
+    def search(self, game, time_limit: Optional[float] = None, node_limit: Optional[int] = None,
+               max_depth: int = MAX_DEPTH, start_depth: int = 1,
+               time_manager: Optional[TimeManager] = None, ponder_hit=None) -> SearchResult:
+        """Buscar la mejor jugada del jugador al que le toca dentro del presupuesto indicado;
+        con time_manager el tiempo lo decide el reloj en lugar de time_limit.
+
+        Con ponder_hit la búsqueda es una reflexión sobre la respuesta prevista del rival: no
+        tiene límite de tiempo hasta que ponder_hit.is_set(), y desde ese momento gasta el
+        presupuesto como si acabara de empezar, conservando lo ya buscado"""
+        start = time.perf_counter()
+        if time_manager is not None:
+            time_limit = time_manager.maximum
+        self._time_limit = time_limit
+        self._ponder_hit = ponder_hit
+        self._start_clock(start)
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.tt_hits = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tablebase_hits = 0
+        self.pawn_table.reset_stats()
+        self._next_check = CHECK_INTERVAL
+        self.tt.new_search()
+        self.killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        for table in self.history.values():
+            for index in range(4096):
+                table[index] >>= 2  # El historial de búsquedas anteriores pesa menos
+
+        moves = self.order_moves(game, game.generate_legal_moves())
+        if not moves:
+            score = -MATE_SCORE if game.is_in_check(game.current_player) else 0
+            return SearchResult(None, score, 0, 0, 0.0)
+        if len(moves) == 1 and time_manager is not None:
+            # Jugada forzada: no tiene sentido gastar reloj
+            return SearchResult(moves[0], self.evaluate(game), 0, 0, time.perf_counter() - start,
+                                self.predict_reply(game, moves[0]))
+        if self.tablebase is not None:
+            resolved = self._tablebase_root(game, moves)
+            if resolved is not None:
+                return SearchResult(resolved[0], resolved[1], 0, 0, time.perf_counter() - start,
+                                    self.predict_reply(game, resolved[0]))
+        if self.book is not None:
+            book_move = self.book.choose_move(game, self.book_rng)
+            if book_move is not None:
+                return SearchResult(book_move, self.evaluate(game), 0, 0, time.perf_counter() - start)
+
+        best_move, best_score, completed_depth = moves[0], 0, 0
+        stack_size = len(game.undo_stack)
+        for depth in range(start_depth, max_depth + 1):
+            self._root_best = None
+            previous_move = best_move
+            try:
+                best_score, best_move = self._search_root(game, moves, depth)
+                completed_depth = depth
+            except SearchAborted:
+                # Deshacer lo que quedara a medias en el árbol
+                while len(game.undo_stack) > stack_size:
+                    game.unmake_move()
+                # El primer movimiento de la raíz es el mejor de la iteración anterior,
+                # así que lo que haya mejorado ya en esta iteración es fiable
+                if self._root_best is not None:
+                    best_score, best_move = self._root_best
+                break
+
+            self.tt.store(game.zobrist_key, best_move, depth, EXACT, best_score)
+            # La mejor jugada se busca primero en la siguiente iteración
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+            if abs(best_score) >= MATE_BOUND:
+                break
+            self._check_ponder_hit()
+            if self._ponder_hit is None and time_manager is not None and time_manager.should_stop(
+                    time.perf_counter() - self._start, completed_depth > start_depth and best_move != previous_move):
+                break
+
+        return SearchResult(best_move, best_score, completed_depth, self.nodes,
+                            time.perf_counter() - start, self.predict_reply(game, best_move))
+
+    def _start_clock(self, now: float):
+        """Empezar a contar el presupuesto de tiempo (al reflexionar, solo tras acertar)"""
+        self._start = now
+        if self._ponder_hit is not None:
+            self.deadline = None
+        else:
+            self.deadline = now + self._time_limit if self._time_limit else None
+
+    def _check_ponder_hit(self):
+        if self._ponder_hit is not None and self._ponder_hit.is_set():
+            self._ponder_hit = None
+            self._start_clock(time.perf_counter())
+
+    def predict_reply(self, game, move) -> Optional[Move]:
+        """Respuesta esperada del rival a move: la jugada de la tabla en la posición siguiente"""
+        if move is None:
+            return None
+        game.make_move(*move)
+        entry = self.tt.probe(game.zobrist_key)
+        reply = entry[0] if entry else None
+        if reply is not None and reply not in game.generate_legal_moves():
+            reply = None
+        game.unmake_move()
+        return reply
+
+    def _search_root(self, game, moves, depth: int):
+        alpha, beta = -INFINITY, INFINITY
+        best_move = moves[0]
+        for move in moves:
+            game.make_move(*move)
+            score = -self._negamax(game, depth - 1, -beta, -alpha, 1)
+            game.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self._root_best = (score, move)
+        return alpha, best_move
+
+    def _negamax(self, game, depth: int, alpha: int, beta: int, ply: int) -> int:
+        if depth <= 0:
+            return self._quiescence(game, alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+
+        if self.is_repetition(game):
+            return 0
+
+        if self.tablebase is not None and game.piece_count <= 3:
+            result = self.tablebase.probe(game)
+            if result is not None:
+                self.tablebase_hits += 1
+                return tablebase_score(result, ply)
+
+        key = game.zobrist_key
+        entry = self.tt.probe(key)
+        hash_move = None
+        if entry is not None:
+            hash_move, entry_depth, flag, score = entry
+            if entry_depth >= depth:
+                score = score_from_tt(score, ply)
+                if (flag == EXACT or (flag == LOWER_BOUND and score >= beta) or
+                        (flag == UPPER_BOUND and score <= alpha)):
+                    self.tt_hits += 1
+                    return score
+
+        moves = game.generate_legal_moves()
+        if not moves:
+            return -MATE_SCORE + ply if game.is_in_check(game.current_player) else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        squares = game.squares
+        for index, move in enumerate(self.order_moves(game, moves, hash_move, ply)):
+            game.make_move(*move)
+            score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.beta_cutoffs += 1
+                        if index == 0:
+                            self.first_move_cutoffs += 1
+                        if squares[move[2] * 8 + move[3]] is None and move[4] is None:
+                            self._update_quiet_cutoff(game.current_player, move, depth, ply)
+                        break
+
+        if best_score >= beta:
+            flag = LOWER_BOUND
+        elif best_score > original_alpha:
+            flag = EXACT
+        else:
+            flag = UPPER_BOUND
+            best_move = None  # Sin jugada que superara alfa no hay una mejor fiable
+        self.tt.store(key, best_move, depth, flag, score_to_tt(best_score, ply))
+        return best_score
+
+    def _tablebase_root(self, game, moves):
+        """(mejor jugada, puntuación) según las tablas si la raíz está en ellas: la que gana más
+        rápido, o la que más retrasa el mate si se pierde; None si no aplica"""
+        if game.piece_count > 3 or self.tablebase.probe(game) is None:
+            return None
+        best = None
+        for move in moves:
+            game.make_move(*move)
+            result = self.tablebase.probe(game)
+            game.unmake_move()
+            if result is None:
+                return None
+            score = -tablebase_score(result, 1)
+            if best is None or score > best[1]:
+                best = (move, score)
+        return best
+
+    def _quiescence(self, game, alpha: int, beta: int, ply: int) -> int:
+        """Seguir solo capturas y promociones hasta una posición tranquila"""
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+
+        if self.is_repetition(game):
+            return 0
+
+        # En jaque no se puede plantar: hay que buscar todas las evasiones
+        in_check = game.is_in_check(game.current_player)
+        if in_check:
+            best_score = -INFINITY
+        else:
+            best_score = self.evaluate(game)
+            if best_score >= beta:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+
+        moves = game.generate_legal_moves()
+        if in_check:
+            if not moves:
+                return -MATE_SCORE + ply
+        else:
+            squares = game.squares
+            tactical = []
+            for move in moves:
+                from_row, from_col, to_row, to_col, promotion = move
+                piece = squares[from_row * 8 + from_col]
+                victim = squares[to_row * 8 + to_col]
+                if promotion is not None:
+                    if promotion == 'queen':
+                        tactical.append(move)
+                elif victim is not None:
+                    # Las capturas que pierden material según SEE no se exploran
+                    if CODE_VALUES[piece] <= CODE_VALUES[victim] or self.see(game, move) >= 0:
+                        tactical.append(move)
+                elif from_col != to_col and CODE_TYPES[piece] == 'pawn':
+                    tactical.append(move)  # Captura al paso
+            moves = tactical
+
+        for move in self.order_moves(game, moves, None, min(ply, MAX_DEPTH)):
+            game.make_move(*move)
+            score = -self._quiescence(game, -beta, -alpha, ply + 1)
+            game.unmake_move()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def see(self, game, move) -> int:
+        """Intercambio estático: material que gana (en centipeones) la captura y la cadena de
+        recapturas en la casilla de destino, con cada bando capturando con su pieza menos valiosa"""
+        squares = game.squares
+        from_row, from_col, to_row, to_col, promotion = move
+        origin = from_row * 8 + from_col
+        target = to_row * 8 + to_col
+        piece = squares[origin]
+        victim = squares[target]
+
+        gains = [CODE_VALUES[victim] if victim is not None else 1]
+        attacker_value = CODE_VALUES[piece]
+        if promotion is not None:
+            promoted_value = {'queen': 9, 'rook': 5, 'bishop': 3, 'knight': 3}[promotion]
+            gains[0] += promoted_value - 1
+            attacker_value = promoted_value
+        # Las piezas que ya capturaron salen de la ocupación y destapan a las de detrás
+        occupied = game.occupied ^ (1 << origin)
+        color = 'black' if CODE_COLORS[piece] == 'white' else 'white'
+
+        while True:
+            attacker = self._least_valuable_attacker(game, target, color, occupied)
+            if attacker is None:
+                break
+            gains.append(attacker_value - gains[-1])
+            attacker_value = CODE_VALUES[squares[attacker]]
+            occupied ^= 1 << attacker
+            color = 'black' if color == 'white' else 'white'
+
+        # Cada bando puede dejar de recapturar si no le conviene
+        for index in range(len(gains) - 1, 0, -1):
+            gains[index - 1] = -max(-gains[index - 1], gains[index])
+        return gains[0] * 100
+
+    def _least_valuable_attacker(self, game, square: int, color: str, occupied: int) -> Optional[int]:
+        """Casilla de la pieza de menor valor de ``color`` que ataca la casilla con la ocupación
+        dada (sin las piezas ya retiradas), o None"""
+        attackers = game.attackers(square, color, occupied) & occupied
+        if not attackers:
+            return None
+        base = 0 if color == 'white' else len(PIECE_TYPES)
+        # Los tipos van de menor a mayor valor: peón, caballo, alfil, torre, dama, rey
+        for piece_type in range(len(PIECE_TYPES)):
+            pieces = attackers & game.bitboards[base + piece_type]
+            if pieces:
+                return (pieces & -pieces).bit_length() - 1
+        return None
+
+    def order_moves(self, game, moves, hash_move=None, ply: int = 0):
+        """Jugada de la tabla, capturas por MVV-LVA, killers del ply y el resto por historial"""
+        squares = game.squares
+        killers = self.killers[ply]
+        history = self.history[game.current_player]
+
+        def priority(move):
+            if move == hash_move:
+                return HASH_MOVE_PRIORITY
+            from_row, from_col, to_row, to_col, promotion = move
+            victim = squares[to_row * 8 + to_col]
+            piece = squares[from_row * 8 + from_col]
+            if victim is not None or promotion is not None or (from_col != to_col and CODE_TYPES[piece] == 'pawn'):
+                # Víctima más valiosa, atacante menos valioso; al paso la víctima es un peón
+                victim_value = CODE_VALUES[victim] if victim is not None else (0 if promotion else 1)
+                if promotion == 'queen':
+                    victim_value += 9
+                return CAPTURE_PRIORITY + victim_value * 1000 - CODE_VALUES[piece]
+            if move == killers[0]:
+                return KILLER_PRIORITY + 1
+            if move == killers[1]:
+                return KILLER_PRIORITY
+            return history[(from_row * 8 + from_col) * 64 + to_row * 8 + to_col]
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+    def _update_quiet_cutoff(self, color: str, move, depth: int, ply: int):
+        """Una jugada tranquila que produjo un corte pasa a killer y suma historial"""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history[color]
+        index = (move[0] * 8 + move[1]) * 64 + move[2] * 8 + move[3]
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            for square in range(4096):
+                history[square] >>= 1
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Fracción de cortes beta producidos por la primera jugada probada"""
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def is_repetition(self, game) -> bool:
+        """La posición ya se dio desde el último movimiento irreversible (captura o de peón)"""
+        key = game.zobrist_key
+        stack = game.undo_stack
+        for index in range(len(stack) - 1, -1, -1):
+            record = stack[index]
+            if record[4] is not None or record[6] == 'pawn':
+                return False
+            if record[9] == key:
+                return True
+        return False
+
+    def _check_limits(self):
+        self._next_check = self.nodes + CHECK_INTERVAL
+        self._check_ponder_hit()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchAborted()
+
+
+def main():
+    from chess_professional import ChessGame
+    from perft import move_to_uci
+    from tablebase import default_tablebase
+
+    parser = argparse.ArgumentParser(description="Motor de búsqueda alfa-beta")
+    parser.add_argument('--fen', help="Posición en FEN (por defecto la inicial)")
+    parser.add_argument('--time', type=float, help="Tiempo de búsqueda en segundos")
+    parser.add_argument('--nodes', type=int, help="Límite de nodos")
+    parser.add_argument('--depth', type=int, default=MAX_DEPTH, help="Profundidad máxima")
+    parser.add_argument('--clock', type=float, help="Tiempo restante de reloj en segundos (usa el gestor de tiempo)")
+    parser.add_argument('--inc', type=float, default=0, help="Incremento por jugada en segundos")
+    parser.add_argument('--hash', type=float, default=16, help="Tamaño de la tabla de transposición en MB")
+    parser.add_argument('--pawn-hash', type=float, default=1, help="Tamaño de la tabla de peones en MB")
+    parser.add_argument('--book', help="Libro de aperturas Polyglot (.bin)")
+    parser.add_argument('--no-tablebase', action='store_true', help="No usar las tablas de finales")
+    args = parser.parse_args()
+
+    game = ChessGame()
+    if args.fen:
+        game.load_fen(args.fen)
+    time_limit = args.time
+    time_manager = TimeManager(args.clock, args.inc) if args.clock else None
+    if time_limit is None and time_manager is None and args.nodes is None and args.depth == MAX_DEPTH:
+        time_limit = 1.0
+
+    book = None
+    if args.book:
+        from polyglot import OpeningBook
+        book = OpeningBook(args.book)
+    engine = Engine(hash_mb=args.hash, book=book, pawn_hash_mb=args.pawn_hash,
+                    tablebase=None if args.no_tablebase else default_tablebase())
+    result = engine.search(game, time_limit=time_limit, node_limit=args.nodes, max_depth=args.depth,
+                           time_manager=time_manager)
+    if result.move is None:
+        print("Sin movimientos legales")
+        return 1
+    nps = result.nodes / result.elapsed if result.elapsed > 0 else 0
+    print(f"Mejor jugada: {move_to_uci(result.move)}  Puntuación: {result.score}  "
+          f"Profundidad: {result.depth}  Nodos: {result.nodes}  "
+          f"Tiempo: {result.elapsed:.2f}s  ({nps:,.0f} nodos/s)  "
+          f"Tabla: {engine.tt.size_mb:g} MB, {engine.tt.hashfull() / 10:.1f}% usada  "
+          f"Cortes con la primera jugada: {engine.first_move_cutoff_rate:.0%}  "
+          f"Peones: {engine.pawn_table.hit_rate:.0%} aciertos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Motor en segundo plano para la interfaz gráfica.
+
+La búsqueda corre en un proceso aparte (un hilo competiría por el GIL con
+el bucle de dibujo) que conserva su motor y su tabla de transposición entre
+jugadas. Un hilo de escucha recoge los resultados y los publica como eventos
+``ENGINE_MOVE_EVENT`` de pygame, así que ``ChessGUI.run`` nunca se bloquea.
+
+Cada petición lleva un número; cancelar marca como canceladas todas las
+peticiones hasta la última, y el motor lo comprueba cada pocos nodos, de
+modo que una búsqueda se detiene al instante.
+
+Para reflexionar en el tiempo del rival el motor busca, sin límite, la
+posición tras la respuesta que predijo su última búsqueda (``SearchResult.ponder``).
+Si el humano juega esa respuesta, ``ponder_hit`` convierte la reflexión en
+la búsqueda de la jugada: el reloj empieza a contar en ese momento y lo ya
+buscado se aprovecha entero. Si juega otra cosa, la reflexión se cancela y
+se busca la posición real.
+
+Con un libro de aperturas el proceso lo abre una vez y las jugadas de libro
+se devuelven sin buscar; lo mismo con las tablas de finales generadas.
+"""
+
+import multiprocessing
+import threading
+import time
+from typing import Optional
+
+import pygame
+
+from engine import Engine, root_position
+
+ENGINE_MOVE_EVENT = pygame.USEREVENT + 1
+
+SEARCH = 'search'
+PONDER = 'ponder'
+HINT = 'hint'
+
+
+class _PonderHitFlag:
+    """Señal para Engine: el humano jugó la respuesta prevista de esta reflexión"""
+
+    def __init__(self, hit, request_id: int):
+        self.hit = hit
+        self.request_id = request_id
+
+    def is_set(self) -> bool:
+        return self.hit.value == self.request_id
+
+
+class _CancelFlag:
+    """Señal de parada para Engine: la petición en curso ya fue cancelada"""
+
+    def __init__(self, cancelled, request_id: int):
+        self.cancelled = cancelled
+        self.request_id = request_id
+
+    def is_set(self) -> bool:
+        return self.cancelled.value >= self.request_id
+
+
+def _engine_process(requests, results, cancelled, hit, hash_mb: float, book_path: Optional[str]):
+    from chess_professional import ChessGame
+    from polyglot import OpeningBook
+    from tablebase import default_tablebase
+
+    engine = Engine(hash_mb, book=OpeningBook(book_path) if book_path else None,
+                    tablebase=default_tablebase())
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, kind, fen, moves, time_limit, time_manager = request
+        if cancelled.value >= request_id:
+            continue
+
+        game = ChessGame()
+        game.load_fen(fen)
+        for move in moves:
+            game.make_move(*move)
+        engine.stop_event = _CancelFlag(cancelled, request_id)
+        if kind != PONDER:
+            results.put((request_id, kind, engine.search(game, time_limit=time_limit, time_manager=time_manager)))
+            continue
+
+        ponder_hit = _PonderHitFlag(hit, request_id)
+        result = engine.search(game, time_limit=time_limit, time_manager=time_manager, ponder_hit=ponder_hit)
+        # Una reflexión que acaba antes (mate, libro, tablas) no responde hasta que se
+        # sepa si el humano jugó la respuesta prevista
+        while not ponder_hit.is_set() and not engine.stop_event.is_set():
+            time.sleep(0.005)
+        results.put((request_id, SEARCH if ponder_hit.is_set() else PONDER, result))
+    results.put(None)
+
+
+class EngineWorker:
+    def __init__(self, hash_mb: float = 64, book_path: Optional[str] = None):
+        context = multiprocessing.get_context('spawn')
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.cancelled = context.Value('q', 0)
+        self.hit = context.Value('q', 0)  # Número de la reflexión acertada
+        self.request_id = 0
+        self.process = context.Process(target=_engine_process, daemon=True,
+                                       args=(self.requests, self.results, self.cancelled, self.hit,
+                                             hash_mb, book_path))
+        self.process.start()
+        self.listener = threading.Thread(target=self._listen, daemon=True)
+        self.listener.start()
+
+    def _listen(self):
+        """Publicar cada resultado como evento de pygame (seguro desde otro hilo)"""
+        while True:
+            item = self.results.get()
+            if item is None:
+                break
+            request_id, kind, result = item
+            if pygame.display.get_init():
+                pygame.event.post(pygame.event.Event(ENGINE_MOVE_EVENT, request_id=request_id,
+                                                     kind=kind, result=result))
+
+    def _send(self, kind: str, game, time_limit: Optional[float], time_manager=None, extra_moves=()) -> int:
+        self.cancel()
+        self.request_id += 1
+        fen, moves = root_position(game)
+        moves = moves + list(extra_moves)
+        self.requests.put((self.request_id, kind, fen, moves, time_limit, time_manager))
+        return self.request_id
+
+    def think(self, game, time_limit: Optional[float] = None, time_manager=None) -> int:
+        """Pedir la jugada del jugador al que le toca, con tiempo fijo o repartiendo el reloj
+        con un TimeManager; devuelve el número de la petición"""
+        return self._send(SEARCH, game, time_limit, time_manager)
+
+    def ponder(self, game, reply, time_limit: Optional[float] = None, time_manager=None) -> int:
+        """Reflexionar, mientras el rival decide, sobre la posición tras su respuesta prevista
+        ``reply``; el presupuesto es el de la jugada siguiente y solo empieza a contar con
+        ponder_hit. Devuelve el número de la petición"""
+        return self._send(PONDER, game, time_limit, time_manager, extra_moves=(reply,))
+
+    def ponder_hit(self, request_id: int) -> int:
+        """El rival jugó la respuesta prevista: la reflexión ``request_id`` pasa a ser la
+        búsqueda de la jugada y su resultado llegará como SEARCH con ese número"""
+        self.hit.value = request_id
+        return request_id
+
+    def hint(self, game, time_limit: float) -> int:
+        """Pedir una jugada sugerida para el jugador humano; devuelve el número de la petición"""
+        return self._send(HINT, game, time_limit)
+
+    def cancel(self):
+        """Detener la búsqueda en curso y descartar las peticiones pendientes"""
+        self.cancelled.value = self.request_id
+
+    def close(self):
+        self.cancel()
+        self.requests.put(None)
+        self.process.join(timeout=1)
@@ -0,0 +1,203 @@
+"""
+Evaluación por material y tablas de casillas (piece-square tables).
+
+Cada combinación (color, pieza, casilla) tiene una puntuación fija en
+centipeones que suma el valor de la pieza y la bonificación de la casilla,
+con signo positivo para las blancas y negativo para las negras. La
+evaluación de una posición es la suma de las de sus piezas, así que
+``make_move`` la actualiza restando y sumando unas pocas entradas y leerla
+no cuesta nada.
+
+Las tablas están escritas desde el lado de las blancas con la fila 0 en la
+octava fila, igual que ``board[row][col]``; las de las negras son su reflejo.
+
+La estructura de peones (doblados, aislados y pasados) se evalúa aparte con
+``pawn_structure`` y, como cambia poco, el motor la guarda en una
+``PawnHashTable`` indexada por la clave Zobrist de los peones.
+"""
+
+from array import array
+
+MATERIAL = {'pawn': 100, 'knight': 320, 'bishop': 330, 'rook': 500, 'queen': 900, 'king': 0}
+
+_PAWN = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+
+_ROOK = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+
+_QUEEN = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+
+# Rey a cubierto tras el enroque; no hay tabla de final para no tener que seguir la fase
+_KING = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+
+_TABLES = {'pawn': _PAWN, 'knight': _KNIGHT, 'bishop': _BISHOP,
+           'rook': _ROOK, 'queen': _QUEEN, 'king': _KING}
+
+# SQUARE_SCORES[color][tipo][row * 8 + col]: material + casilla, positivo para las blancas
+SQUARE_SCORES = {
+    'white': {piece_type: [MATERIAL[piece_type] + table[index] for index in range(64)]
+              for piece_type, table in _TABLES.items()},
+    'black': {piece_type: [-MATERIAL[piece_type] - table[(7 - index // 8) * 8 + index % 8]
+                           for index in range(64)]
+              for piece_type, table in _TABLES.items()},
+}
+
+
+def compute_score(game) -> int:
+    """Calcular desde cero la evaluación (centipeones, positiva si van mejor las blancas)"""
+    score = 0
+    for color, pieces in game.pieces.items():
+        scores = SQUARE_SCORES[color]
+        for piece in pieces:
+            score += scores[piece.piece_type][piece.row * 8 + piece.col]
+    return score
+
+
+def compute_material(game) -> dict:
+    """Material de cada bando en peones (Piece.value), sin contar los reyes"""
+    material = {'white': 0, 'black': 0}
+    for color, pieces in game.pieces.items():
+        for piece in pieces:
+            if piece.piece_type != 'king':
+                material[color] += piece.value
+    return material
+
+
+DOUBLED_PAWN = -12  # Por cada peón de más en una columna
+ISOLATED_PAWN = -15  # Sin peones propios en las columnas vecinas
+# Peón pasado según las filas que ha avanzado desde su fila inicial
+PASSED_PAWN = (0, 5, 10, 20, 35, 60, 100, 0)
+
+
+def pawn_structure(game) -> int:
+    """Peones doblados, aislados y pasados en centipeones, positivo si van mejor las blancas"""
+    # Filas de los peones de cada color por columna
+    rows = {'white': [[] for _ in range(8)], 'black': [[] for _ in range(8)]}
+    for color, pieces in game.pieces.items():
+        for piece in pieces:
+            if piece.piece_type == 'pawn':
+                rows[color][piece.col].append(piece.row)
+
+    score = 0
+    for color, sign in (('white', 1), ('black', -1)):
+        own = rows[color]
+        enemy = rows['black' if color == 'white' else 'white']
+        for col in range(8):
+            pawns = own[col]
+            if not pawns:
+                continue
+            score += sign * DOUBLED_PAWN * (len(pawns) - 1)
+            neighbours = range(max(col - 1, 0), min(col + 2, 8))
+            if not any(own[other] for other in neighbours if other != col):
+                score += sign * ISOLATED_PAWN * len(pawns)
+            for row in pawns:
+                # Pasado: ningún peón rival delante en su columna ni en las vecinas
+                if color == 'white':
+                    blocked = any(enemy_row < row for other in neighbours for enemy_row in enemy[other])
+                    advance = 6 - row
+                else:
+                    blocked = any(enemy_row > row for other in neighbours for enemy_row in enemy[other])
+                    advance = row - 1
+                if not blocked:
+                    score += sign * PASSED_PAWN[advance]
+    return score
+
+
+class PawnHashTable:
+    """Caché de tamaño fijo de pawn_structure por clave de peones; cada clave nueva
+    reemplaza a la que ocupara su casilla"""
+
+    BYTES_PER_ENTRY = 12  # Clave de 64 bits y puntuación de 32
+
+    def __init__(self, size_mb: float = 1):
+        entries = max(1, int(size_mb * 1024 * 1024) // self.BYTES_PER_ENTRY)
+        entries = 1 << (entries.bit_length() - 1)
+        self.keys = array('Q', bytes(8 * entries))
+        self.scores = array('i', bytes(4 * entries))
+        self.mask = entries - 1
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        self.keys = array('Q', bytes(8 * len(self.keys)))
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def score(self, game) -> int:
+        """pawn_structure de la partida, calculada solo si la clave de peones no está guardada"""
+        key = game.pawn_key
+        index = key & self.mask
+        self.probes += 1
+        # La clave 0 (sin peones) se guarda como 1 para no confundirla con una casilla vacía
+        stored = key or 1
+        if self.keys[index] == stored:
+            self.hits += 1
+            return self.scores[index]
+        score = pawn_structure(game)
+        self.keys[index] = stored
+        self.scores[index] = score
+        return score
@@ -0,0 +1,58 @@
+"""
+Caché de superficies para las piezas dibujadas con símbolos Unicode.
+
+Rasterizar un glyph TrueType con ``Font.render`` es caro y la imagen de cada
+pieza nunca cambia, así que cada combinación (símbolo, color, tamaño) se
+renderiza una sola vez y los fotogramas siguientes solo copian la superficie
+guardada con ``blit``.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, ...]
+
+
+class GlyphCache:
+    def __init__(self, font_name: Optional[str] = None, antialias: bool = True):
+        self.font_name = font_name  # None = fuente por defecto de pygame
+        self.antialias = antialias
+        self.fonts: Dict[int, pygame.font.Font] = {}
+        self.glyphs: Dict[Tuple[str, Color, int], pygame.Surface] = {}
+
+    def font(self, size: int) -> pygame.font.Font:
+        """Fuente del tamaño indicado, creada la primera vez que se pide"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(self.font_name, size)
+        return font
+
+    def get(self, symbol: str, color: Color, size: int) -> pygame.Surface:
+        """Superficie del símbolo; solo se rasteriza si no estaba en la caché"""
+        key = (symbol, tuple(color), size)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.font(size).render(symbol, self.antialias, color)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()  # Mismo formato que la pantalla: blit más rápido
+            self.glyphs[key] = surface
+        return surface
+
+    def preload(self, symbols, colors, size: int):
+        """Renderizar de antemano todas las combinaciones de símbolos y colores"""
+        for symbol in symbols:
+            for color in colors:
+                self.get(symbol, color, size)
+
+    def blit_centered(self, target: pygame.Surface, symbol: str, color: Color, size: int,
+                      center: Tuple[int, int]) -> pygame.Rect:
+        """Copiar el símbolo centrado en ``center``"""
+        surface = self.get(symbol, color, size)
+        return target.blit(surface, surface.get_rect(center=center))
+
+    def clear(self):
+        self.glyphs.clear()
+
+    def __len__(self) -> int:
+        return len(self.glyphs)
@@ -0,0 +1,63 @@
+"""
+Fondos con degradado vertical generados una sola vez.
+
+Dibujar el degradado con una línea por fila de píxeles en cada fotograma
+cuesta cientos de llamadas a ``pygame.draw.line`` (y a ``math.sin``) 60
+veces por segundo. ``GradientBackground`` calcula el color de cada fila una
+vez, rellena una superficie del tamaño de la ventana y cada fotograma solo
+la copia; se regenera únicamente si cambia el tamaño de la ventana.
+
+Con NumPy el relleno se hace de una vez con ``pygame.surfarray``; sin él se
+rellena fila a fila, lo que solo ocurre al generar la superficie.
+"""
+
+from typing import Callable, Optional, Tuple
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Color = Tuple[int, int, int]
+
+
+def clamp(color) -> Color:
+    """Color válido para pygame: canales enteros entre 0 y 255"""
+    return tuple(min(255, max(0, int(channel))) for channel in color[:3])
+
+
+def vertical_gradient(size: Tuple[int, int], color_at: Callable[[int, int], Color]) -> pygame.Surface:
+    """Superficie de tamaño ``size`` cuya fila y tiene el color ``color_at(y, alto)``; los
+    canales fuera de 0..255 se recortan aquí, así que color_at puede devolverlos sin ajustar"""
+    width, height = size
+    colors = [clamp(color_at(y, height)) for y in range(height)]
+    surface = pygame.Surface(size)
+    if np is not None:
+        # surfarray indexa (x, y): la columna de colores se repite en todo el ancho
+        rows = np.array(colors, dtype=np.uint8).reshape(1, height, 3)
+        pygame.surfarray.blit_array(surface, np.broadcast_to(rows, (width, height, 3)))
+    else:
+        for y, color in enumerate(colors):
+            surface.fill(color, (0, y, width, 1))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+class GradientBackground:
+    def __init__(self, color_at: Callable[[int, int], Color]):
+        self.color_at = color_at
+        self.size: Optional[Tuple[int, int]] = None
+        self.surface: Optional[pygame.Surface] = None
+        self.builds = 0
+
+    def draw(self, target: pygame.Surface):
+        """Copiar el fondo a ``target``, regenerándolo si su tamaño cambió"""
+        size = target.get_size()
+        if size != self.size:
+            self.surface = vertical_gradient(size, self.color_at)
+            self.size = size
+            self.builds += 1
+        target.blit(self.surface, (0, 0))
@@ -0,0 +1,622 @@
+"""
+Backend de posición sobre una lista de listas ``board[row][col]`` con objetos pieza.
+
+Es el núcleo de reglas que usaban los ``ChessGame`` antes de pasar a
+``bitboard.BitboardPosition``: cada pieza genera sus destinos recorriendo las
+tablas de ``attack_tables`` casilla por casilla y ``make_move`` mueve los
+objetos dentro de la lista. Se conserva como implementación de referencia con
+la misma interfaz, para comparar con ella los movimientos legales y el
+rendimiento del backend de bitboards (``perft.py --core list``).
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from attack_tables import (
+    KNIGHT_TARGETS, KING_TARGETS, PAWN_CAPTURE_TARGETS,
+    ROOK_RAYS, BISHOP_RAYS, QUEEN_RAYS
+)
+from bitboard import PROMOTION_TYPES, FEN_PIECE_TYPES, FEN_PIECE_LETTERS
+import zobrist
+import evaluation
+
+
+class ListPiece:
+    def __init__(self, color: str, piece_type: str, row: int, col: int):
+        self.color = color
+        self.piece_type = piece_type
+        self.row = row
+        self.col = col
+        self.has_moved = False
+
+    def __str__(self):
+        return f"{self.color} {self.piece_type} at ({self.row}, {self.col})"
+
+    def get_possible_moves(self, board, en_passant: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        moves = []
+
+        if self.piece_type == 'pawn':
+            moves = self._get_pawn_moves(board, en_passant)
+        elif self.piece_type == 'rook':
+            moves = self._get_rook_moves(board)
+        elif self.piece_type == 'knight':
+            moves = self._get_knight_moves(board)
+        elif self.piece_type == 'bishop':
+            moves = self._get_bishop_moves(board)
+        elif self.piece_type == 'queen':
+            moves = self._get_queen_moves(board)
+        elif self.piece_type == 'king':
+            moves = self._get_king_moves(board)
+
+        return moves
+
+    def _get_pawn_moves(self, board, en_passant: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+        moves = []
+        direction = -1 if self.color == 'white' else 1
+        start_row = 6 if self.color == 'white' else 1
+
+        # Movimiento hacia adelante
+        new_row = self.row + direction
+        if 0 <= new_row < 8 and board[new_row][self.col] is None:
+            moves.append((new_row, self.col))
+
+            # Doble movimiento desde posición inicial
+            if self.row == start_row and board[new_row + direction][self.col] is None:
+                moves.append((new_row + direction, self.col))
+
+        # Capturas diagonales
+        for new_row, new_col in PAWN_CAPTURE_TARGETS[self.color][self.row * 8 + self.col]:
+            target = board[new_row][new_col]
+            if target and target.color != self.color:
+                moves.append((new_row, new_col))
+
+        # Captura al paso sobre la casilla que saltó un peón rival
+        if en_passant and en_passant[0] == self.row + direction and abs(en_passant[1] - self.col) == 1:
+            moves.append(en_passant)
+
+        return moves
+
+    def _get_slider_moves(self, board, rays) -> List[Tuple[int, int]]:
+        """Recorrer rayos precalculados hasta el primer bloqueo"""
+        moves = []
+
+        for ray in rays:
+            for new_row, new_col in ray:
+                target = board[new_row][new_col]
+                if target is None:
+                    moves.append((new_row, new_col))
+                else:
+                    if target.color != self.color:
+                        moves.append((new_row, new_col))
+                    break
+
+        return moves
+
+    def _get_step_moves(self, board, targets) -> List[Tuple[int, int]]:
+        """Filtrar destinos precalculados ocupados por piezas propias"""
+        moves = []
+
+        for new_row, new_col in targets:
+            target = board[new_row][new_col]
+            if target is None or target.color != self.color:
+                moves.append((new_row, new_col))
+
+        return moves
+
+    def _get_rook_moves(self, board) -> List[Tuple[int, int]]:
+        return self._get_slider_moves(board, ROOK_RAYS[self.row * 8 + self.col])
+
+    def _get_knight_moves(self, board) -> List[Tuple[int, int]]:
+        return self._get_step_moves(board, KNIGHT_TARGETS[self.row * 8 + self.col])
+
+    def _get_bishop_moves(self, board) -> List[Tuple[int, int]]:
+        return self._get_slider_moves(board, BISHOP_RAYS[self.row * 8 + self.col])
+
+    def _get_queen_moves(self, board) -> List[Tuple[int, int]]:
+        return self._get_slider_moves(board, QUEEN_RAYS[self.row * 8 + self.col])
+
+    def _get_king_moves(self, board) -> List[Tuple[int, int]]:
+        return self._get_step_moves(board, KING_TARGETS[self.row * 8 + self.col])
+
+class ListPosition:
+    """Reglas del ajedrez sobre ``board[row][col]``: la misma interfaz que BitboardPosition"""
+
+    def __init__(self):
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        self.current_player = 'white'
+        self.undo_stack = []
+        # Piezas vivas por color y casilla de cada rey, actualizadas en make/unmake
+        self.pieces = {'white': [], 'black': []}
+        self.king_positions = {}
+        # Casilla de captura al paso disponible para el jugador al que le toca
+        self.en_passant = None
+        self.fullmove_number = 1
+        # (clave Zobrist, {casilla: destinos legales}) de la última posición consultada
+        self.legal_moves_cache = None
+        self._setup_board()
+
+    def _setup_board(self):
+        # Peones
+        for col in range(8):
+            self.board[1][col] = ListPiece('black', 'pawn', 1, col)
+            self.board[6][col] = ListPiece('white', 'pawn', 6, col)
+
+        # Piezas especiales
+        piece_order = ['rook', 'knight', 'bishop', 'queen', 'king', 'bishop', 'knight', 'rook']
+
+        for col, piece_type in enumerate(piece_order):
+            self.board[0][col] = ListPiece('black', piece_type, 0, col)
+            self.board[7][col] = ListPiece('white', piece_type, 7, col)
+
+        self._index_pieces()
+
+    def _index_pieces(self):
+        """Reconstruir las listas de piezas, la posición de los reyes, la clave Zobrist y la evaluación"""
+        self.pieces = {'white': [], 'black': []}
+        self.king_positions = {}
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece:
+                    self.pieces[piece.color].append(piece)
+                    if piece.piece_type == 'king':
+                        self.king_positions[piece.color] = (row, col)
+        # La clave Zobrist se calcula entera aquí y después se actualiza en make_move
+        self.zobrist_key = zobrist.compute_key(self)
+        self.pawn_key = zobrist.compute_pawn_key(self)
+        # Igual que la clave: la evaluación se calcula aquí y make_move la actualiza
+        self.evaluation = evaluation.compute_score(self)
+
+    def get_piece_at(self, row: int, col: int) -> Optional[ListPiece]:
+        if 0 <= row < 8 and 0 <= col < 8:
+            return self.board[row][col]
+        return None
+
+    def find_king(self, color: str) -> Optional[Tuple[int, int]]:
+        return self.king_positions.get(color)
+
+    def is_square_attacked(self, square: Tuple[int, int], by_color: str) -> bool:
+        """Verificar si una casilla está atacada, mirando hacia fuera desde ella"""
+        board = self.board
+        index = square[0] * 8 + square[1]
+
+        for row, col in KNIGHT_TARGETS[index]:
+            piece = board[row][col]
+            if piece and piece.color == by_color and piece.piece_type == 'knight':
+                return True
+
+        # Un peón atacante está donde capturaría un peón del color defensor
+        defender = 'black' if by_color == 'white' else 'white'
+        for row, col in PAWN_CAPTURE_TARGETS[defender][index]:
+            piece = board[row][col]
+            if piece and piece.color == by_color and piece.piece_type == 'pawn':
+                return True
+
+        for row, col in KING_TARGETS[index]:
+            piece = board[row][col]
+            if piece and piece.color == by_color and piece.piece_type == 'king':
+                return True
+
+        # Piezas deslizantes: solo cuenta la primera pieza de cada rayo
+        for ray in ROOK_RAYS[index]:
+            for row, col in ray:
+                piece = board[row][col]
+                if piece:
+                    if piece.color == by_color and piece.piece_type in ('rook', 'queen'):
+                        return True
+                    break
+
+        for ray in BISHOP_RAYS[index]:
+            for row, col in ray:
+                piece = board[row][col]
+                if piece:
+                    if piece.color == by_color and piece.piece_type in ('bishop', 'queen'):
+                        return True
+                    break
+
+        return False
+
+    def is_in_check(self, color: str) -> bool:
+        king_pos = self.find_king(color)
+        if not king_pos:
+            return False
+
+        opponent_color = 'black' if color == 'white' else 'white'
+        return self.is_square_attacked(king_pos, opponent_color)
+
+    def would_be_in_check(self, from_row: int, from_col: int, to_row: int, to_col: int, color: str) -> bool:
+        """Verificar si un movimiento dejaría al rey en jaque"""
+        self.make_move(from_row, from_col, to_row, to_col)
+        in_check = self.is_in_check(color)
+        self.unmake_move()
+        return in_check
+
+    def make_move(self, from_row: int, from_col: int, to_row: int, to_col: int, promotion: Optional[str] = None):
+        """Realizar un movimiento sin validarlo y apilar lo necesario para deshacerlo"""
+        board = self.board
+        piece = board[from_row][from_col]
+        captured_piece = board[to_row][to_col]
+
+        # Captura al paso: el peón capturado está junto al origen, no en el destino
+        if piece.piece_type == 'pawn' and captured_piece is None and from_col != to_col:
+            captured_piece = board[from_row][to_col]
+            board[from_row][to_col] = None
+
+        # Registro de deshacer: casillas, pieza capturada (su casilla queda en row/col),
+        # has_moved, tipo original, turno, casilla de captura al paso, claves Zobrist y evaluación previas
+        self.undo_stack.append((from_row, from_col, to_row, to_col, captured_piece,
+                                piece.has_moved, piece.piece_type, self.current_player,
+                                self.en_passant, self.zobrist_key, self.evaluation, self.pawn_key))
+        pawn_key = self.pawn_key
+
+        # Clave Zobrist: quitar la pieza del origen, la capturada, el turno y la captura al paso
+        piece_keys = zobrist.PIECE_KEYS[piece.color]
+        key = self.zobrist_key ^ zobrist.SIDE_KEY ^ piece_keys[piece.piece_type][from_row * 8 + from_col]
+        square_scores = evaluation.SQUARE_SCORES[piece.color]
+        score = self.evaluation - square_scores[piece.piece_type][from_row * 8 + from_col]
+        if self.en_passant:
+            key ^= zobrist.EN_PASSANT_KEYS[self.en_passant[1]]
+        # Los derechos de enroque solo cambian si se mueve un rey o torre sin mover o se captura una torre sin mover
+        castling_before = None
+        if ((not piece.has_moved and piece.piece_type in ('king', 'rook')) or
+                (captured_piece and not captured_piece.has_moved and captured_piece.piece_type == 'rook')):
+            castling_before = self.get_castling_rights()
+
+        if captured_piece:
+            self.pieces[captured_piece.color].remove(captured_piece)
+            key ^= zobrist.PIECE_KEYS[captured_piece.color][captured_piece.piece_type][
+                captured_piece.row * 8 + captured_piece.col]
+            score -= evaluation.SQUARE_SCORES[captured_piece.color][captured_piece.piece_type][
+                captured_piece.row * 8 + captured_piece.col]
+            if captured_piece.piece_type == 'pawn':
+                pawn_key ^= zobrist.PIECE_KEYS[captured_piece.color]['pawn'][captured_piece.row * 8 + captured_piece.col]
+        if piece.piece_type == 'king':
+            self.king_positions[piece.color] = (to_row, to_col)
+            # Enroque: la torre salta al otro lado del rey
+            if to_col - from_col == 2:
+                self._move_rook(from_row, 7, 5, True)
+                key ^= piece_keys['rook'][from_row * 8 + 7] ^ piece_keys['rook'][from_row * 8 + 5]
+                score += square_scores['rook'][from_row * 8 + 5] - square_scores['rook'][from_row * 8 + 7]
+            elif from_col - to_col == 2:
+                self._move_rook(from_row, 0, 3, True)
+                key ^= piece_keys['rook'][from_row * 8] ^ piece_keys['rook'][from_row * 8 + 3]
+                score += square_scores['rook'][from_row * 8 + 3] - square_scores['rook'][from_row * 8]
+
+        board[to_row][to_col] = piece
+        board[from_row][from_col] = None
+        piece.row = to_row
+        piece.col = to_col
+        piece.has_moved = True
+
+        self.en_passant = None
+        if piece.piece_type == 'pawn':
+            pawn_key ^= piece_keys['pawn'][from_row * 8 + from_col]
+            if abs(to_row - from_row) == 2:
+                self.en_passant = ((from_row + to_row) // 2, from_col)
+            elif to_row in (0, 7):
+                # Promoción de peón (a reina salvo que se indique otra pieza)
+                piece.piece_type = promotion or 'queen'
+
+        key ^= piece_keys[piece.piece_type][to_row * 8 + to_col]
+        if piece.piece_type == 'pawn':
+            pawn_key ^= piece_keys['pawn'][to_row * 8 + to_col]
+        self.evaluation = score + square_scores[piece.piece_type][to_row * 8 + to_col]
+        if self.en_passant:
+            key ^= zobrist.EN_PASSANT_KEYS[from_col]
+        if castling_before is not None:
+            key ^= zobrist.CASTLING_KEYS[castling_before] ^ zobrist.CASTLING_KEYS[self.get_castling_rights()]
+        self.zobrist_key = key
+        self.pawn_key = pawn_key
+
+        if self.current_player == 'black':
+            self.fullmove_number += 1
+        self.current_player = 'black' if self.current_player == 'white' else 'white'
+
+    def unmake_move(self):
+        """Deshacer el último movimiento hecho con make_move"""
+        (from_row, from_col, to_row, to_col, captured_piece,
+         had_moved, piece_type, player, en_passant, zobrist_key, score, pawn_key) = self.undo_stack.pop()
+        board = self.board
+        piece = board[to_row][to_col]
+
+        board[from_row][from_col] = piece
+        board[to_row][to_col] = None
+        piece.row = from_row
+        piece.col = from_col
+        if captured_piece:
+            board[captured_piece.row][captured_piece.col] = captured_piece
+            self.pieces[captured_piece.color].append(captured_piece)
+        if piece_type == 'king':
+            self.king_positions[piece.color] = (from_row, from_col)
+            if to_col - from_col == 2:
+                self._move_rook(from_row, 5, 7, False)
+            elif from_col - to_col == 2:
+                self._move_rook(from_row, 3, 0, False)
+        piece.has_moved = had_moved
+        piece.piece_type = piece_type
+
+        if player == 'black':
+            self.fullmove_number -= 1
+        self.current_player = player
+        self.en_passant = en_passant
+        self.zobrist_key = zobrist_key
+        self.evaluation = score
+        self.pawn_key = pawn_key
+
+    def _move_rook(self, row: int, from_col: int, to_col: int, has_moved: bool):
+        """Mover la torre del enroque (o devolverla a su casilla)"""
+        rook = self.board[row][from_col]
+        self.board[row][to_col] = rook
+        self.board[row][from_col] = None
+        rook.col = to_col
+        rook.has_moved = has_moved
+
+    def get_castling_rights(self) -> str:
+        """Derechos de enroque en formato FEN, deducidos de has_moved del rey y las torres"""
+        rights = ''
+        for color, row in (('white', 7), ('black', 0)):
+            king = self.board[row][4]
+            if not king or king.piece_type != 'king' or king.color != color or king.has_moved:
+                continue
+            for rook_col, letter in ((7, 'k'), (0, 'q')):
+                rook = self.board[row][rook_col]
+                if rook and rook.piece_type == 'rook' and rook.color == color and not rook.has_moved:
+                    rights += letter.upper() if color == 'white' else letter
+        return rights or '-'
+
+    def _get_castling_moves(self, king: ListPiece) -> List[Tuple[int, int]]:
+        """Destinos de enroque de un rey que no está en jaque"""
+        moves = []
+        row = 7 if king.color == 'white' else 0
+        if king.has_moved or king.row != row or king.col != 4:
+            return moves
+
+        opponent_color = 'black' if king.color == 'white' else 'white'
+        # (columna de la torre, casillas que deben estar vacías, casillas que recorre el rey)
+        for rook_col, empty_cols, king_cols in ((7, (5, 6), (5, 6)), (0, (1, 2, 3), (3, 2))):
+            rook = self.board[row][rook_col]
+            if not rook or rook.piece_type != 'rook' or rook.color != king.color or rook.has_moved:
+                continue
+            if any(self.board[row][col] for col in empty_cols):
+                continue
+            if any(self.is_square_attacked((row, col), opponent_color) for col in king_cols):
+                continue
+            moves.append((row, king_cols[-1]))
+
+        return moves
+
+    def get_pins_and_checks(self, color: str):
+        """Calcular las piezas clavadas y los jaques sobre el rey de un color
+
+        Devuelve (pins, checkers, evasion_squares): pins asocia cada casilla de una
+        pieza clavada con las casillas de su línea de clavada (incluido el atacante),
+        checkers son las casillas de las piezas que dan jaque y evasion_squares las
+        casillas donde otra pieza puede capturar o interponerse ante un jaque simple.
+        """
+        pins = {}
+        checkers = []
+        evasion_squares = set()
+        king_pos = self.find_king(color)
+        if not king_pos:
+            return pins, checkers, evasion_squares
+
+        board = self.board
+        index = king_pos[0] * 8 + king_pos[1]
+
+        for row, col in KNIGHT_TARGETS[index]:
+            piece = board[row][col]
+            if piece and piece.color != color and piece.piece_type == 'knight':
+                checkers.append((row, col))
+                evasion_squares.add((row, col))
+
+        for row, col in PAWN_CAPTURE_TARGETS[color][index]:
+            piece = board[row][col]
+            if piece and piece.color != color and piece.piece_type == 'pawn':
+                checkers.append((row, col))
+                evasion_squares.add((row, col))
+
+        for rays, slider_types in ((ROOK_RAYS[index], ('rook', 'queen')),
+                                   (BISHOP_RAYS[index], ('bishop', 'queen'))):
+            for ray in rays:
+                blocker = None
+                for distance, (row, col) in enumerate(ray):
+                    piece = board[row][col]
+                    if piece is None:
+                        continue
+                    if piece.color == color:
+                        # Segunda pieza propia en el rayo: no hay clavada posible
+                        if blocker:
+                            break
+                        blocker = piece
+                        continue
+                    if piece.piece_type in slider_types:
+                        line = ray[:distance + 1]
+                        if blocker:
+                            pins[(blocker.row, blocker.col)] = set(line)
+                        else:
+                            checkers.append((row, col))
+                            evasion_squares.update(line)
+                    break
+
+        return pins, checkers, evasion_squares
+
+    def get_valid_moves(self, piece: ListPiece, pins_and_checks=None) -> List[Tuple[int, int]]:
+        if pins_and_checks is None:
+            pins_and_checks = self.get_pins_and_checks(piece.color)
+        pins, checkers, evasion_squares = pins_and_checks
+        possible_moves = piece.get_possible_moves(self.board, self.en_passant)
+
+        if piece.piece_type == 'king':
+            # El rey no puede pisar casillas atacadas; se quita del tablero para
+            # que los rayos que lo atraviesan sigan contando
+            opponent_color = 'black' if piece.color == 'white' else 'white'
+            self.board[piece.row][piece.col] = None
+            valid_moves = [move for move in possible_moves
+                           if not self.is_square_attacked(move, opponent_color)]
+            self.board[piece.row][piece.col] = piece
+            if not checkers:
+                valid_moves.extend(self._get_castling_moves(piece))
+            return valid_moves
+
+        # Con jaque doble solo puede moverse el rey
+        if len(checkers) > 1:
+            return []
+
+        # La captura al paso retira un peón que no está en el destino, así que
+        # puede descubrir jaques que las clavadas no ven: se comprueba aparte
+        en_passant_move = None
+        if piece.piece_type == 'pawn' and self.en_passant in possible_moves:
+            possible_moves = [move for move in possible_moves if move != self.en_passant]
+            en_passant_move = self.en_passant
+
+        valid_moves = possible_moves
+        if checkers:
+            valid_moves = [move for move in valid_moves if move in evasion_squares]
+        pin_line = pins.get((piece.row, piece.col))
+        if pin_line is not None:
+            valid_moves = [move for move in valid_moves if move in pin_line]
+
+        if en_passant_move and not self.would_be_in_check(piece.row, piece.col, en_passant_move[0],
+                                                          en_passant_move[1], piece.color):
+            valid_moves.append(en_passant_move)
+
+        return valid_moves
+
+    def generate_legal_moves(self, color: Optional[str] = None) -> List[Tuple[int, int, int, int, Optional[str]]]:
+        """Todos los movimientos legales como (fila, col, fila destino, col destino, promoción)"""
+        color = color or self.current_player
+        pins_and_checks = self.get_pins_and_checks(color)
+        promotion_row = 1 if color == 'white' else 6
+        moves = []
+
+        for piece in self.pieces[color]:
+            from_row, from_col = piece.row, piece.col
+            promotes = piece.piece_type == 'pawn' and from_row == promotion_row
+            for to_row, to_col in self.get_valid_moves(piece, pins_and_checks):
+                if promotes:
+                    for promotion in PROMOTION_TYPES:
+                        moves.append((from_row, from_col, to_row, to_col, promotion))
+                else:
+                    moves.append((from_row, from_col, to_row, to_col, None))
+
+        return moves
+
+    def iter_legal_moves(self, color: Optional[str] = None) -> Iterator[Tuple[int, int, int, int, Optional[str]]]:
+        """Movimientos legales de uno en uno (sin alterar la posición mientras se recorren),
+        empezando por las piezas que con más probabilidad pueden moverse"""
+        color = color or self.current_player
+        pins_and_checks = self.get_pins_and_checks(color)
+        pins, checkers, _ = pins_and_checks
+
+        kings, free_pieces, pinned_pieces = [], [], []
+        for piece in self.pieces[color]:
+            if piece.piece_type == 'king':
+                kings.append(piece)
+            elif (piece.row, piece.col) in pins:
+                pinned_pieces.append(piece)
+            else:
+                free_pieces.append(piece)
+        # Sin jaque casi cualquier pieza libre tiene un movimiento legal; en jaque lo
+        # más probable es que escape el rey, y con jaque doble solo puede moverse él
+        if not checkers:
+            ordered = free_pieces + kings + pinned_pieces
+        elif len(checkers) == 1:
+            ordered = kings + free_pieces + pinned_pieces
+        else:
+            ordered = kings
+
+        promotion_row = 1 if color == 'white' else 6
+        for piece in ordered:
+            from_row, from_col = piece.row, piece.col
+            promotes = piece.piece_type == 'pawn' and from_row == promotion_row
+            for to_row, to_col in self.get_valid_moves(piece, pins_and_checks):
+                if promotes:
+                    for promotion in PROMOTION_TYPES:
+                        yield (from_row, from_col, to_row, to_col, promotion)
+                else:
+                    yield (from_row, from_col, to_row, to_col, None)
+
+    def get_legal_move_map(self) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+        """Destinos legales por casilla del jugador actual, calculados una sola vez por posición"""
+        cache = self.legal_moves_cache
+        if cache is not None and cache[0] == self.zobrist_key:
+            return cache[1]
+
+        pins_and_checks = self.get_pins_and_checks(self.current_player)
+        move_map = {}
+        for piece in self.pieces[self.current_player]:
+            valid_moves = self.get_valid_moves(piece, pins_and_checks)
+            if valid_moves:
+                move_map[(piece.row, piece.col)] = valid_moves
+        self.legal_moves_cache = (self.zobrist_key, move_map)
+        return move_map
+
+    def has_valid_moves(self, color: str) -> bool:
+        cache = self.legal_moves_cache
+        if color == self.current_player and cache is not None and cache[0] == self.zobrist_key:
+            return bool(cache[1])
+        # Basta con encontrar el primer movimiento legal
+        for _ in self.iter_legal_moves(color):
+            return True
+        return False
+
+    def load_fen(self, fen: str):
+        """Cargar una posición en notación FEN
+
+        Los derechos de enroque se guardan en has_moved del rey y las torres, y
+        el contador de 50 movimientos no se usa.
+        """
+        fields = fen.split()
+        self.board = [[None for _ in range(8)] for _ in range(8)]
+        for row, rank in enumerate(fields[0].split('/')):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                    continue
+                color = 'white' if char.isupper() else 'black'
+                piece = ListPiece(color, FEN_PIECE_TYPES[char.lower()], row, col)
+                piece.has_moved = not (piece.piece_type == 'pawn' and row == (6 if color == 'white' else 1))
+                self.board[row][col] = piece
+                col += 1
+
+        rights = fields[2] if len(fields) > 2 else '-'
+        for letter, row, rook_col in (('K', 7, 7), ('Q', 7, 0), ('k', 0, 7), ('q', 0, 0)):
+            king = self.board[row][4]
+            rook = self.board[row][rook_col]
+            if letter in rights and king and rook:
+                king.has_moved = False
+                rook.has_moved = False
+
+        en_passant = fields[3] if len(fields) > 3 else '-'
+        self.en_passant = None if en_passant == '-' else (8 - int(en_passant[1]), ord(en_passant[0]) - ord('a'))
+        self.current_player = 'white' if fields[1] == 'w' else 'black'
+        self.fullmove_number = int(fields[5]) if len(fields) > 5 else 1
+
+        self.undo_stack = []
+        self.legal_moves_cache = None
+        self._index_pieces()
+
+    def get_fen(self) -> str:
+        """Obtener la posición actual en notación FEN"""
+        ranks = []
+        for row in self.board:
+            rank = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                letter = FEN_PIECE_LETTERS[piece.piece_type]
+                rank += letter.upper() if piece.color == 'white' else letter
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+
+        en_passant = '-'
+        if self.en_passant:
+            en_passant = f"{chr(ord('a') + self.en_passant[1])}{8 - self.en_passant[0]}"
+        side = 'w' if self.current_player == 'white' else 'b'
+        return f"{'/'.join(ranks)} {side} {self.get_castling_rights()} {en_passant} 0 {self.fullmove_number}"
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Búsqueda paralela Lazy SMP sobre varios procesos.
+
+Cada proceso del pool tiene su propio motor y reconstruye la posición a
+partir de su FEN, pero todos comparten una única tabla de transposición en
+memoria compartida: lo que uno guarda acorta la búsqueda de los demás. Los
+procesos impares empiezan una profundidad más adelante para no recorrer el
+árbol en el mismo orden. Cuando el primero termina, los demás se detienen y
+se devuelve la jugada del que completó más profundidad.
+
+Uso:
+    python parallel_search.py --workers 8 --time 5
+    python parallel_search.py --bench --depth 5      # nodos/s y aceleración con 1, 2, 4... procesos
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from typing import Optional
+
+from chess_professional import ChessGame
+from engine import Engine, SearchResult, MAX_DEPTH, root_position
+from transposition import bucket_count, BYTES_PER_BUCKET
+
+# Fracción del rendimiento lineal (nodos/s de un proceso por el número de procesos) que
+# debe alcanzar el benchmark para dar el escalado por bueno
+SCALING_EFFICIENCY = 0.7
+
+_worker_engine = None
+
+
+def _init_worker(table, hash_mb: float, stop_event):
+    global _worker_engine
+    _worker_engine = Engine(hash_mb, table, stop_event)
+
+
+def _worker_search(task):
+    fen, moves, index, age, time_limit, node_limit, max_depth = task
+    game = ChessGame()
+    game.load_fen(fen)
+    for move in moves:
+        game.make_move(*move)
+    # search() avanza la edad una vez: así todos los procesos usan la misma
+    _worker_engine.tt.age = (age - 1) & 63
+    result = _worker_engine.search(game, time_limit, node_limit, max_depth, start_depth=1 + index % 2)
+    return index, result
+
+
+class ParallelSearch:
+    def __init__(self, workers: Optional[int] = None, hash_mb: float = 64):
+        self.workers = workers or os.cpu_count() or 1
+        size = bucket_count(hash_mb) * BYTES_PER_BUCKET
+        self.table = multiprocessing.RawArray('B', size)
+        self.stop_event = multiprocessing.Event()
+        self.pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                         initargs=(self.table, hash_mb, self.stop_event))
+        self.age = 0
+
+    def search(self, game, time_limit: Optional[float] = None, node_limit: Optional[int] = None,
+               max_depth: int = MAX_DEPTH) -> SearchResult:
+        """Buscar con todos los procesos; los nodos de node_limit se reparten entre ellos"""
+        start = time.perf_counter()
+        fen, moves = root_position(game)
+        self.age = (self.age + 1) & 63
+        worker_nodes = node_limit // self.workers if node_limit else None
+        tasks = [(fen, moves, index, self.age, time_limit, worker_nodes, max_depth)
+                 for index in range(self.workers)]
+
+        self.stop_event.clear()
+        results = []
+        for index, result in self.pool.imap_unordered(_worker_search, tasks):
+            # El primero en acabar ha completado su profundidad: los demás ya no aportan
+            self.stop_event.set()
+            results.append((result.depth, -len(results), result))
+        self.stop_event.clear()
+
+        best = max(results)[2]
+        return SearchResult(best.move, best.score, best.depth,
+                            sum(result.nodes for _, _, result in results),
+                            time.perf_counter() - start, best.ponder)
+
+    def close(self):
+        # Sin terminate(): pygame (SDL) puede capturar SIGTERM en los procesos y no terminarían
+        self.pool.close()
+        self.pool.join()
+
+
+def benchmark(fen: str, depth: int, max_workers: int) -> bool:
+    """Nodos por segundo y tiempo hasta profundidad fija con 1, 2, 4... procesos, comparados con
+    un solo proceso; el escalado es bueno si cada proceso rinde al menos SCALING_EFFICIENCY
+    de lo que rinde uno solo"""
+    from perft import move_to_uci
+
+    cores = os.cpu_count() or 1
+    print(f"Profundidad {depth}, {cores} núcleos; escalado exigido: {SCALING_EFFICIENCY:.0%} del lineal")
+    passed = True
+    checked = 0
+    workers = 1
+    base_nps = base_time = None
+    while workers <= max_workers:
+        search = ParallelSearch(workers)
+        game = ChessGame()
+        game.load_fen(fen)
+        result = search.search(game, max_depth=depth)
+        search.close()
+
+        nps = result.nodes / result.elapsed if result.elapsed > 0 else 0
+        if base_nps is None:
+            base_nps, base_time = nps, result.elapsed
+        speedup = nps / base_nps if base_nps else 0
+        efficiency = speedup / workers
+        if workers > cores:
+            verdict = "sin comprobar: más procesos que núcleos"
+        elif efficiency >= SCALING_EFFICIENCY:
+            verdict = "✅"
+            checked = workers
+        else:
+            verdict = "❌"
+            passed = False
+        print(f"{workers:3d} procesos: {nps:10,.0f} nodos/s  aceleración {speedup:5.2f}x ({efficiency:4.0%} del lineal)  "
+              f"hasta profundidad {result.elapsed:6.2f}s ({base_time / result.elapsed:5.2f}x)  "
+              f"{move_to_uci(result.move)}  {verdict}")
+        workers *= 2
+
+    if not passed:
+        print(f"❌ El escalado no llega al {SCALING_EFFICIENCY:.0%} del lineal")
+    elif checked > 1:
+        print(f"✅ Escalado casi lineal hasta {checked} procesos")
+    else:
+        print("⚠️  Un solo núcleo: el escalado necesita una máquina con varios")
+    return passed
+
+
+def main():
+    from perft import REFERENCE_POSITIONS, move_to_uci
+
+    parser = argparse.ArgumentParser(description="Búsqueda paralela Lazy SMP")
+    parser.add_argument('--fen', default=REFERENCE_POSITIONS[1][1], help="Posición en FEN (por defecto Kiwipete)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Número de procesos")
+    parser.add_argument('--time', type=float, default=5.0, help="Tiempo de búsqueda en segundos")
+    parser.add_argument('--depth', type=int, default=5, help="Profundidad del benchmark")
+    parser.add_argument('--bench', action='store_true', help="Medir el escalado con 1, 2, 4... procesos")
+    args = parser.parse_args()
+
+    if args.bench:
+        return 0 if benchmark(args.fen, args.depth, args.workers) else 1
+
+    search = ParallelSearch(args.workers)
+    game = ChessGame()
+    game.load_fen(args.fen)
+    result = search.search(game, time_limit=args.time)
+    search.close()
+    nps = result.nodes / result.elapsed if result.elapsed > 0 else 0
+    print(f"Mejor jugada: {move_to_uci(result.move)}  Puntuación: {result.score}  "
+          f"Profundidad: {result.depth}  Nodos: {result.nodes}  ({nps:,.0f} nodos/s, "
+          f"{args.workers} procesos)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Perft: recuento de nodos hoja del árbol de movimientos legales.
+
+Sirve a la vez como prueba de corrección del generador de movimientos (los
+recuentos de las posiciones de referencia son conocidos) y como medida de
+rendimiento en nodos por segundo.
+
+Uso:
+    python perft.py                                  # suite de referencia
+    python perft.py --depth 4                        # posición inicial
+    python perft.py --fen "<FEN>" --depth 3 --divide
+    python perft.py --core professional --max-nodes 500000
+    python perft.py --core list                      # núcleo de listas, para comparar
+"""
+
+import argparse
+import importlib
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# (nombre, FEN, recuentos esperados para profundidad 1, 2, 3...)
+REFERENCE_POSITIONS: List[Tuple[str, str, List[int]]] = [
+    ("Posición inicial",
+     "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+     [20, 400, 8902, 197281, 4865609]),
+    ("Kiwipete",
+     "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     [48, 2039, 97862, 4085603]),
+    ("Posición 3 (final de torres y peones)",
+     "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+     [14, 191, 2812, 43238, 674624]),
+    ("Posición 4 (promociones)",
+     "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+     [6, 264, 9467, 422333]),
+    ("Posición 5",
+     "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+     [44, 1486, 62379, 2103487]),
+    ("Posición 6",
+     "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     [46, 2079, 89890, 3894594]),
+]
+
+PROMOTION_LETTERS = {'queen': 'q', 'rook': 'r', 'bishop': 'b', 'knight': 'n'}
+
+
+def perft(game, depth: int) -> int:
+    """Contar las hojas del árbol de movimientos legales hasta la profundidad dada"""
+    if depth == 0:
+        return 1
+
+    moves = game.generate_legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        game.make_move(*move)
+        nodes += perft(game, depth - 1)
+        game.unmake_move()
+    return nodes
+
+
+def move_to_uci(move) -> str:
+    """Convertir (fila, col, fila destino, col destino, promoción) a notación UCI"""
+    from_row, from_col, to_row, to_col, promotion = move
+    text = f"{chr(ord('a') + from_col)}{8 - from_row}{chr(ord('a') + to_col)}{8 - to_row}"
+    if promotion:
+        text += PROMOTION_LETTERS[promotion]
+    return text
+
+
+def divide(game, depth: int) -> Dict[str, int]:
+    """Recuento de hojas por cada movimiento de la raíz"""
+    results = {}
+    for move in game.generate_legal_moves():
+        game.make_move(*move)
+        results[move_to_uci(move)] = perft(game, depth - 1)
+        game.unmake_move()
+    return results
+
+
+def load_game_class(core: str):
+    """Clase de posición del núcleo indicado: el ChessGame de 'advanced' o 'professional'
+    (sobre bitboards) o 'list', el backend de listas board[row][col] de referencia"""
+    if core == 'list':
+        return importlib.import_module("list_board").ListPosition
+    return importlib.import_module(f"chess_{core}").ChessGame
+
+
+def run_suite(game_class, max_nodes: int = 200000) -> bool:
+    """Ejecutar las posiciones de referencia hasta max_nodes hojas por posición"""
+    all_passed = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for name, fen, expected_counts in REFERENCE_POSITIONS:
+        game = game_class()
+        game.load_fen(fen)
+        print(f"{name}")
+
+        for depth, expected in enumerate(expected_counts, start=1):
+            if expected > max_nodes:
+                break
+            start = time.perf_counter()
+            nodes = perft(game, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+
+            status = "✅" if nodes == expected else "❌"
+            if nodes != expected:
+                all_passed = False
+            nps = nodes / elapsed if elapsed > 0 else 0
+            print(f"  {status} profundidad {depth}: {nodes} (esperado {expected}) "
+                  f"{elapsed:.2f}s {nps:,.0f} nodos/s")
+
+    if total_time > 0:
+        print(f"\nTotal: {total_nodes} nodos en {total_time:.2f}s "
+              f"({total_nodes / total_time:,.0f} nodos/s)")
+    return all_passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft para el núcleo de reglas del ajedrez")
+    parser.add_argument('--core', choices=['advanced', 'professional', 'list'], default='advanced',
+                        help="Núcleo de reglas a medir")
+    parser.add_argument('--fen', help="Posición en FEN (por defecto la inicial)")
+    parser.add_argument('--depth', type=int, help="Profundidad; sin ella se ejecuta la suite de referencia")
+    parser.add_argument('--divide', action='store_true', help="Mostrar el recuento por movimiento de la raíz")
+    parser.add_argument('--max-nodes', type=int, default=200000,
+                        help="Límite de hojas por posición en la suite de referencia")
+    args = parser.parse_args()
+
+    game_class = load_game_class(args.core)
+
+    if args.depth is None:
+        return 0 if run_suite(game_class, args.max_nodes) else 1
+
+    game = game_class()
+    game.load_fen(args.fen or REFERENCE_POSITIONS[0][1])
+
+    start = time.perf_counter()
+    if args.divide:
+        results = divide(game, args.depth)
+        for move, count in sorted(results.items()):
+            print(f"{move}: {count}")
+        nodes = sum(results.values())
+    else:
+        nodes = perft(game, args.depth)
+    elapsed = time.perf_counter() - start
+
+    nps = nodes / elapsed if elapsed > 0 else 0
+    print(f"Nodos: {nodes}  Tiempo: {elapsed:.2f}s  ({nps:,.0f} nodos/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Tablas de finales de tres piezas (KQK, KRK, KPK) por análisis retrógrado.
+
+El generador trabaja con casillas ``row * 8 + col`` y siempre con las
+blancas como bando fuerte; las posiciones con el bando fuerte negro se
+consultan reflejando el tablero. Parte de los mates y retrocede jugada a
+jugada: una posición con las blancas al turno está ganada si alguna jugada
+lleva a una posición perdida para las negras, y una con las negras al
+turno está perdida cuando todas sus jugadas llevan a posiciones ganadas
+para las blancas. Como se avanza por capas, cada posición guarda la
+distancia exacta al mate en medias jugadas.
+
+Formato de fichero: una cabecera de 8 bytes (``TBAJ``, versión y nombre)
+seguida de dos secciones de 64³ bytes, blancas y negras al turno, con
+índice ``(rey fuerte * 64 + pieza) * 64 + rey débil``. Cada byte vale 0
+para tablas, 255 para posiciones imposibles y 1 + medias jugadas hasta el
+mate en el resto. Los ficheros se consultan con ``mmap`` sin cargarlos.
+
+Uso:
+    python tablebase.py                     # generar las tres tablas en tablebases/
+    python tablebase.py --fen "<FEN>"       # consultar una posición
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+from attack_tables import KING_TARGETS, ROOK_RAYS, BISHOP_RAYS
+
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablebases')
+
+# Nombre de cada tabla según la pieza del bando fuerte, en orden de generación (KPK usa las otras dos)
+TABLES = {'queen': 'KQK', 'rook': 'KRK', 'pawn': 'KPK'}
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+_HEADER = struct.Struct('<4sB3s')
+_MAGIC = b'TBAJ'
+_VERSION = 1
+_SIZE = 64 * 64 * 64
+ILLEGAL = 255
+_UNKNOWN = 0  # Mientras se genera: sin resolver (al final, tablas)
+
+_KING_STEPS = [tuple(row * 8 + col for row, col in targets) for targets in KING_TARGETS]
+_ADJACENT = [[False] * 64 for _ in range(64)]
+for _square in range(64):
+    for _target in _KING_STEPS[_square]:
+        _ADJACENT[_square][_target] = True
+
+_ROOK_LINES = [tuple(tuple(row * 8 + col for row, col in ray) for ray in rays) for rays in ROOK_RAYS]
+_BISHOP_LINES = [tuple(tuple(row * 8 + col for row, col in ray) for ray in rays) for rays in BISHOP_RAYS]
+_LINES = {'rook': _ROOK_LINES,
+          'queen': [_ROOK_LINES[square] + _BISHOP_LINES[square] for square in range(64)]}
+
+# _BETWEEN[pieza][origen][destino]: casillas intermedias si están en línea, None si no
+_BETWEEN = {}
+for _piece_type, _lines in _LINES.items():
+    _table = [[None] * 64 for _ in range(64)]
+    for _square in range(64):
+        for _ray in _lines[_square]:
+            for _step, _target in enumerate(_ray):
+                _table[_square][_target] = _ray[:_step]
+    _BETWEEN[_piece_type] = _table
+
+
+def _attacks(piece_type: str, square: int, white_king: int, target: int) -> bool:
+    """La pieza fuerte ataca target; solo el rey blanco puede tapar la línea"""
+    if piece_type == 'pawn':
+        # El peón blanco sube (fila decreciente) y captura en diagonal
+        return target // 8 == square // 8 - 1 and abs(target % 8 - square % 8) == 1
+    between = _BETWEEN[piece_type][square][target]
+    return between is not None and white_king not in between
+
+
+def _valid(piece_type: str, white_king: int, piece: int, black_king: int) -> bool:
+    """Piezas en casillas distintas, reyes separados y peón fuera de la primera y la última fila"""
+    if white_king == piece or white_king == black_king or piece == black_king:
+        return False
+    if _ADJACENT[white_king][black_king]:
+        return False
+    return piece_type != 'pawn' or 0 < piece // 8 < 7
+
+
+def _index(white_king: int, piece: int, black_king: int) -> int:
+    return (white_king * 64 + piece) * 64 + black_king
+
+
+def _piece_unmoves(piece_type: str, white_king: int, piece: int, black_king: int):
+    """Casillas desde las que la pieza fuerte pudo llegar a la suya (sin capturas: no hay qué capturar)"""
+    if piece_type == 'pawn':
+        below = piece + 8
+        if below // 8 <= 6 and below not in (white_king, black_king):
+            yield below
+            # Doble avance desde la segunda fila
+            if piece // 8 == 4 and below + 8 not in (white_king, black_king):
+                yield below + 8
+        return
+    for ray in _LINES[piece_type][piece]:
+        for square in ray:
+            if square == white_king or square == black_king:
+                break
+            yield square
+
+
+def generate(piece_type: str, directory: str = TABLEBASE_DIR) -> str:
+    """Generar la tabla de rey y piece_type contra rey y guardarla; devuelve la ruta del fichero"""
+    white = bytearray(_SIZE)  # Blancas al turno: medias jugadas + 1 si ganan
+    black = bytearray(_SIZE)  # Negras al turno: medias jugadas + 1 si pierden
+    remaining = [0] * _SIZE  # Jugadas de las negras que aún no llevan a posición ganada
+    lost = []
+
+    for white_king in range(64):
+        for piece in range(64):
+            for black_king in range(64):
+                index = _index(white_king, piece, black_king)
+                if not _valid(piece_type, white_king, piece, black_king):
+                    white[index] = black[index] = ILLEGAL
+                    continue
+                in_check = _attacks(piece_type, piece, white_king, black_king)
+                if in_check:
+                    white[index] = ILLEGAL  # Las negras en jaque con las blancas al turno
+                moves = 0
+                escape = False
+                for target in _KING_STEPS[black_king]:
+                    if target == white_king or _ADJACENT[white_king][target]:
+                        continue
+                    if target == piece:
+                        # Capturar la pieza indefensa deja rey contra rey: tablas
+                        escape = True
+                        break
+                    if not _attacks(piece_type, piece, white_king, target):
+                        moves += 1
+                if escape:
+                    continue
+                if moves == 0:
+                    if in_check:
+                        black[index] = 1  # Mate: perdida en 0 medias jugadas
+                        lost.append(index)
+                    continue  # Ahogado: tablas
+                remaining[index] = moves
+
+    # Promociones de KPK: ganan si la dama o la torre resultante gana (medias jugadas de la otra tabla)
+    promotions: Dict[int, list] = {}
+    if piece_type == 'pawn':
+        tablebase = Tablebase(directory)
+        promoted = [tablebase.tables[promotion] for promotion in ('queen', 'rook') if promotion in tablebase.tables]
+        for white_king in range(64):
+            for piece in range(8, 16):
+                for black_king in range(64):
+                    index = _index(white_king, piece, black_king)
+                    if white[index] == ILLEGAL:
+                        continue
+                    queening = piece - 8
+                    if queening in (white_king, black_king):
+                        continue
+                    best = None
+                    for table in promoted:
+                        value = table[_HEADER.size + _SIZE + _index(white_king, queening, black_king)]
+                        if value not in (_UNKNOWN, ILLEGAL) and (best is None or value < best):
+                            best = value
+                    if best is not None:
+                        promotions.setdefault(best, []).append(index)
+        tablebase.close()
+
+    # Capas: las negras pierden en plies medias jugadas, las blancas ganan en plies + 1
+    plies = 0
+    while lost or any(value > plies for value in promotions):
+        won = promotions.pop(plies + 1, [])
+        won = [index for index in won if white[index] == _UNKNOWN]
+        for index in won:
+            white[index] = plies + 2
+        for index in lost:
+            white_king, rest = divmod(index, 4096)
+            piece, black_king = divmod(rest, 64)
+            for square in _KING_STEPS[white_king]:
+                if square == piece or _ADJACENT[square][black_king]:
+                    continue
+                previous = _index(square, piece, black_king)
+                if white[previous] == _UNKNOWN:
+                    white[previous] = plies + 2
+                    won.append(previous)
+            for square in _piece_unmoves(piece_type, white_king, piece, black_king):
+                previous = _index(white_king, square, black_king)
+                if white[previous] == _UNKNOWN:
+                    white[previous] = plies + 2
+                    won.append(previous)
+
+        lost = []
+        for index in won:
+            white_king, rest = divmod(index, 4096)
+            piece, black_king = divmod(rest, 64)
+            for square in _KING_STEPS[black_king]:
+                if square == white_king or square == piece or _ADJACENT[white_king][square]:
+                    continue
+                previous = _index(white_king, piece, square)
+                if remaining[previous]:
+                    remaining[previous] -= 1
+                    if remaining[previous] == 0:
+                        black[previous] = plies + 3
+                        lost.append(previous)
+        plies += 2
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, TABLES[piece_type] + '.tb')
+    with open(path, 'wb') as table:
+        table.write(_HEADER.pack(_MAGIC, _VERSION, TABLES[piece_type].encode('ascii')))
+        table.write(white)
+        table.write(black)
+    return path
+
+
+class Tablebase:
+    def __init__(self, directory: str = TABLEBASE_DIR):
+        """Proyectar en memoria las tablas generadas que haya en el directorio"""
+        self.tables = {}
+        self._files = []
+        for piece_type, name in TABLES.items():
+            path = os.path.join(directory, name + '.tb')
+            if not os.path.exists(path):
+                continue
+            table_file = open(path, 'rb')
+            data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _ = _HEADER.unpack_from(data)
+            if magic != _MAGIC or version != _VERSION or len(data) != _HEADER.size + 2 * _SIZE:
+                data.close()
+                table_file.close()
+                continue
+            self._files.append(table_file)
+            self.tables[piece_type] = data
+
+    def close(self):
+        for data in self.tables.values():
+            data.close()
+        for table_file in self._files:
+            table_file.close()
+        self.tables = {}
+        self._files = []
+
+    def probe(self, game) -> Optional[Tuple[int, int]]:
+        """(WIN, LOSS o DRAW para el jugador al que le toca, medias jugadas hasta el mate), o None
+        si la posición no está en las tablas"""
+        # pieces y king_positions se calculan en cada consulta (BitboardPosition): se leen una vez
+        all_pieces = game.pieces
+        white_pieces = all_pieces['white']
+        black_pieces = all_pieces['black']
+        if len(white_pieces) + len(black_pieces) > 3:
+            return None
+        strong = 'white' if len(white_pieces) == 2 else 'black'
+        pieces = white_pieces if strong == 'white' else black_pieces
+        extra = [piece for piece in pieces if piece.piece_type != 'king']
+        if not extra or extra[0].piece_type in ('knight', 'bishop'):
+            return (DRAW, 0)  # Rey contra rey, o con una pieza menor: material insuficiente
+        piece = extra[0]
+        data = self.tables.get(piece.piece_type)
+        if data is None or game.get_castling_rights() != '-':
+            return None
+
+        # Con el bando fuerte negro se refleja el tablero de arriba abajo
+        flip = 56 if strong == 'black' else 0
+        weak = 'black' if strong == 'white' else 'white'
+        kings = game.king_positions
+        white_king = (kings[strong][0] * 8 + kings[strong][1]) ^ flip
+        black_king = (kings[weak][0] * 8 + kings[weak][1]) ^ flip
+        square = (piece.row * 8 + piece.col) ^ flip
+        strong_to_move = game.current_player == strong
+
+        value = data[_HEADER.size + (0 if strong_to_move else _SIZE) + _index(white_king, square, black_king)]
+        if value == ILLEGAL:
+            return None
+        if value == _UNKNOWN:
+            return (DRAW, 0)
+        return (WIN if strong_to_move else LOSS, value - 1)
+
+
+_default = None
+
+
+def default_tablebase() -> Tablebase:
+    """Tablas del directorio tablebases/, abiertas una vez por proceso. Sin tablas generadas
+    solo reconoce el material insuficiente"""
+    global _default
+    if _default is None:
+        _default = Tablebase()
+    return _default
+
+
+def main():
+    from chess_professional import ChessGame
+
+    parser = argparse.ArgumentParser(description="Tablas de finales KQK, KRK y KPK")
+    parser.add_argument('--fen', help="Consultar una posición en lugar de generar las tablas")
+    parser.add_argument('--dir', default=TABLEBASE_DIR, help="Directorio de las tablas")
+    args = parser.parse_args()
+
+    if args.fen:
+        game = ChessGame()
+        game.load_fen(args.fen)
+        tablebase = Tablebase(args.dir)
+        result = tablebase.probe(game)
+        if result is None:
+            print("Posición fuera de las tablas")
+        elif result[0] == DRAW:
+            print("Tablas")
+        else:
+            side = "gana" if result[0] == WIN else "pierde"
+            print(f"El jugador al que le toca {side}: mate en {result[1]} medias jugadas")
+        tablebase.close()
+        return 0
+
+    for piece_type, name in TABLES.items():
+        start = time.perf_counter()
+        path = generate(piece_type, args.dir)
+        print(f"{name}: {path}  ({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -89,6 +89,1072 @@ def test_basic_game_functionality():
         print(f"❌ Error en prueba de funcionalidad: {e}")
         return False
 
+def test_make_unmake_move():
+    """Verificar que make_move/unmake_move y undo_move restauran la posición"""
+    try:
+        from chess_professional import ChessGame
+        
+        game = ChessGame()
+        for move in [(6, 4, 4, 4), (1, 3, 3, 3), (4, 4, 3, 3), (0, 3, 3, 3)]:
+            game.move_piece(*move)
+        
+        def snapshot():
+            return [[(p.color, p.piece_type, p.row, p.col, p.has_moved) if p else None
+                     for p in row] for row in game.board]
+        
+        before = snapshot()
+        player = game.current_player
+        stack_size = len(game.undo_stack)
+        
+        # Probar make/unmake con todos los movimientos legales
+        for move in game.generate_legal_moves():
+            game.make_move(*move)
+            game.unmake_move()
+        
+        if snapshot() != before or game.current_player != player or len(game.undo_stack) != stack_size:
+            print("❌ make_move/unmake_move no restauran la posición")
+            return False
+        
+        # Las listas de piezas deben coincidir con el tablero
+        on_board = sum(1 for row in game.board for p in row if p)
+        if len(game.pieces['white']) + len(game.pieces['black']) != on_board or \
+                game.find_king('white') != (7, 4) or game.board[7][4].piece_type != 'king':
+            print("❌ Las listas de piezas no coinciden con el tablero")
+            return False
+        
+        # Deshacer movimientos completos de la partida
+        game.undo_move()
+        game.undo_move()
+        pawn = game.board[3][3]
+        if not pawn or pawn.color != 'black' or game.captured_pieces['black'] or game.move_count != 2:
+            print("❌ undo_move no restaura capturas ni contador")
+            return False
+        
+        print("✅ make_move/unmake_move y deshacer funcionan correctamente")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de make/unmake: {e}")
+        return False
+
+def test_perft_reference_positions():
+    """Verificar el generador de movimientos con las posiciones de referencia de perft"""
+    try:
+        from chess_advanced import ChessGame
+        from perft import REFERENCE_POSITIONS, perft
+        
+        for name, fen, expected_counts in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            for depth, expected in enumerate(expected_counts, start=1):
+                if expected > 10000:
+                    break
+                nodes = perft(game, depth)
+                if nodes != expected:
+                    print(f"❌ Perft de {name} a profundidad {depth}: {nodes} (esperado {expected})")
+                    return False
+            if game.get_fen().split()[:4] != fen.split()[:4]:
+                print(f"❌ La posición {name} no se restauró tras perft")
+                return False
+        
+        print("✅ Perft coincide en todas las posiciones de referencia")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de perft: {e}")
+        return False
+
+def test_bitboard_backend():
+    """Verificar el backend de bitboards contra el de listas: mismas jugadas y más rápido"""
+    try:
+        import random
+        import time
+        from chess_professional import ChessGame
+        from list_board import ListPosition
+        from perft import REFERENCE_POSITIONS, perft
+        
+        rng = random.Random(12)
+        for name, fen, _ in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            reference = ListPosition()
+            reference.load_fen(fen)
+            start_fen = game.get_fen()
+            played = 0
+            for _ in range(60):
+                moves = game.generate_legal_moves()
+                if sorted(moves, key=str) != sorted(reference.generate_legal_moves(), key=str):
+                    print(f"❌ Movimientos legales distintos en {name}: {game.get_fen()}")
+                    return False
+                if (game.get_fen(), game.zobrist_key, game.evaluation, game.pawn_key) != \
+                        (reference.get_fen(), reference.zobrist_key, reference.evaluation, reference.pawn_key):
+                    print(f"❌ Posición o claves distintas en {name}: {game.get_fen()}")
+                    return False
+                if not moves:
+                    break
+                move = rng.choice(moves)
+                game.make_move(*move)
+                reference.make_move(*move)
+                played += 1
+            for _ in range(played):
+                game.unmake_move()
+            if game.get_fen() != start_fen:
+                print(f"❌ La posición {name} no se restauró")
+                return False
+        
+        # board[row][col] da a las GUI las mismas piezas que el tablero de listas
+        game = ChessGame()
+        reference = ListPosition()
+        for row in range(8):
+            for col in range(8):
+                piece, expected = game.board[row][col], reference.board[row][col]
+                if (piece and (piece.color, piece.piece_type, piece.row, piece.col)) != \
+                        (expected and (expected.color, expected.piece_type, expected.row, expected.col)):
+                    print(f"❌ board[{row}][{col}] no coincide con el tablero de listas")
+                    return False
+        try:
+            game.board[8]
+            print("❌ board[8] debería estar fuera del tablero")
+            return False
+        except IndexError:
+            pass
+        
+        def best_time(function, repeats=3):
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                function()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+        
+        def play(position_class):
+            # Generar los movimientos legales y jugar uno en cada posición de una partida al azar
+            position = position_class()
+            choice = random.Random(1).choice
+            for _ in range(80):
+                moves = position.generate_legal_moves()
+                if not moves:
+                    break
+                position.make_move(*choice(moves))
+        
+        def count(position_class):
+            position = position_class()
+            position.load_fen(REFERENCE_POSITIONS[1][1])
+            perft(position, 2)
+        
+        speedups = []
+        for workload in (count, play):
+            bitboard_time = best_time(lambda: workload(ChessGame))
+            list_time = best_time(lambda: workload(ListPosition))
+            if bitboard_time >= list_time:
+                print(f"❌ El backend de bitboards no es más rápido ({workload.__name__}: "
+                      f"{bitboard_time * 1000:.1f} ms frente a {list_time * 1000:.1f} ms)")
+                return False
+            speedups.append(list_time / bitboard_time)
+        
+        print(f"✅ Backend de bitboards correcto (perft {speedups[0]:.1f}x y partida {speedups[1]:.1f}x "
+              f"más rápidos que el de listas)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba del backend de bitboards: {e}")
+        return False
+
+def test_zobrist_hashing():
+    """Verificar que la clave Zobrist incremental coincide con la calculada desde cero"""
+    try:
+        import random
+        import zobrist
+        from chess_professional import ChessGame
+        from perft import REFERENCE_POSITIONS
+        
+        rng = random.Random(8)
+        for name, fen, _ in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            start_key = game.zobrist_key
+            played = 0
+            for _ in range(40):
+                moves = game.generate_legal_moves()
+                if not moves:
+                    break
+                game.make_move(*rng.choice(moves))
+                played += 1
+                if game.zobrist_key != zobrist.compute_key(game):
+                    print(f"❌ Clave Zobrist incremental incorrecta en {name}")
+                    return False
+            for _ in range(played):
+                game.unmake_move()
+            if game.zobrist_key != start_key:
+                print(f"❌ La clave Zobrist no se restauró en {name}")
+                return False
+        
+        # Transposición: el mismo orden de caballos por dos caminos da la misma clave
+        first = ChessGame()
+        for move in ((7, 6, 5, 5), (0, 6, 2, 5), (7, 1, 5, 2), (0, 1, 2, 2)):
+            first.make_move(*move)
+        second = ChessGame()
+        for move in ((7, 1, 5, 2), (0, 1, 2, 2), (7, 6, 5, 5), (0, 6, 2, 5)):
+            second.make_move(*move)
+        if first.zobrist_key != second.zobrist_key:
+            print("❌ Una transposición produjo claves Zobrist distintas")
+            return False
+        
+        print("✅ Claves Zobrist correctas")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de Zobrist: {e}")
+        return False
+
+def test_incremental_evaluation():
+    """Verificar que la evaluación y el material incrementales coinciden con los calculados desde cero"""
+    try:
+        import random
+        import evaluation
+        from chess_professional import ChessGame
+        from perft import REFERENCE_POSITIONS
+        
+        game = ChessGame()
+        if game.evaluation != 0 or game.calculate_material_balance() != {'white': 39, 'black': 39}:
+            print(f"❌ Evaluación inicial incorrecta: {game.evaluation}")
+            return False
+        
+        rng = random.Random(18)
+        for name, fen, _ in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            start = (game.evaluation, game.calculate_material_balance())
+            played = 0
+            for _ in range(60):
+                moves = game.generate_legal_moves()
+                if not moves:
+                    break
+                # Preferir promociones para cubrir también las subpromociones
+                promotions = [move for move in moves if move[4]]
+                game.make_move(*rng.choice(promotions or moves))
+                played += 1
+                if (game.evaluation != evaluation.compute_score(game) or
+                        game.calculate_material_balance() != evaluation.compute_material(game)):
+                    print(f"❌ Evaluación incremental incorrecta en {name}")
+                    return False
+            for _ in range(played):
+                game.unmake_move()
+            if (game.evaluation, game.calculate_material_balance()) != start:
+                print(f"❌ La evaluación no se restauró en {name}")
+                return False
+        
+        print("✅ Evaluación incremental correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de evaluación: {e}")
+        return False
+
+def test_batch_evaluation():
+    """Verificar que la evaluación vectorizada coincide con la de cada posición"""
+    import importlib.util
+    if importlib.util.find_spec("numpy") is None:
+        print("⚠️  NumPy no instalado: se omite la evaluación por lotes")
+        return True
+    try:
+        import batch_eval
+        from chess_professional import ChessGame
+        from perft import REFERENCE_POSITIONS
+        
+        fens = [fen for _, fen, _ in REFERENCE_POSITIONS] + batch_eval.random_positions(300, seed=19)
+        games = []
+        for fen in fens:
+            game = ChessGame()
+            game.load_fen(fen)
+            games.append(game)
+        
+        boards, sides = batch_eval.pack_fens(fens)
+        game_boards, game_sides = batch_eval.pack_games(games)
+        if boards.shape != (len(fens), 64) or (boards != game_boards).any() or (sides != game_sides).any():
+            print("❌ El empaquetado desde FEN y desde ChessGame no coincide")
+            return False
+        
+        scores = batch_eval.evaluate_batch(boards)
+        if scores.tolist() != [batch_eval.evaluate_position(game) for game in games]:
+            print("❌ La evaluación vectorizada difiere de la evaluación por posición")
+            return False
+        if batch_eval.evaluate_batch(boards, mobility=False).tolist() != [game.evaluation for game in games]:
+            print("❌ Material y casillas vectorizados difieren de la evaluación incremental")
+            return False
+        if (batch_eval.evaluate_batch(boards, sides) != scores * sides).any():
+            print("❌ La puntuación relativa al turno es incorrecta")
+            return False
+        
+        print("✅ Evaluación por lotes correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de evaluación por lotes: {e}")
+        return False
+
+def test_legal_move_cache():
+    """Verificar que los movimientos legales se calculan una vez por posición"""
+    try:
+        from chess_professional import ChessGame
+        
+        game = ChessGame()
+        game.select_piece(6, 4)
+        if sorted(game.possible_moves) != [(4, 4), (5, 4)]:
+            print(f"❌ Movimientos del peón e2 incorrectos: {game.possible_moves}")
+            return False
+        game.select_piece(4, 4)
+        
+        # Con la caché llena, validar el movimiento no vuelve a generar movimientos y
+        # update_game_state se detiene en la primera pieza con un movimiento legal
+        game.select_piece(1, 4)
+        calls = []
+        original = game.generate_legal_moves
+        game.generate_legal_moves = lambda *args: calls.append(args) or original(*args)
+        game.select_piece(3, 4)
+        if calls:
+            print(f"❌ Se esperaba que mover no generara la lista de movimientos y hubo {len(calls)} generaciones")
+            return False
+        if game.board[3][4] is None or game.current_player != 'white':
+            print("❌ El movimiento con la caché no se realizó")
+            return False
+        
+        game.undo_move()
+        if sorted(game.get_legal_move_map().get((1, 4), [])) != [(2, 4), (3, 4)]:
+            print("❌ La caché no se invalidó al deshacer")
+            return False
+        
+        print("✅ Caché de movimientos legales correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de caché de movimientos: {e}")
+        return False
+
+def test_lazy_legal_moves():
+    """Verificar la iteración perezosa de movimientos legales y la detección de fin de partida"""
+    try:
+        import random
+        from chess_advanced import ChessGame, GameState
+        from perft import REFERENCE_POSITIONS
+        
+        rng = random.Random(10)
+        for _, fen, _ in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            for _ in range(30):
+                moves = game.generate_legal_moves()
+                if sorted(game.iter_legal_moves()) != sorted(moves):
+                    print(f"❌ iter_legal_moves no coincide en {game.get_fen()}")
+                    return False
+                if game.has_valid_moves(game.current_player) != bool(moves):
+                    print(f"❌ has_valid_moves incorrecto en {game.get_fen()}")
+                    return False
+                if not moves:
+                    break
+                game.make_move(*rng.choice(moves))
+        
+        endings = [
+            ("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3", GameState.CHECKMATE),
+            ("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", GameState.STALEMATE),
+            ("4k3/8/8/8/8/8/3r4/R3K3 w Q - 0 1", GameState.PLAYING),
+            ("4k3/8/8/8/8/8/8/r3K3 w - - 0 1", GameState.CHECK),
+        ]
+        for fen, expected in endings:
+            game = ChessGame()
+            game.load_fen(fen)
+            if game.game_state != expected:
+                print(f"❌ Estado {game.game_state} en lugar de {expected} para {fen}")
+                return False
+        
+        print("✅ Iteración perezosa de movimientos legales correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de iteración de movimientos: {e}")
+        return False
+
+def test_engine_search():
+    """Verificar que el motor encuentra jugadas evidentes y deja la partida intacta"""
+    try:
+        from chess_professional import ChessGame
+        from engine import Engine, MATE_SCORE
+        
+        engine = Engine()
+        
+        # Mate en una con la torre en la octava fila
+        game = ChessGame()
+        game.load_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = engine.search(game, max_depth=3)
+        if result.move[:4] != (7, 0, 0, 0) or result.score != MATE_SCORE - 1:
+            print(f"❌ El motor no encontró el mate en una: {result}")
+            return False
+        
+        # Capturar la dama colgada
+        game.load_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+        result = engine.search(game, max_depth=3)
+        if result.move[:4] != (6, 3, 3, 3):
+            print(f"❌ El motor no capturó la dama: {result}")
+            return False
+        
+        # Cortar por nodos a mitad de iteración no debe dejar jugadas hechas
+        game = ChessGame()
+        fen = game.get_fen()
+        result = engine.search(game, node_limit=3000)
+        if game.get_fen() != fen or game.undo_stack or result.move not in game.generate_legal_moves():
+            print("❌ La búsqueda interrumpida alteró la partida")
+            return False
+        
+        print(f"✅ Motor correcto (profundidad {result.depth} con 3000 nodos)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba del motor: {e}")
+        return False
+
+def test_transposition_table():
+    """Verificar el almacenamiento y el reemplazo de la tabla de transposición"""
+    try:
+        from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+        
+        table = TranspositionTable(size_mb=1)
+        size = len(table.words)
+        key = 0x123456789ABCDEF0
+        table.store(key, (6, 4, 4, 4, None), 5, EXACT, -250)
+        if table.probe(key) != ((6, 4, 4, 4, None), 5, EXACT, -250):
+            print(f"❌ Entrada leída incorrectamente: {table.probe(key)}")
+            return False
+        if table.probe(key ^ (1 << 63)) is not None:
+            print("❌ Una clave distinta del mismo cubo encontró la entrada")
+            return False
+        
+        # Otra posición del mismo cubo con menos profundidad va a la casilla de reemplazo
+        # siempre, sin expulsar la entrada profunda
+        other = key ^ (1 << 40)
+        table.store(other, (1, 0, 0, 0, 'knight'), 2, LOWER_BOUND, 99990)
+        if table.probe(key) is None or table.probe(other) != ((1, 0, 0, 0, 'knight'), 2, LOWER_BOUND, 99990):
+            print("❌ El reemplazo por profundidad no conservó ambas entradas")
+            return False
+        
+        # Una cota sin jugada conserva la jugada guardada de la misma posición
+        table.store(key, None, 6, UPPER_BOUND, 10)
+        if table.probe(key) != ((6, 4, 4, 4, None), 6, UPPER_BOUND, 10):
+            print("❌ Se perdió la jugada de la entrada")
+            return False
+        
+        # También cuando la posición está en la casilla de reemplazo siempre
+        table.store(other, None, 1, UPPER_BOUND, 5)
+        if table.probe(other) != ((1, 0, 0, 0, 'knight'), 1, UPPER_BOUND, 5):
+            print("❌ Se perdió la jugada de la casilla de reemplazo siempre")
+            return False
+        
+        # Muchas escrituras no cambian el tamaño; la tabla puede envolver un búfer externo
+        for index in range(100000):
+            table.store(index * 0x9E3779B97F4A7C15 & ((1 << 64) - 1), None, index % 10, EXACT, index)
+        shared = bytearray(len(table.bytes))
+        shared[:] = table.bytes
+        view = TranspositionTable(size_mb=1, buffer=shared)
+        last_key = 99999 * 0x9E3779B97F4A7C15 & ((1 << 64) - 1)
+        if len(table.words) != size or view.probe(last_key) != (None, 9, EXACT, 99999):
+            print("❌ La tabla cambió de tamaño o no lee un búfer externo")
+            return False
+        
+        print(f"✅ Tabla de transposición correcta ({table.size_mb:g} MB)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de tabla de transposición: {e}")
+        return False
+
+def test_move_ordering():
+    """Verificar la ordenación de jugadas del motor"""
+    try:
+        from chess_professional import ChessGame
+        from engine import Engine
+        
+        engine = Engine()
+        game = ChessGame()
+        # Blancas: Dd1 y peón e4 pueden capturar la dama de d5; el caballo c3 también
+        game.load_fen("4k3/8/8/3q4/4P3/2N5/8/3QK3 w - - 0 1")
+        moves = game.generate_legal_moves()
+        
+        hash_move = (7, 0, 6, 0, None) if (7, 0, 6, 0, None) in moves else (7, 4, 6, 4, None)
+        engine.killers[0] = [(7, 3, 6, 3, None), None]
+        ordered = engine.order_moves(game, list(moves), hash_move, 0)
+        expected_captures = [(4, 4, 3, 3, None), (5, 2, 3, 3, None), (7, 3, 3, 3, None)]
+        if ordered[0] != hash_move or ordered[1:4] != expected_captures:
+            print(f"❌ Orden MVV-LVA incorrecto: {ordered[:4]}")
+            return False
+        if ordered[4] != (7, 3, 6, 3, None):
+            print(f"❌ El killer no va tras las capturas: {ordered[4]}")
+            return False
+        
+        game = ChessGame()
+        engine.search(game, max_depth=4)
+        if engine.beta_cutoffs == 0 or not 0.5 < engine.first_move_cutoff_rate <= 1:
+            print(f"❌ Estadística de cortes improbable: {engine.first_move_cutoff_rate}")
+            return False
+        
+        print(f"✅ Ordenación de jugadas correcta ({engine.first_move_cutoff_rate:.0%} de cortes con la primera)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de ordenación: {e}")
+        return False
+
+def test_quiescence_and_see():
+    """Verificar el intercambio estático y que la quiescencia evita capturas envenenadas"""
+    try:
+        from chess_professional import ChessGame
+        from engine import Engine
+        
+        engine = Engine()
+        game = ChessGame()
+        
+        # Dama por peón defendido: pierde 8; peón por caballo defendido: gana 2
+        game.load_fen("4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1")
+        if engine.see(game, (7, 4, 3, 4, None)) != -800:
+            print(f"❌ SEE de Dxe5 incorrecto: {engine.see(game, (7, 4, 3, 4, None))}")
+            return False
+        game.load_fen("4k3/8/3p4/4n3/3P4/8/8/4K3 w - - 0 1")
+        if engine.see(game, (4, 3, 3, 4, None)) != 200:
+            print(f"❌ SEE de dxe5 incorrecto: {engine.see(game, (4, 3, 3, 4, None))}")
+            return False
+        # Rayos X: la torre de detrás recaptura cuando la primera se retira
+        game.load_fen("3rk3/3r4/8/8/8/8/3Q4/3RK3 w - - 0 1")
+        if engine.see(game, (6, 3, 1, 3, None)) != -400:
+            print(f"❌ SEE con rayos X incorrecto: {engine.see(game, (6, 3, 1, 3, None))}")
+            return False
+        
+        # A profundidad 1 la quiescencia ve la recaptura y no se come el peón defendido
+        game.load_fen("4k3/8/3p4/4p3/8/8/8/4QK2 w - - 0 1")
+        result = engine.search(game, max_depth=1)
+        if result.move[:4] == (7, 4, 3, 4) or result.score < 0:
+            print(f"❌ La quiescencia no evitó la captura envenenada: {result}")
+            return False
+        
+        print("✅ Quiescencia y SEE correctos")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de quiescencia: {e}")
+        return False
+
+def test_parallel_search():
+    """Verificar la búsqueda paralela con tabla de transposición compartida"""
+    try:
+        from chess_professional import ChessGame
+        from engine import root_position
+        from parallel_search import ParallelSearch
+        
+        # La raíz se reconstruye desde el último movimiento irreversible
+        game = ChessGame()
+        for move in ((6, 4, 4, 4), (1, 4, 3, 4), (7, 6, 5, 5), (0, 6, 2, 5), (5, 5, 7, 6)):
+            game.move_piece(*move)
+        fen_before = game.get_fen()
+        fen, moves = root_position(game)
+        if game.get_fen() != fen_before or len(moves) != 3 or not fen.startswith("rnbqkbnr/pppp1ppp/8/4p3/4P3/"):
+            print(f"❌ Raíz reconstruida incorrectamente: {fen} {moves}")
+            return False
+        
+        search = ParallelSearch(workers=2, hash_mb=1)
+        try:
+            game = ChessGame()
+            game.load_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+            result = search.search(game, max_depth=3)
+            if result.move[:4] != (7, 0, 0, 0):
+                print(f"❌ La búsqueda paralela no encontró el mate: {result}")
+                return False
+            # Las entradas escritas por los procesos están en la tabla compartida
+            if not any(search.table[index] for index in range(0, len(search.table), 8)):
+                print("❌ Los procesos no escribieron en la tabla compartida")
+                return False
+        finally:
+            search.close()
+        
+        print("✅ Búsqueda paralela correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de búsqueda paralela: {e}")
+        return False
+
+def test_engine_worker():
+    """Verificar el motor en segundo plano: respuesta por evento, reflexión y cancelación inmediata"""
+    try:
+        import threading
+        import time
+        import pygame
+        from chess_professional import ChessGame
+        from engine import Engine
+        from engine_worker import EngineWorker, ENGINE_MOVE_EVENT, SEARCH, PONDER
+        
+        def wait_event(timeout):
+            deadline = time.perf_counter() + timeout
+            while time.perf_counter() < deadline:
+                for event in pygame.event.get(ENGINE_MOVE_EVENT):
+                    return event
+                time.sleep(0.01)
+            return None
+        
+        # Al reflexionar el tiempo solo cuenta desde el acierto
+        engine = Engine(hash_mb=1)
+        game = ChessGame()
+        hit = threading.Event()
+        threading.Timer(0.5, hit.set).start()
+        result = engine.search(game, time_limit=0.2, ponder_hit=hit)
+        if not 0.5 <= result.elapsed < 1.5 or result.ponder is None:
+            print(f"❌ La reflexión no esperó al acierto: {result.elapsed:.2f}s")
+            return False
+        
+        pygame.display.init()
+        worker = EngineWorker(hash_mb=1)
+        try:
+            game = ChessGame()
+            game.load_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+            request = worker.think(game, 0.2)
+            event = wait_event(15)
+            if event is None or event.kind != SEARCH or event.request_id != request or \
+                    event.result.move[:4] != (7, 0, 0, 0):
+                print(f"❌ El motor en segundo plano no respondió bien: {event}")
+                return False
+            
+            # La búsqueda predice la respuesta del rival y el motor reflexiona sobre ella
+            game = ChessGame()
+            request = worker.think(game, 0.2)
+            event = wait_event(15)
+            reply = event.result.ponder if event else None
+            if event is None or event.request_id != request or reply is None:
+                print(f"❌ La búsqueda no predijo la respuesta del rival: {event}")
+                return False
+            game.make_move(*event.result.move)
+            if reply not in game.generate_legal_moves():
+                print(f"❌ Respuesta prevista ilegal: {reply}")
+                return False
+            request = worker.ponder(game, reply, 0.2)
+            if wait_event(0.5) is not None:
+                print("❌ La reflexión respondió sin que el rival jugara")
+                return False
+            
+            # Acierto: la reflexión se convierte en la búsqueda de la jugada
+            game.make_move(*reply)
+            worker.ponder_hit(request)
+            event = wait_event(5)
+            if event is None or event.kind != SEARCH or event.request_id != request or \
+                    event.result.move not in game.generate_legal_moves():
+                print(f"❌ El acierto de la reflexión no devolvió la jugada: {event}")
+                return False
+            
+            # Fallo: la reflexión no tiene límite de tiempo y solo termina al cancelarla
+            game.make_move(*event.result.move)
+            worker.ponder(game, event.result.ponder or game.generate_legal_moves()[0], 0.2)
+            time.sleep(0.3)
+            start = time.perf_counter()
+            worker.cancel()
+            event = wait_event(5)
+            if event is None or event.kind != PONDER or time.perf_counter() - start > 1:
+                print("❌ La reflexión no se detuvo al cancelarla")
+                return False
+        finally:
+            worker.close()
+        
+        print("✅ Motor en segundo plano correcto")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba del motor en segundo plano: {e}")
+        return False
+
+def test_time_control():
+    """Verificar el reloj con incremento y el reparto de tiempo del motor"""
+    try:
+        from chess_professional import ChessGame, GameState
+        from engine import Engine, TimeManager
+        
+        game = ChessGame()
+        game.set_time_control(60, 2)
+        # Simular que las blancas pensaron 10 segundos
+        game.last_move_time -= 10
+        game.move_piece(6, 4, 4, 4)
+        if not 51.9 < game.time_left['white'] < 52.1 or game.time_left['black'] != 60:
+            print(f"❌ Reloj incorrecto tras la primera jugada: {game.time_left}")
+            return False
+        
+        # Las negras agotan su tiempo: pierden y ya no pueden mover
+        game.last_move_time -= 61
+        game.update_timer()
+        if game.game_state != GameState.TIMEOUT or game.move_piece(1, 4, 3, 4):
+            print(f"❌ No se detectó la caída de bandera: {game.game_state}")
+            return False
+        
+        # El gestor reparte el reloj y respeta un límite duro
+        manager = TimeManager(60, 2)
+        if not 0 < manager.optimum < manager.maximum <= 60 * 0.3:
+            print(f"❌ Reparto de tiempo incorrecto: {manager.optimum} {manager.maximum}")
+            return False
+        optimum = manager.optimum
+        manager.should_stop(0, True)
+        if manager.optimum <= optimum:
+            print("❌ El tiempo previsto no se amplió con una mejor jugada inestable")
+            return False
+        
+        # Jugada forzada: el motor responde sin gastar reloj
+        game = ChessGame()
+        game.load_fen("k7/8/8/8/8/8/1r6/K1r5 w - - 0 1")
+        result = Engine().search(game, time_manager=TimeManager(300))
+        if result.move[:4] != (7, 0, 6, 1) or result.elapsed > 0.05:
+            print(f"❌ La jugada forzada gastó tiempo: {result}")
+            return False
+        
+        print("✅ Control de tiempo correcto")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de control de tiempo: {e}")
+        return False
+
+def test_opening_book():
+    """Verificar las claves Polyglot y la consulta del libro de aperturas"""
+    try:
+        import os
+        import tempfile
+        import polyglot
+        from chess_professional import ChessGame
+        from engine import Engine
+        
+        # Claves de referencia de la especificación de Polyglot (incluye captura al paso)
+        game = ChessGame()
+        expected = [0x463B96181691FC9C, 0x823C9B50FD114196, 0x0756B94461C50FB0,
+                    0x662FAFB965DB29D4, 0x22A48B5A8E47FF78, 0x652A607CA3F242C1]
+        moves = [(6, 4, 4, 4), (1, 3, 3, 3), (4, 4, 3, 4), (1, 5, 3, 5), (7, 4, 6, 4)]
+        for index, key in enumerate(expected):
+            if polyglot.polyglot_key(game) != key:
+                print(f"❌ Clave Polyglot incorrecta tras {index} jugadas")
+                return False
+            if index < len(moves):
+                game.make_move(*moves[index], None)
+        
+        # Libro pequeño: dos aperturas, una jugada ilegal y el enroque como rey captura torre
+        start = ChessGame()
+        castling = ChessGame()
+        castling.load_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        entries = [
+            (polyglot.polyglot_key(start), polyglot.encode_move((6, 4, 4, 4, None)), 10, 0),
+            (polyglot.polyglot_key(start), polyglot.encode_move((6, 3, 4, 3, None)), 30, 0),
+            (polyglot.polyglot_key(start), polyglot.encode_move((6, 4, 3, 4, None)), 99, 0),
+            (polyglot.polyglot_key(castling), polyglot.encode_move((7, 4, 7, 7, None)), 1, 0),
+            (0, 0, 1, 0), (2 ** 64 - 1, 0, 1, 0),
+        ]
+        path = os.path.join(tempfile.mkdtemp(), 'book.bin')
+        polyglot.write_book(path, entries)
+        book = polyglot.OpeningBook(path)
+        try:
+            if book.moves(start) != [((6, 3, 4, 3, None), 30), ((6, 4, 4, 4, None), 10)]:
+                print(f"❌ Jugadas de libro incorrectas: {book.moves(start)}")
+                return False
+            if book.choose_move(castling) != (7, 4, 7, 6, None):
+                print("❌ El enroque del libro no se tradujo")
+                return False
+            if book.moves(game):
+                print("❌ Una posición fuera del libro devolvió jugadas")
+                return False
+            
+            # El motor juega la jugada de libro sin buscar
+            result = Engine(book=book).search(start, time_limit=5)
+            if result.move not in ((6, 3, 4, 3, None), (6, 4, 4, 4, None)) or result.nodes != 0:
+                print(f"❌ El motor no usó el libro: {result}")
+                return False
+        finally:
+            book.close()
+        
+        print("✅ Libro de aperturas Polyglot correcto")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de libro de aperturas: {e}")
+        return False
+
+def test_endgame_tablebases():
+    """Verificar las tablas de finales generadas, su consulta y su uso en el motor y en la partida"""
+    try:
+        import tempfile
+        import tablebase
+        from chess_professional import ChessGame
+        from engine import Engine, MATE_SCORE
+        
+        directory = tempfile.mkdtemp()
+        for piece_type in tablebase.TABLES:
+            tablebase.generate(piece_type, directory)
+        tables = tablebase.Tablebase(directory)
+        try:
+            def probe(fen):
+                game = ChessGame()
+                game.load_fen(fen)
+                return tables.probe(game)
+            
+            # KQK con el bando fuerte de cualquier color, KRK, KPK ganado y ahogado, pieza menor
+            # y una posición imposible (el rey que no mueve está en jaque)
+            cases = [
+                ("7k/8/6K1/8/8/8/8/1Q6 w - - 0 1", (tablebase.WIN, 1)),
+                ("1q6/8/8/8/8/6k1/8/7K b - - 0 1", (tablebase.WIN, 1)),
+                ("k7/8/8/8/8/8/8/R3K3 b - - 0 1", (tablebase.LOSS, 24)),
+                ("8/8/8/8/8/8/4P3/4K2k w - - 0 1", (tablebase.WIN, 23)),
+                ("4k3/8/4K3/4P3/8/8/8/8 b - - 0 1", (tablebase.LOSS, 24)),
+                ("4k3/4P3/4K3/8/8/8/8/8 b - - 0 1", (tablebase.DRAW, 0)),
+                ("8/8/8/8/8/8/7k/KN6 w - - 0 1", (tablebase.DRAW, 0)),
+                ("7k/8/6K1/8/8/8/8/Q7 w - - 0 1", None),
+            ]
+            for fen, expected in cases:
+                if probe(fen) != expected:
+                    print(f"❌ Resultado de tablas incorrecto en {fen}: {probe(fen)}")
+                    return False
+            
+            # El motor juega al instante la jugada que mantiene el mate más corto
+            game = ChessGame()
+            game.load_fen("8/8/8/8/8/8/4P3/4K2k w - - 0 1")
+            result = Engine(tablebase=tables).search(game, time_limit=5)
+            game.make_move(*result.move)
+            if result.score != MATE_SCORE - 23 or result.nodes != 0 or tables.probe(game) != (tablebase.LOSS, 22):
+                print(f"❌ El motor no siguió las tablas: {result}")
+                return False
+        finally:
+            tables.close()
+        
+        print("✅ Tablas de finales correctas")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de tablas de finales: {e}")
+        return False
+
+def test_insufficient_material():
+    """Verificar que la partida termina en tablas cuando nadie puede dar mate"""
+    try:
+        from chess_professional import ChessGame, GameState
+        
+        for fen in ("8/8/8/8/8/2k5/8/4K3 w - - 0 1",
+                    "8/8/8/8/8/2k5/8/1B2K3 w - - 0 1",
+                    "8/8/8/8/8/2k5/8/1N2K3 b - - 0 1"):
+            game = ChessGame()
+            game.load_fen(fen)
+            if game.game_state != GameState.DRAW or game.move_piece(7, 4, 6, 4):
+                print(f"❌ No se detectó el material insuficiente en {fen}: {game.game_state}")
+                return False
+        
+        # Con una torre o un peón todavía se puede ganar
+        for fen in ("8/8/8/8/8/2k5/8/1R2K3 w - - 0 1", "8/8/8/8/8/2k5/4P3/4K3 w - - 0 1"):
+            game = ChessGame()
+            game.load_fen(fen)
+            if game.game_state == GameState.DRAW:
+                print(f"❌ Tablas por material insuficiente indebidas en {fen}")
+                return False
+        
+        print("✅ Tablas por material insuficiente correctas")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de material insuficiente: {e}")
+        return False
+
+def test_pawn_hash():
+    """Verificar la clave de peones incremental y la caché de estructura de peones"""
+    try:
+        import random
+        import evaluation
+        import zobrist
+        from chess_professional import ChessGame
+        from engine import Engine
+        from perft import REFERENCE_POSITIONS
+        
+        rng = random.Random(22)
+        for name, fen, _ in REFERENCE_POSITIONS:
+            game = ChessGame()
+            game.load_fen(fen)
+            start = game.pawn_key
+            played = 0
+            for _ in range(60):
+                moves = game.generate_legal_moves()
+                if not moves:
+                    break
+                promotions = [move for move in moves if move[4]]
+                game.make_move(*rng.choice(promotions or moves))
+                played += 1
+                if game.pawn_key != zobrist.compute_pawn_key(game):
+                    print(f"❌ Clave de peones incremental incorrecta en {name}")
+                    return False
+            for _ in range(played):
+                game.unmake_move()
+            if game.pawn_key != start:
+                print(f"❌ La clave de peones no se restauró en {name}")
+                return False
+        
+        # d2 y d5 doblados y aislados, d5 pasado; con un peón negro en e6 deja de serlo
+        cases = [("4k3/8/8/3P4/8/8/PP1P4/4K3 w - - 0 1", -22),
+                 ("4k3/8/4p3/3P4/8/8/PP1P4/4K3 w - - 0 1", -27),
+                 ("4k3/pp1p4/8/8/3p4/8/8/4K3 b - - 0 1", 22)]
+        for fen, expected in cases:
+            game = ChessGame()
+            game.load_fen(fen)
+            if evaluation.pawn_structure(game) != expected:
+                print(f"❌ Estructura de peones incorrecta en {fen}: {evaluation.pawn_structure(game)}")
+                return False
+        
+        # La misma estructura de peones se calcula una sola vez
+        engine = Engine(hash_mb=1, pawn_hash_mb=0.01)
+        game = ChessGame()
+        first = engine.evaluate(game)
+        game.make_move(7, 6, 5, 5, None)  # Cf3 no toca los peones
+        engine.evaluate(game)
+        game.unmake_move()
+        if engine.evaluate(game) != first or engine.pawn_table.hits != 2:
+            print(f"❌ La tabla de peones no acierta: {engine.pawn_table.hits} aciertos")
+            return False
+        if len(engine.pawn_table.keys) & (len(engine.pawn_table.keys) - 1):
+            print("❌ El tamaño de la tabla de peones no es potencia de dos")
+            return False
+        
+        result = engine.search(game, max_depth=3)
+        if result.move is None or engine.pawn_table.probes == 0 or engine.pawn_table.hit_rate < 0.5:
+            print(f"❌ Tasa de aciertos de peones demasiado baja: {engine.pawn_table.hit_rate:.0%}")
+            return False
+        
+        print(f"✅ Tabla hash de peones correcta ({engine.pawn_table.hit_rate:.0%} aciertos)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de tabla de peones: {e}")
+        return False
+
+def test_glyph_cache():
+    """Verificar que las piezas Unicode se renderizan una sola vez y se reutilizan"""
+    try:
+        import pygame
+        import chess_game
+        import chess_professional
+        from glyph_cache import GlyphCache
+        
+        pygame.font.init()
+        cache = GlyphCache()
+        first = cache.get('♔', (0, 0, 0), 40)
+        if cache.get('♔', (0, 0, 0), 40) is not first or len(cache) != 1:
+            print("❌ La caché de glyphs volvió a renderizar el mismo símbolo")
+            return False
+        if cache.get('♔', (255, 255, 255), 40) is first or cache.get('♔', (0, 0, 0), 50) is first:
+            print("❌ La caché de glyphs confunde colores o tamaños")
+            return False
+        
+        # Dibujar dos veces sobre una superficie fuera de pantalla sin abrir ventana; chess_game
+        # usa sombra, cuerpo y brillo, y el cuerpo de las negras tiene el color de la sombra
+        for module, expected in ((chess_professional, 12), (chess_game, 24)):
+            gui = module.ChessGUI.__new__(module.ChessGUI)
+            gui.screen = pygame.Surface((module.WINDOW_WIDTH, module.WINDOW_HEIGHT))
+            gui.game = module.ChessGame()
+            gui.glyphs = GlyphCache()
+            gui.draw_pieces()
+            surfaces = dict(gui.glyphs.glyphs)
+            gui.draw_pieces()
+            if len(surfaces) != expected or gui.glyphs.glyphs != surfaces:
+                print(f"❌ {module.__name__} no reutiliza las piezas: {len(gui.glyphs)} superficies")
+                return False
+        
+        print("✅ Caché de glyphs correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de caché de glyphs: {e}")
+        return False
+
+def test_board_layer():
+    """Verificar que el tablero estático se genera una vez y solo se regenera al cambiar"""
+    try:
+        import pygame
+        import chess_professional
+        from board_layer import BoardLayer
+        
+        pygame.font.init()
+        module = chess_professional
+        gui = module.ChessGUI.__new__(module.ChessGUI)
+        gui.screen = pygame.Surface((module.WINDOW_WIDTH, module.WINDOW_HEIGHT))
+        gui.game = module.ChessGame()
+        gui.board_layer = BoardLayer(module.SQUARE_SIZE, module.LIGHT_BROWN, module.DARK_BROWN)
+        gui.show_coordinates = True
+        gui.hint = None
+        for _ in range(3):
+            gui.draw_board()
+        if gui.board_layer.builds != 1:
+            print(f"❌ El tablero se regeneró en cada fotograma: {gui.board_layer.builds}")
+            return False
+        
+        size = module.SQUARE_SIZE
+        if gui.screen.get_at((size // 2, size // 2))[:3] != module.LIGHT_BROWN or \
+                gui.screen.get_at((size + size // 2, size // 2))[:3] != module.DARK_BROWN:
+            print("❌ Colores de casilla incorrectos en la capa del tablero")
+            return False
+        
+        # Ocultar coordenadas o cambiar el tema obliga a regenerar la superficie
+        gui.show_coordinates = False
+        gui.draw_board()
+        gui.draw_board()
+        gui.board_layer.light = (255, 255, 255)
+        gui.draw_board()
+        if gui.board_layer.builds != 3 or gui.screen.get_at((size // 2, size // 2))[:3] != (255, 255, 255):
+            print(f"❌ La capa del tablero no se regeneró al cambiar: {gui.board_layer.builds}")
+            return False
+        
+        print("✅ Capa estática del tablero correcta")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de capa del tablero: {e}")
+        return False
+
+def test_gradient_background():
+    """Verificar que los fondos con degradado se generan una vez y coinciden sin NumPy"""
+    try:
+        import pygame
+        import gradients
+        import chess_artistic_sprites
+        import chess_visual_enhanced
+        
+        for module in (chess_visual_enhanced, chess_artistic_sprites):
+            size = (module.WINDOW_WIDTH, module.WINDOW_HEIGHT)
+            background = gradients.GradientBackground(module.background_color)
+            screen = pygame.Surface(size)
+            for _ in range(3):
+                background.draw(screen)
+            if background.builds != 1:
+                print(f"❌ {module.__name__} regenera el fondo en cada fotograma")
+                return False
+            for y in (0, size[1] // 3, size[1] - 1):
+                if screen.get_at((size[0] // 2, y))[:3] != gradients.clamp(module.background_color(y, size[1])):
+                    print(f"❌ {module.__name__}: color incorrecto en la fila {y}")
+                    return False
+            
+            # Sin NumPy se rellena fila a fila con el mismo resultado
+            numpy_module = gradients.np
+            gradients.np = None
+            try:
+                fallback = gradients.vertical_gradient(size, module.background_color)
+            finally:
+                gradients.np = numpy_module
+            if pygame.image.tostring(fallback, 'RGB') != pygame.image.tostring(screen, 'RGB'):
+                print(f"❌ {module.__name__}: el relleno sin NumPy no coincide")
+                return False
+            
+            # Cambiar el tamaño de la ventana obliga a regenerarlo
+            background.draw(pygame.Surface((size[0], size[1] + 40)))
+            if background.builds != 2:
+                print(f"❌ {module.__name__} no regeneró el fondo al cambiar de tamaño")
+                return False
+        
+        print("✅ Fondos con degradado correctos")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error en prueba de fondos con degradado: {e}")
+        return False
+
 def main():
     """Función principal de pruebas"""
     print("🎮 Probando el juego de ajedrez...")
@@ -98,7 +1164,29 @@ def main():
         test_pygame_import,
         test_chess_game_import,
         test_chess_advanced_import,
-        test_basic_game_functionality
+        test_basic_game_functionality,
+        test_make_unmake_move,
+        test_perft_reference_positions,
+        test_bitboard_backend,
+        test_zobrist_hashing,
+        test_incremental_evaluation,
+        test_batch_evaluation,
+        test_legal_move_cache,
+        test_lazy_legal_moves,
+        test_engine_search,
+        test_transposition_table,
+        test_move_ordering,
+        test_quiescence_and_see,
+        test_parallel_search,
+        test_engine_worker,
+        test_time_control,
+        test_opening_book,
+        test_endgame_tablebases,
+        test_insufficient_material,
+        test_pawn_hash,
+        test_glyph_cache,
+        test_board_layer,
+        test_gradient_background
     ]
     
     passed = 0
@@ -0,0 +1,130 @@
+"""
+Tabla de transposición de tamaño fijo para el motor.
+
+La tabla es un bloque de palabras de 64 bits reservado de una vez: cada
+cubo tiene dos entradas, una que conserva la búsqueda más profunda y otra
+que se reemplaza siempre, y cada entrada ocupa dos palabras (clave y
+datos empaquetados). La memoria no crece por mucho que dure la partida.
+
+La clave se guarda mezclada con los datos (``clave ^ datos``) para que una
+entrada escrita a medias por otro proceso que comparta el búfer se descarte
+en vez de leerse mal.
+"""
+
+from typing import Optional, Tuple
+
+EXACT = 1
+LOWER_BOUND = 2  # La puntuación real es >= la guardada (corte beta)
+UPPER_BOUND = 3  # La puntuación real es <= la guardada (ninguna jugada superó alfa)
+
+PROMOTION_CODES = {None: 0, 'queen': 1, 'rook': 2, 'bishop': 3, 'knight': 4}
+PROMOTION_PIECES = (None, 'queen', 'rook', 'bishop', 'knight')
+
+WORDS_PER_BUCKET = 4  # Dos entradas de (clave, datos)
+BYTES_PER_BUCKET = WORDS_PER_BUCKET * 8
+
+# Campos de la palabra de datos
+_DEPTH_SHIFT = 15
+_FLAG_SHIFT = 23
+_AGE_SHIFT = 25
+_SCORE_SHIFT = 31
+_SCORE_OFFSET = 1 << 19
+_MASK64 = (1 << 64) - 1
+
+
+def encode_move(move) -> int:
+    """(fila, col, fila destino, col destino, promoción) en 15 bits"""
+    if move is None:
+        return 0
+    from_row, from_col, to_row, to_col, promotion = move
+    return (from_row * 8 + from_col) | ((to_row * 8 + to_col) << 6) | (PROMOTION_CODES[promotion] << 12)
+
+
+def decode_move(code: int):
+    if code == 0:
+        return None
+    from_square = code & 63
+    to_square = (code >> 6) & 63
+    return (from_square >> 3, from_square & 7, to_square >> 3, to_square & 7, PROMOTION_PIECES[code >> 12])
+
+
+def bucket_count(size_mb: float) -> int:
+    """Mayor potencia de dos de cubos que cabe en el tamaño indicado"""
+    buckets = max(1, int(size_mb * 1024 * 1024) // BYTES_PER_BUCKET)
+    return 1 << (buckets.bit_length() - 1)
+
+
+class TranspositionTable:
+    def __init__(self, size_mb: float = 16, buffer=None):
+        """Reservar la tabla; con ``buffer`` se usa esa memoria (p. ej. compartida) en lugar de una propia"""
+        buckets = bucket_count(size_mb)
+        if buffer is None:
+            buffer = bytearray(buckets * BYTES_PER_BUCKET)
+        self.buffer = buffer
+        self.bytes = memoryview(buffer).cast('B')[:buckets * BYTES_PER_BUCKET]
+        self.words = self.bytes.cast('Q')
+        self.mask = buckets - 1
+        self.size_mb = buckets * BYTES_PER_BUCKET / (1024 * 1024)
+        self.age = 0
+
+    def clear(self):
+        self.bytes[:] = bytes(len(self.bytes))
+        self.age = 0
+
+    def new_search(self):
+        """Marcar el comienzo de una búsqueda para envejecer las entradas anteriores"""
+        self.age = (self.age + 1) & 63
+
+    def probe(self, key: int) -> Optional[Tuple[object, int, int, int]]:
+        """(jugada, profundidad, tipo de cota, puntuación) guardados para la clave, o None"""
+        words = self.words
+        index = (key & self.mask) * WORDS_PER_BUCKET
+        for slot in (index, index + 2):
+            data = words[slot + 1]
+            if data and words[slot] ^ data == key:
+                return (decode_move(data & 0x7FFF),
+                        (data >> _DEPTH_SHIFT) & 0xFF,
+                        (data >> _FLAG_SHIFT) & 3,
+                        ((data >> _SCORE_SHIFT) & 0xFFFFF) - _SCORE_OFFSET)
+        return None
+
+    def store(self, key: int, move, depth: int, flag: int, score: int):
+        """Guardar una entrada: la primera casilla prefiere profundidad, la segunda se reemplaza siempre"""
+        words = self.words
+        index = (key & self.mask) * WORDS_PER_BUCKET
+        depth = min(max(depth, 0), 255)
+
+        # Sin jugada nueva se conserva la que hubiera para esta misma posición en cualquiera
+        # de las dos casillas
+        move_code = encode_move(move)
+        if not move_code:
+            for slot in (index, index + 2):
+                data = words[slot + 1]
+                if data & 0x7FFF and words[slot] ^ data == key:
+                    move_code = data & 0x7FFF
+                    break
+        stored = words[index + 1]
+        same_position = stored and words[index] ^ stored == key
+
+        data = (move_code | (depth << _DEPTH_SHIFT) | (flag << _FLAG_SHIFT) |
+                (self.age << _AGE_SHIFT) | ((score + _SCORE_OFFSET) << _SCORE_SHIFT)) & _MASK64
+
+        stored_depth = (stored >> _DEPTH_SHIFT) & 0xFF
+        stored_age = (stored >> _AGE_SHIFT) & 63
+        if not stored or same_position or depth >= stored_depth or stored_age != self.age:
+            words[index] = key ^ data
+            words[index + 1] = data
+        else:
+            words[index + 2] = key ^ data
+            words[index + 3] = data
+
+    def hashfull(self) -> int:
+        """Ocupación aproximada en tantos por mil, muestreando los primeros cubos"""
+        words = self.words
+        sample = min(1000, self.mask + 1)
+        used = 0
+        for bucket in range(sample):
+            index = bucket * WORDS_PER_BUCKET
+            used += ((words[index + 1] >> _AGE_SHIFT) & 63) == self.age and words[index + 1] != 0
+            used += ((words[index + 3] >> _AGE_SHIFT) & 63) == self.age and words[index + 3] != 0
+        return used * 1000 // (sample * 2)
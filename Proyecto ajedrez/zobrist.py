@@ -0,0 +1,69 @@
+"""
+Claves Zobrist de 64 bits para identificar posiciones.
+
+Cada combinación (color, pieza, casilla), el turno de las negras, cada derecho
+de enroque y cada columna de captura al paso tiene un número aleatorio de 64
+bits. La clave de una posición es el XOR de los números de todo lo presente,
+así que un movimiento la actualiza con unos pocos XOR. Los números salen de
+un generador con semilla fija para que las claves sean estables entre
+ejecuciones y procesos.
+"""
+
+import random
+from itertools import combinations
+
+COLORS = ('white', 'black')
+PIECE_TYPES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+
+_rng = random.Random(0x5EED_C0DE)
+
+# PIECE_KEYS[color][tipo][row * 8 + col]
+PIECE_KEYS = {
+    color: {piece_type: [_rng.getrandbits(64) for _ in range(64)] for piece_type in PIECE_TYPES}
+    for color in COLORS
+}
+SIDE_KEY = _rng.getrandbits(64)  # Se aplica cuando juegan las negras
+EN_PASSANT_KEYS = [_rng.getrandbits(64) for _ in range(8)]  # Por columna
+
+_CASTLING_LETTER_KEYS = {letter: _rng.getrandbits(64) for letter in 'KQkq'}
+
+
+def _castling_key(rights: str) -> int:
+    key = 0
+    for letter in rights:
+        key ^= _CASTLING_LETTER_KEYS.get(letter, 0)
+    return key
+
+
+# Clave de cada cadena de derechos de enroque en el orden FEN ('KQkq', 'Kq', '-', ...)
+CASTLING_KEYS = {'-': 0}
+for _size in range(1, 5):
+    for _letters in combinations('KQkq', _size):
+        CASTLING_KEYS[''.join(_letters)] = _castling_key(_letters)
+
+
+def compute_key(game) -> int:
+    """Calcular desde cero la clave Zobrist de la posición de un ChessGame"""
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = game.board[row][col]
+            if piece:
+                key ^= PIECE_KEYS[piece.color][piece.piece_type][row * 8 + col]
+    if game.current_player == 'black':
+        key ^= SIDE_KEY
+    key ^= CASTLING_KEYS[game.get_castling_rights()]
+    if game.en_passant:
+        key ^= EN_PASSANT_KEYS[game.en_passant[1]]
+    return key
+
+
+def compute_pawn_key(game) -> int:
+    """Clave solo de los peones (con las mismas claves de pieza): índice de la tabla de estructura de peones"""
+    key = 0
+    for color, pieces in game.pieces.items():
+        pawn_keys = PIECE_KEYS[color]['pawn']
+        for piece in pieces:
+            if piece.piece_type == 'pawn':
+                key ^= pawn_keys[piece.row * 8 + piece.col]
+    return key